@@ -0,0 +1,242 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+import mapio  # noqa: E402
+from exporters import export_tables  # noqa: E402
+from mapgen import write_ctc_map, write_hitech_map  # noqa: E402
+from parser import parse_map_detailed_hitech  # noqa: E402
+from parser_static_dynamic import create_hierarchical_sheet, parse_ctc_map  # noqa: E402
+from rows import report_tables  # noqa: E402
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+DEFAULT_MAP_DIR = os.path.join(BENCH_DIR, "maps")
+DEFAULT_RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+# openpyxl needs about a minute per 200k rows and a sheet holds at most
+# 1,048,576 rows, so the Excel export is skipped above this size
+EXCEL_MAX_SYMBOLS = 200000
+
+
+# =========================================================
+# Measurement
+# =========================================================
+def measure(func, repeat=1, memory=True):
+    """
+    Runs func() `repeat` times untraced (best wall time) and once under
+    tracemalloc for the peak. Returns (result, wall_s, peak_bytes).
+    """
+    best = None
+    result = None
+
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak = None
+    if memory:
+        result = None
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return result, best, peak
+
+
+def row_count(result):
+    if hasattr(result, "sub_count"):
+        return result.region_count + result.sub_count
+    if isinstance(result, dict):
+        return sum(result.values())
+    if hasattr(result, "__len__") and not isinstance(result, str):
+        return len(result)
+    return None
+
+
+# =========================================================
+# Maps
+# =========================================================
+def map_path(map_dir, fmt, symbols):
+    return os.path.join(map_dir, f"{fmt}_{symbols}.map")
+
+
+def ensure_map(map_dir, fmt, symbols):
+    """
+    Generates the synthetic map once; later runs reuse it
+    """
+    path = map_path(map_dir, fmt, symbols)
+    if not os.path.exists(path):
+        os.makedirs(map_dir, exist_ok=True)
+        if fmt == "ctc":
+            write_ctc_map(path, symbols)
+        else:
+            write_hitech_map(path, symbols)
+    return path
+
+
+# =========================================================
+# Cases
+# =========================================================
+def bench_size(symbols, map_dir, work_dir, repeat, memory, excel_max):
+    """
+    Yields one result dict per entry point for maps of `symbols` symbols
+    """
+    ctc_map = ensure_map(map_dir, "ctc", symbols)
+    hitech_map = ensure_map(map_dir, "hitech", symbols)
+
+    def case(entry, fmt, func):
+        result, wall, peak = measure(func, repeat, memory)
+        memory_text = "-" if peak is None else f"{peak / 2**20:.1f} MB"
+        print(f"{entry:<28} {fmt:<7} {symbols:>9} {wall:>9.3f}s {memory_text:>12}")
+        return result, {
+            "entry": entry,
+            "format": fmt,
+            "symbols": symbols,
+            "map_bytes": os.path.getsize(ctc_map if fmt == "ctc" else hitech_map),
+            "wall_s": round(wall, 6),
+            "peak_bytes": peak,
+            "rows": row_count(result),
+        }
+
+    _, row = case("detect_format", "ctc", lambda: mapio.detect_format(ctc_map))
+    yield row
+    _, row = case("detect_format", "hitech", lambda: mapio.detect_format(hitech_map))
+    yield row
+
+    layout, row = case("parse_ctc_map", "ctc", lambda: parse_ctc_map(ctc_map))
+    yield row
+    _, row = case("parse_map_detailed_hitech", "hitech", lambda: parse_map_detailed_hitech(hitech_map))
+    yield row
+
+    _, row = case(
+        "create_hierarchical_sheet", "ctc",
+        lambda: create_hierarchical_sheet(layout)
+    )
+    yield row
+
+    if symbols <= excel_max:
+        output = os.path.join(work_dir, f"bench_{symbols}.xlsx")
+        _, row = case("export_xlsx", "ctc", lambda: export_tables(output, report_tables(layout), "xlsx"))
+        yield row
+        os.remove(output)
+
+
+# =========================================================
+# Results
+# =========================================================
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_results(results_dir, results, commit):
+    os.makedirs(results_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(results_dir, f"{stamp}_{commit}.json")
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "commit": commit,
+            "timestamp": stamp,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "results": results,
+        }, f, indent=2)
+
+    return path
+
+
+def compare(old_file, new_file):
+    """
+    Prints new / old wall time and peak memory ratios per case
+    """
+    with open(old_file, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_file, encoding="utf-8") as f:
+        new = json.load(f)
+
+    def key(r):
+        return r["entry"], r["format"], r["symbols"]
+
+    before = {key(r): r for r in old["results"]}
+
+    print(f"{old['commit']} -> {new['commit']}")
+    print(f"{'entry':<28} {'format':<7} {'symbols':>9} {'time':>8} {'memory':>8}")
+    for r in new["results"]:
+        o = before.get(key(r))
+        if o is None:
+            continue
+        time_ratio = r["wall_s"] / o["wall_s"] if o["wall_s"] else float("nan")
+        if r["peak_bytes"] and o["peak_bytes"]:
+            mem_ratio = f"{r['peak_bytes'] / o['peak_bytes']:>7.2f}x"
+        else:
+            mem_ratio = f"{'-':>8}"
+        print(f"{r['entry']:<28} {r['format']:<7} {r['symbols']:>9} {time_ratio:>7.2f}x {mem_ratio}")
+
+
+# =========================================================
+# Command line
+# =========================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="bench.py", description="Benchmark the map parser entry points"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+        help="symbol counts (default: 1k 10k 100k 1M; 10M works but takes long)"
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per case (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--excel-max", type=int, default=EXCEL_MAX_SYMBOLS, help="largest size exported to xlsx")
+    parser.add_argument("--map-dir", default=DEFAULT_MAP_DIR, help="where generated maps are kept")
+    parser.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR)
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("OLD", "NEW"),
+        help="compare two result files instead of running"
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    commit = git_commit()
+    results = []
+
+    print(f"{'entry':<28} {'format':<7} {'symbols':>9} {'wall':>10} {'peak':>12}")
+    for symbols in args.sizes:
+        results.extend(bench_size(
+            symbols, args.map_dir, args.results_dir, args.repeat,
+            not args.no_memory, args.excel_max
+        ))
+
+    path = write_results(args.results_dir, results, commit)
+    print(f"Results: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+import argparse
+import random
+import sys
+
+# =========================================================
+# Synthetic MAP file generator
+# =========================================================
+# Writes CTC- and HiTech-style maps shaped like the ones the parsers
+# read, at any size. Output is deterministic for a given seed.
+RAM_BASE = 0xB0000000
+REGION_SPAN = 0x100000
+SUB_SIZES = (0x4, 0x8, 0x10, 0x40, 0x100)
+WRITE_BATCH = 10000
+
+# Every fourth HiTech region is a long block (at least this many sub
+# rows) so the benchmark covers blocks longer than the 20 lines the
+# old look-ahead parser could see
+HITECH_LONG_EVERY = 4
+HITECH_LONG_SUBS = 32
+
+
+def _region_name(index):
+    # Every third region is reset-safe so Reset_Safe_Area has rows
+    return f"DLMU{index}_RST_SAFE" if index % 3 == 0 else f"REG{index}_DATA"
+
+
+def _write_lines(f, lines):
+    f.write("\n".join(lines))
+    f.write("\n")
+
+
+# =========================================================
+# CTC
+# =========================================================
+def write_ctc_map(path, symbols, regions=None, depth=1, size_ratio=0.8, seed=1):
+    """
+    Writes a CTC map with `symbols` leaf symbols spread over `regions`
+    top-level regions (default: one per 1000 symbols).
+
+    depth > 1 nests regions: each level adds a NAME_Ln_START /
+    NAME_Ln_SIZE pair inside its parent, and the leaf symbols go into
+    the innermost one. size_ratio is the share of symbols with a
+    NAME_SIZE row.
+    """
+    rng = random.Random(seed)
+    regions = regions or max(1, symbols // 1000)
+    per_region, extra = divmod(symbols, regions)
+
+    with open(path, "w", encoding="ascii") as f:
+        _write_lines(f, [
+            "CTC LINKER MAP FILE",
+            "",
+            "| Name                                    | Address            |",
+            "|-----------------------------------------|--------------------|",
+        ])
+
+        for r in range(regions):
+            base = _region_name(r)
+            start = RAM_BASE + r * REGION_SPAN
+            lines = []
+
+            name = base
+            span = REGION_SPAN
+            for level in range(depth):
+                if level:
+                    name = f"{name}_L{level}"
+                    span //= 2
+                lines.append(f"| {name}_START | {hex(start)} |")
+                lines.append(f"{name}_SIZE | {hex(span)}")
+
+            count = per_region + (1 if r < extra else 0)
+            address = start
+            for s in range(count):
+                sym = f"{name}_GRP{s % 7}_VAR{s}"
+                size = rng.choice(SUB_SIZES)
+
+                lines.append(f"| {sym} | {hex(address)} |")
+                if rng.random() < size_ratio:
+                    lines.append(f"{sym}_SIZE | {hex(size)}")
+                address += size
+
+                if len(lines) >= WRITE_BATCH:
+                    _write_lines(f, lines)
+                    lines = []
+
+            _write_lines(f, lines)
+
+
+# =========================================================
+# HiTech
+# =========================================================
+def write_hitech_map(path, symbols, subs_per_region=8, seed=1):
+    """
+    Writes a HiTech map with `symbols` sub rows, subs_per_region per
+    "memory region ->" block, except every HITECH_LONG_EVERY-th block,
+    which has at least HITECH_LONG_SUBS
+    """
+    rng = random.Random(seed)
+    subs_per_region = max(1, subs_per_region)
+    long_subs = max(HITECH_LONG_SUBS, 4 * subs_per_region)
+
+    counts = []
+    remaining = symbols
+    while remaining > 0 or not counts:
+        long_block = len(counts) % HITECH_LONG_EVERY == HITECH_LONG_EVERY - 1
+        count = min(long_subs if long_block else subs_per_region, remaining)
+        counts.append(count)
+        remaining -= count
+
+    regions = len(counts)
+    banks = min(regions, 8)
+    per_bank = -(-regions // banks)
+    # Regions sit at a fixed stride that fits the longest block
+    stride = -(-(long_subs * max(SUB_SIZES)) // 0x1000) * 0x1000
+    bank_span = per_bank * stride
+
+    with open(path, "w", encoding="ascii") as f:
+        header = [
+            "=" * 72,
+            "HITECH LINKER MAP FILE",
+            "=" * 72,
+            "",
+            "Memory Configuration",
+            "--------------------",
+            "",
+            "Name             Origin             Length",
+        ]
+        for b in range(banks):
+            header.append(f"DLMU{b:<12} {RAM_BASE + b * bank_span:#018x} {bank_span:#012x}")
+        header += ["", "", "=" * 72, "SECTION DETAILS", "=" * 72, ""]
+        _write_lines(f, header)
+
+        lines = []
+        for r, count in enumerate(counts):
+            # Regions are laid out back to back, filling the banks in order
+            start = RAM_BASE + r * stride
+            bank = r // per_bank
+            sizes = [rng.choice(SUB_SIZES) for _ in range(count)]
+
+            lines += [
+                f".region{r}_data_sections memory region -> DATA_DLMU_{bank}",
+                f"0x{start:016X} 0x{sum(sizes):08X}",
+            ]
+            for s, size in enumerate(sizes):
+                lines.append(f"  r{r}_var{s} {hex(size)} 0x4")
+            lines.append("")
+
+            if len(lines) >= WRITE_BATCH:
+                _write_lines(f, lines)
+                lines = []
+
+        lines += ["=" * 72, "END OF MAP FILE", "=" * 72]
+        _write_lines(f, lines)
+
+
+# =========================================================
+# GNU ld
+# =========================================================
+GNU_MEMORIES = (("FLASH", 0x08000000, "xr"), ("RAM", 0x20000000, "rw"))
+GNU_SECTIONS = ((".text", "FLASH"), (".rodata", "FLASH"), (".data", "RAM"), (".bss", "RAM"))
+
+
+def write_gnu_map(path, symbols, objects=None, seed=1):
+    """
+    Writes a GNU ld map with `symbols` input sections (each with one
+    symbol) spread over .text / .rodata / .data / .bss and `objects`
+    object files (default: one per 50 symbols). Every seventh input
+    section has a long name printed on its own line, and alignment
+    padding shows up as *fill* entries.
+    """
+    rng = random.Random(seed)
+    objects = objects or max(1, symbols // 50)
+    per_section = -(-symbols // len(GNU_SECTIONS))
+
+    # Lay the input sections out first so the memories fit them
+    layout = []
+    cursor = {memory: origin for memory, origin, _ in GNU_MEMORIES}
+    remaining = symbols
+    for section, memory in GNU_SECTIONS:
+        count = min(per_section, remaining)
+        remaining -= count
+        start = cursor[memory]
+        entries = []
+        address = start
+        for s in range(count):
+            size = rng.choice(SUB_SIZES) + rng.choice((0, 1, 2))
+            entries.append((s, address, size))
+            address += size + (-(address + size) % 4)
+        cursor[memory] = address
+        layout.append((section, memory, start, address - start, entries))
+
+    with open(path, "w", encoding="ascii") as f:
+        header = [
+            "Archive member included to satisfy reference by file (symbol)",
+            "",
+            "Discarded input sections",
+            "",
+            " .text          0x0000000000000000        0x0 obj/unused.o",
+            "",
+            "Memory Configuration",
+            "",
+            "Name             Origin             Length             Attributes",
+        ]
+        for memory, origin, attributes in GNU_MEMORIES:
+            length = max(0x10000, -(-(cursor[memory] - origin) // 0x10000) * 0x10000)
+            header.append(f"{memory:<16} 0x{origin:016x} 0x{length:016x} {attributes}")
+        header += [
+            f"{'*default*':<16} 0x{0:016x} 0x{2**64 - 1:016x}",
+            "",
+            "Linker script and memory map",
+            "",
+        ]
+        _write_lines(f, header)
+
+        for section, memory, start, size, entries in layout:
+            lines = ["", f"{section:<15} 0x{start:016x} {size:#10x}"]
+            lines.append(f" *({section}*)")
+            lines.append(f"{'':16}0x{start:016x}{'':16}_s{section[1:]} = .")
+
+            for s, address, entry_size in entries:
+                obj = f"obj/module{s % objects}.o"
+                name = f"{section}.item{s}"
+                if s % 7 == 0:
+                    name = f"{section}.very_long_generated_input_section_name_{s}"
+                    lines.append(f" {name}")
+                    lines.append(f"{'':16}0x{address:016x} {entry_size:#10x} {obj}")
+                else:
+                    lines.append(f" {name:<14} 0x{address:016x} {entry_size:#10x} {obj}")
+                lines.append(f"{'':16}0x{address:016x}{'':16}{section[1:]}_sym{s}")
+
+                pad = -(address + entry_size) % 4
+                if pad:
+                    lines.append(f" *fill*         0x{address + entry_size:016x} {pad:#10x} ")
+
+                if len(lines) >= WRITE_BATCH:
+                    _write_lines(f, lines)
+                    lines = []
+
+            lines.append(f"{'':16}0x{start + size:016x}{'':16}_e{section[1:]} = .")
+            _write_lines(f, lines)
+
+        _write_lines(f, ["OUTPUT(firmware.elf elf32-littlearm)"])
+
+
+GENERATORS = {
+    "ctc": write_ctc_map,
+    "hitech": write_hitech_map,
+    "gnu": write_gnu_map,
+}
+
+
+# =========================================================
+# Command line
+# =========================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="mapgen.py", description="Generate synthetic linker MAP files"
+    )
+    parser.add_argument("format", choices=sorted(GENERATORS))
+    parser.add_argument("symbols", type=int)
+    parser.add_argument("output")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--regions", type=int, help="CTC: top-level regions (default symbols/1000)")
+    parser.add_argument("--depth", type=int, default=1, help="CTC: region nesting depth")
+    parser.add_argument("--size-ratio", type=float, default=0.8, help="CTC: share of symbols with _SIZE rows")
+    parser.add_argument("--subs-per-region", type=int, default=8, help="HiTech: sub rows per region (every fourth block is a long one)")
+    args = parser.parse_args(argv)
+
+    if args.format == "ctc":
+        write_ctc_map(args.output, args.symbols, args.regions, args.depth, args.size_ratio, args.seed)
+    elif args.format == "gnu":
+        write_gnu_map(args.output, args.symbols, seed=args.seed)
+    else:
+        write_hitech_map(args.output, args.symbols, args.subs_per_region, args.seed)
+
+    print(f"Written: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CLI = os.path.join(BENCH_DIR, "..", "src", "cli.py")
+DEFAULT_MAP = os.path.join(BENCH_DIR, "..", "input", "app.map")
+
+# Cold-start budget per command, in milliseconds on top of a bare
+# `python -c pass` (so the numbers hold on slower CI runners too).
+# Measured on a 1-CPU runner: 60-85 ms each (about 160 ms before the
+# exporters, multiprocessing and http.server were imported lazily)
+BUDGETS_MS = {
+    "--help": 100,
+    "detect": 100,
+    "check": 120,
+}
+
+# Must never be imported by these commands: the third-party exporters
+# and the stdlib modules only batch / serve / -j / sqlite output need
+FORBIDDEN = (
+    "pandas", "openpyxl", "numpy", "pyarrow",
+    "multiprocessing", "concurrent.futures.process", "http.server", "sqlite3",
+)
+
+
+# =========================================================
+# Measurement
+# =========================================================
+def run_times(command, repeat):
+    """
+    Wall time of `repeat` fresh interpreter runs, in seconds
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def imported_modules(command):
+    """
+    Modules imported by one run, from python -X importtime
+    """
+    result = subprocess.run(
+        [command[0], "-X", "importtime", *command[1:]],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            if name != "imported package":
+                modules.add(name)
+    return modules
+
+
+def commands(map_file):
+    python = sys.executable
+    return {
+        "--help": [python, CLI, "--help"],
+        "detect": [python, CLI, "detect", map_file],
+        "check": [python, CLI, "check", map_file, "--no-cache"],
+    }
+
+
+# =========================================================
+# Command line
+# =========================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="startup.py",
+        description="Check the cold-start time and imports of quick cli.py commands"
+    )
+    parser.add_argument("--map", default=DEFAULT_MAP, help="map for detect / check (default: input/app.map)")
+    parser.add_argument("--repeat", type=int, default=10, help="runs per command (median is kept)")
+    args = parser.parse_args(argv)
+
+    base = statistics.median(run_times([sys.executable, "-c", "pass"], args.repeat))
+    print(f"python -c pass: {base * 1000:.1f} ms")
+    print(f"{'command':<10} {'median':>9} {'over base':>10} {'budget':>8}  forbidden imports")
+
+    failed = False
+    for name, command in commands(args.map).items():
+        median = statistics.median(run_times(command, args.repeat))
+        over = (median - base) * 1000
+        forbidden = sorted(
+            module for module in imported_modules(command)
+            if any(module == f or module.startswith(f + ".") for f in FORBIDDEN)
+        )
+        budget = BUDGETS_MS[name]
+        failed |= over > budget or bool(forbidden)
+
+        print(
+            f"{name:<10} {median * 1000:>6.1f} ms {over:>7.1f} ms {budget:>5} ms  "
+            f"{', '.join(forbidden) or '-'}"
+        )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import glob
+import os
+
+from cache import ParseCache, cached_parse
+from rows import region_rows
+
+MAP_COLUMNS = ["Map", "Format", "Regions", "Sub_Sections", "Issues", "Error"]
+USAGE_COLUMNS = [
+    "Map", "Section", "Start_Address", "End_Address", "Total_Size", "Usage",
+    "Free_Space", "Utilization_%", "Status"
+]
+
+# Per-worker state, set once by init_worker
+_cache = None
+_assign_by = "prefix"
+
+
+# =========================================================
+# Inputs
+# =========================================================
+def expand_inputs(inputs, pattern="*.map"):
+    """
+    Directories contribute their *.map files, anything else is a glob.
+    Returns sorted, de-duplicated paths.
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(glob.glob(os.path.join(item, pattern)))
+        else:
+            paths.update(glob.glob(item))
+    return sorted(p for p in paths if os.path.isfile(p))
+
+
+# =========================================================
+# Worker
+# =========================================================
+def init_worker(cache_dir, use_cache, assign_by):
+    """
+    Runs once per worker process: module imports and the cache handle
+    are paid here, not per map
+    """
+    global _cache, _assign_by
+    _cache = ParseCache(cache_dir) if use_cache else None
+    _assign_by = assign_by
+
+
+def summarize_map(map_file):
+    """
+    Parses one map and returns (map row, region usage rows). Only these
+    small dicts travel back to the parent process, never the layout.
+    """
+    name = os.path.basename(map_file)
+    try:
+        layout = cached_parse(map_file, _assign_by, _cache)
+    except (OSError, ValueError) as e:
+        return _failed(name, str(e)), []
+    except Exception as e:
+        # Any other parser failure is still this map's problem only;
+        # letting it through pool.map would end the whole batch
+        return _failed(name, f"{type(e).__name__}: {e}"), []
+
+    usage = [{"Map": name, **row} for row in region_rows(layout)]
+    issues = sum(1 for status in layout.region_status if status) + \
+        sum(1 for status in layout.sub_status if status)
+
+    return {
+        "Map": name,
+        "Format": layout.fmt,
+        "Regions": layout.region_count,
+        "Sub_Sections": layout.sub_count,
+        "Issues": issues,
+        "Error": ""
+    }, usage
+
+
+def _failed(name, error):
+    return {
+        "Map": name, "Format": "", "Regions": 0, "Sub_Sections": 0,
+        "Issues": 0, "Error": error
+    }
+
+
+# =========================================================
+# Batch run
+# =========================================================
+def run_batch(map_files, workers=None, cache_dir=None, use_cache=True,
+              assign_by="prefix"):
+    """
+    Summarizes maps in a process pool. Returns (map rows, usage rows)
+    in input order.
+    """
+    map_rows = []
+    usage_rows = []
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(map_files) // (4 * workers))
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(cache_dir, use_cache, assign_by)
+    ) as pool:
+        for map_row, usage in pool.map(summarize_map, map_files, chunksize=chunksize):
+            map_rows.append(map_row)
+            usage_rows.extend(usage)
+
+    return map_rows, usage_rows
+
+
+def batch_tables(map_rows, usage_rows):
+    """
+    The batch summary as (title, rows, columns)
+    """
+    return [
+        ("Maps", map_rows, MAP_COLUMNS),
+        ("Region_Usage", usage_rows, USAGE_COLUMNS),
+    ]
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import time
+
+from loader import PARSER_VERSION, parse_map
+from mapio import open_map
+from model import dump_layout, load_layout
+from profiling import stage
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "MAP_PARSER_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "map_parser")
+)
+DEFAULT_CONFIG_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "config", "sections.json"
+)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+
+ENTRY_SUFFIX = ".layout"
+STAT_INDEX = "stat_index.json"
+
+
+# =========================================================
+# Content-hash keyed parse cache
+# =========================================================
+class ParseCache:
+    """
+    On-disk cache of parsed MemoryLayouts.
+
+    Key: sha256 of the map content + PARSER_VERSION + the contents of
+    config/sections.json + assign_by. Entries are serialized layouts
+    (model.dump_layout). A small stat index (path, size, mtime) ->
+    content hash avoids re-hashing unchanged maps, so a warm lookup is
+    a stat plus one file read.
+
+    Eviction is LRU by access time (hits touch the entry), bounded by
+    max_bytes total and max_age seconds since last use.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES,
+                 max_age=DEFAULT_MAX_AGE, config_file=DEFAULT_CONFIG_FILE):
+        self.directory = directory or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.config_file = config_file
+        os.makedirs(self.directory, exist_ok=True)
+
+    # -------- Keys --------
+    def config_digest(self):
+        try:
+            with open(self.config_file, "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return "no-config"
+
+    def content_digest(self, map_file):
+        """
+        sha256 of the map, reused from the stat index while the file's
+        size and mtime are unchanged
+        """
+        st = os.stat(map_file)
+        stamp = f"{st.st_size}:{st.st_mtime_ns}"
+        path = os.path.abspath(map_file)
+
+        index = self._read_index()
+        known = index.get(path)
+        if known and known[0] == stamp:
+            return known[1]
+
+        with open_map(map_file) as data:
+            digest = hashlib.sha256(data).hexdigest()
+
+        index = {p: entry for p, entry in index.items() if os.path.exists(p)}
+        index[path] = [stamp, digest]
+        self._write_index(index)
+        return digest
+
+    def key(self, map_file, assign_by="prefix"):
+        parts = [
+            self.content_digest(map_file), PARSER_VERSION,
+            self.config_digest(), assign_by,
+        ]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    # -------- Entries --------
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key):
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                layout = load_layout(f.read())
+        except (OSError, ValueError):
+            return None
+
+        os.utime(path)
+        return layout
+
+    def put(self, key, layout):
+        path = self._entry_path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+
+        with open(tmp, "wb") as f:
+            f.write(dump_layout(layout))
+        os.replace(tmp, path)
+
+        self.evict()
+
+    def evict(self):
+        """
+        Drops entries unused for max_age, then least recently used
+        entries until the cache fits in max_bytes
+        """
+        now = time.time()
+        entries = []
+
+        for name in os.listdir(self.directory):
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+
+            if now - st.st_mtime > self.max_age:
+                _remove(path)
+            else:
+                entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            _remove(path)
+            total -= size
+
+    # -------- Stat index --------
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.directory, STAT_INDEX), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        path = os.path.join(self.directory, STAT_INDEX)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp, path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# =========================================================
+# Cached parse
+# =========================================================
+def cached_parse(map_file, assign_by="prefix", cache=None, workers=1):
+    """
+    parse_map with an on-disk cache; cache=None parses directly
+    """
+    if cache is None:
+        return parse_map(map_file, assign_by, workers)
+
+    with stage("cache_lookup") as record:
+        key = cache.key(map_file, assign_by)
+        layout = cache.get(key)
+        record["rows"] = 0 if layout is None else layout.region_count + layout.sub_count
+
+    if layout is None:
+        layout = parse_map(map_file, assign_by, workers)
+        with stage("cache_store"):
+            cache.put(key, layout)
+    return layout
@@ -0,0 +1,596 @@
+import argparse
+import os
+import sys
+
+from batch import batch_tables, expand_inputs, run_batch
+from cache import DEFAULT_CONFIG_FILE, ParseCache, cached_parse
+from diff import diff_tables
+from exporters import EXPORTERS, export_tables, output_files
+from loader import PARSERS
+from mapio import detect_format
+from memories import memory_usage, merge_memories, read_linker_memories, read_map_memories
+from profiling import Profiler, profiling, stage, staged_tables
+from rows import (
+    HIERARCHICAL_COLUMNS, LOOKUP_COLUMNS, SECTION_COLUMNS, hierarchical_rows, lookup_rows,
+    report_tables, section_rows
+)
+from sections import get_section_ranges, load_sections
+from symbol_index import SymbolIndex, read_addresses
+from tree import SectionTree, write_tree_json
+from validator import (
+    OK, RANGE_STATUSES, load_section_rules, validate_layout, validate_sections
+)
+from watch import DEFAULT_INTERVAL, DEFAULT_MAP_FILE, MapWatcher, watch
+
+
+# =========================================================
+# Shared options
+# =========================================================
+def open_cache(args):
+    if args.no_cache:
+        return None
+    return ParseCache(args.cache_dir)
+
+
+def add_output_arguments(parser):
+    parser.add_argument(
+        "-f", "--format", choices=sorted(EXPORTERS),
+        help="output format (default: from the output extension, else xlsx)"
+    )
+    parser.add_argument(
+        "--assign-by", choices=("prefix", "address"), default="prefix",
+        help="assign sub-regions by name prefix or address containment"
+    )
+
+
+def add_jobs_argument(parser):
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="scan a large CTC map in this many parallel chunks (default: 1)"
+    )
+
+
+def add_cache_arguments(parser):
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="always re-parse, do not read or write the parse cache"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="parse cache directory (default: $MAP_PARSER_CACHE or ~/.cache/map_parser)"
+    )
+
+
+def add_profile_arguments(parser):
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="print wall / CPU time, peak memory and rows per stage"
+    )
+    parser.add_argument(
+        "--profile-json", metavar="FILE",
+        help="also write the stage trace as JSON (implies --profile)"
+    )
+    parser.add_argument(
+        "--profile-no-memory", action="store_true",
+        help="with --profile: skip tracemalloc (it slows Python-heavy stages several times)"
+    )
+    parser.add_argument(
+        "--cprofile", metavar="FILE",
+        help="dump cProfile stats of the slowest top-level stage (implies --profile)"
+    )
+
+
+def export(args, tables):
+    with stage("export"):
+        return export_tables(args.output, staged_tables(tables), args.format)
+
+
+def written(args, counts):
+    """
+    The file(s) an export wrote: CSV and Parquet write one file per
+    table next to the output path
+    """
+    return ", ".join(output_files(args.output, counts, args.format))
+
+
+def run_profiled(args):
+    """
+    Runs the command under a Profiler and reports the stages
+    """
+    profiler = Profiler(memory=not args.profile_no_memory, cprofile=bool(args.cprofile))
+
+    with profiling(profiler):
+        status = args.func(args)
+
+    print()
+    print(profiler.summary())
+
+    if args.profile_json:
+        profiler.write_trace(args.profile_json)
+        print(f"Stage trace: {args.profile_json}")
+    if args.cprofile:
+        name = profiler.dump_slowest(args.cprofile)
+        if name:
+            print(f"cProfile of slowest stage ({name}): {args.cprofile}")
+
+    return status
+
+
+# =========================================================
+# detect
+# =========================================================
+def cmd_detect(args):
+    status = 0
+    formats = tuple(PARSERS)
+    for map_file in args.map_files:
+        try:
+            fmt = detect_format(map_file, formats)
+        except (OSError, ValueError) as e:
+            fmt = f"error: {e}"
+        if fmt not in PARSERS:
+            status = 1
+        print(f"{map_file}: {fmt}")
+    return status
+
+
+# =========================================================
+# report
+# =========================================================
+def report_memories(args):
+    """
+    Memories from --linker-script and the map's Memory Configuration
+    table; the map wins for names found in both
+    """
+    script = read_linker_memories(args.linker_script) if args.linker_script else []
+    return merge_memories(script, read_map_memories(args.map_file))
+
+
+def cmd_report(args):
+    try:
+        layout = cached_parse(args.map_file, args.assign_by, open_cache(args), args.jobs)
+        memories = report_memories(args)
+    except (OSError, ValueError) as e:
+        print(e)
+        return 1
+
+    with stage("memory_usage") as record:
+        usage = memory_usage(layout, memories) if memories else None
+        record["rows"] = layout.region_count + layout.sub_count
+
+    try:
+        counts = export(args, report_tables(layout, usage))
+    except (OSError, RuntimeError, ValueError) as e:
+        print(e)
+        return 1
+
+    print(f"Report generated: {written(args, counts)}")
+    for title, count in counts.items():
+        print(f"{title:<26}: {count}")
+    return 0
+
+
+# =========================================================
+# diff
+# =========================================================
+def cmd_diff(args):
+    cache = open_cache(args)
+    try:
+        old_layout = cached_parse(args.old_map, args.assign_by, cache, args.jobs)
+        new_layout = cached_parse(args.new_map, args.assign_by, cache, args.jobs)
+    except (OSError, ValueError) as e:
+        print(e)
+        return 1
+
+    try:
+        counts = export(args, diff_tables(old_layout, new_layout))
+    except (OSError, RuntimeError, ValueError) as e:
+        print(e)
+        return 1
+
+    print(f"Diff generated: {written(args, counts)}")
+    for title, count in counts.items():
+        print(f"{title:<26}: {count}")
+    return 0
+
+
+# =========================================================
+# check
+# =========================================================
+def cmd_check(args):
+    try:
+        layout = cached_parse(args.map_file, args.assign_by, open_cache(args), args.jobs)
+        rules = load_section_rules(args.config)
+    except (OSError, ValueError) as e:
+        print(e)
+        return 1
+
+    with stage("validate") as record:
+        status = validate_layout(layout, rules)
+        record["rows"] = len(status)
+
+    counts = dict.fromkeys(RANGE_STATUSES, 0)
+    shown = 0
+    for (parent, name, start, size, _, _), code in zip(layout.subs(), status):
+        finding = RANGE_STATUSES[code]
+        counts[finding] += 1
+        if finding != OK and shown < args.max_findings:
+            shown += 1
+            size_text = "-" if size is None else hex(size)
+            print(f"{finding:<14} {parent} / {name} {hex(start)} size {size_text}")
+
+    failed = len(status) - counts[OK]
+    print(f"Checked {len(status)} sub-regions against {args.config}")
+    for finding, count in counts.items():
+        if count:
+            print(f"{finding:<14}: {count}")
+    return 1 if failed else 0
+
+
+# =========================================================
+# sections
+# =========================================================
+def cmd_sections(args):
+    try:
+        sections = load_sections(args.config)
+        rules = load_section_rules(args.config)
+
+        names = [section["ram_name"] for section in sections]
+        with stage("extract_sections") as record:
+            ranges = get_section_ranges(args.map_file, names)
+            record["rows"] = len(ranges)
+    except (OSError, ValueError) as e:
+        print(e)
+        return 1
+
+    status = validate_sections(ranges, rules)
+    for name in names:
+        start, end = ranges[name]
+        start_text = "-" if start is None else hex(start)
+        end_text = "-" if end is None else hex(end)
+        print(f"{name} -> {start_text} - {end_text} ({status[name]})")
+
+    try:
+        counts = export(args, [("Sections", section_rows(sections, ranges, status), SECTION_COLUMNS)])
+    except (OSError, RuntimeError, ValueError) as e:
+        print(e)
+        return 1
+
+    print(f"Sections written: {written(args, counts)}")
+    return 0
+
+
+# =========================================================
+# watch
+# =========================================================
+def cmd_watch(args):
+    try:
+        watcher = MapWatcher(
+            args.map_file, args.output, args.format, args.assign_by, args.linker_script
+        )
+    except (OSError, ValueError) as e:
+        print(e)
+        return 1
+
+    print(f"Watching {args.map_file} (Ctrl+C to stop)")
+    try:
+        watch(watcher, args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+# =========================================================
+# lookup
+# =========================================================
+def cmd_lookup(args):
+    try:
+        layout = cached_parse(args.map_file, args.assign_by, open_cache(args), args.jobs)
+        if args.addresses == "-":
+            addresses = read_addresses(sys.stdin)
+        else:
+            with open(args.addresses, encoding="utf-8", errors="replace") as f:
+                addresses = read_addresses(f)
+    except (OSError, ValueError) as e:
+        print(e)
+        return 1
+
+    with stage("build_index") as record:
+        index = SymbolIndex(layout)
+        record["rows"] = layout.sub_count
+
+    rows = lookup_rows(index, addresses)
+    if args.output is None:
+        with stage("lookup") as record:
+            record["rows"] = len(addresses)
+            for row in rows:
+                offset = f"+{row['Offset']}" if row["Symbol"] else ""
+                print(
+                    f"{row['Address']:<20} {row['Symbol'] or '-'}{offset} "
+                    f"[{row['Match']}] {row['Parent_Section'] or '-'}"
+                    f"{' RESET_SAFE' if row['Reset_Safe'] else ''}"
+                )
+        return 0
+
+    try:
+        counts = export(args, [("Lookup", rows, LOOKUP_COLUMNS)])
+    except (OSError, RuntimeError, ValueError) as e:
+        print(e)
+        return 1
+
+    print(f"Resolved {counts['Lookup']} addresses: {written(args, counts)}")
+    return 0
+
+
+# =========================================================
+# tree
+# =========================================================
+def cmd_tree(args):
+    try:
+        layout = cached_parse(args.map_file, args.assign_by, open_cache(args), args.jobs)
+    except (OSError, ValueError) as e:
+        print(e)
+        return 1
+
+    tree = SectionTree(layout)
+
+    try:
+        if args.format is None and args.output.lower().endswith(".json"):
+            with stage("export") as record:
+                record["rows"] = write_tree_json(tree, args.output)
+            output = args.output
+        else:
+            counts = export(args, [("Hierarchical_Sub_Sections", hierarchical_rows(tree), HIERARCHICAL_COLUMNS)])
+            output = written(args, counts)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(e)
+        return 1
+
+    print(f"Tree written: {output}")
+    print(f"Regions     : {layout.region_count}")
+    print(f"Sections    : {len(tree.section_name)}")
+    print(f"Groups      : {layout.sub_count}")
+    return 0
+
+
+# =========================================================
+# serve
+# =========================================================
+def build_paths(items):
+    """
+    NAME=MAP pairs; plain map files, directories and globs are named
+    after the file (app.map -> app)
+    """
+    builds = {}
+    for item in items:
+        name, sep, map_file = item.partition("=")
+        if sep and not os.path.exists(item):
+            builds[name] = map_file
+            continue
+        for path in expand_inputs([item]):
+            builds[os.path.splitext(os.path.basename(path))[0]] = path
+    return builds
+
+
+def cmd_serve(args):
+    # http.server is the heaviest import of the CLI; only serve needs it
+    from server import DEFAULT_HOST, DEFAULT_PORT, BuildStore, make_server
+
+    host = args.host or DEFAULT_HOST
+    port = DEFAULT_PORT if args.port is None else args.port
+
+    store = BuildStore(
+        build_paths(args.builds), args.max_memory * 2**20, open_cache(args), args.assign_by
+    )
+    try:
+        server = make_server(store, host, port, args.verbose)
+    except OSError as e:
+        print(e)
+        return 1
+
+    print(f"Serving {len(store.paths)} builds on http://{host}:{server.server_port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+# =========================================================
+# batch
+# =========================================================
+def cmd_batch(args):
+    map_files = expand_inputs(args.inputs)
+    if not map_files:
+        print("No map files found")
+        return 1
+
+    with stage("batch_parse") as record:
+        map_rows, usage_rows = run_batch(
+            map_files, args.workers, args.cache_dir, not args.no_cache, args.assign_by
+        )
+        record["rows"] = len(map_rows)
+
+    try:
+        counts = export(args, batch_tables(map_rows, usage_rows))
+    except (OSError, RuntimeError, ValueError) as e:
+        print(e)
+        return 1
+
+    failed = [row for row in map_rows if row["Error"]]
+    print(f"Summary generated: {written(args, counts)}")
+    print(f"Maps parsed: {len(map_rows) - len(failed)} / {len(map_rows)}")
+    for row in failed:
+        print(f"  {row['Map']}: {row['Error']}")
+    return 1 if failed else 0
+
+
+# =========================================================
+# Command line
+# =========================================================
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Memory layout reports from linker MAP files"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    detect = commands.add_parser(
+        "detect", help="print the format of each map (exit status 1 if one is unknown)"
+    )
+    detect.add_argument("map_files", nargs="+")
+    add_profile_arguments(detect)
+    detect.set_defaults(func=cmd_detect)
+
+    report = commands.add_parser("report", help="parse one map and write the report tables")
+    report.add_argument("map_file")
+    report.add_argument("output", nargs="?", default="memory_layout.xlsx")
+    report.add_argument(
+        "--linker-script", metavar="LD",
+        help="linker script whose MEMORY regions (e.g. linker/linker.ld) "
+             "give the capacities for the Memory_Usage table"
+    )
+    add_output_arguments(report)
+    add_jobs_argument(report)
+    add_cache_arguments(report)
+    add_profile_arguments(report)
+    report.set_defaults(func=cmd_report)
+
+    diff = commands.add_parser("diff", help="compare two maps (old -> new build)")
+    diff.add_argument("old_map")
+    diff.add_argument("new_map")
+    diff.add_argument("output", nargs="?", default="memory_diff.xlsx")
+    add_output_arguments(diff)
+    add_jobs_argument(diff)
+    add_cache_arguments(diff)
+    add_profile_arguments(diff)
+    diff.set_defaults(func=cmd_diff)
+
+    check = commands.add_parser(
+        "check", help="validate alignment and bounds against config/sections.json"
+    )
+    check.add_argument("map_file")
+    check.add_argument(
+        "--config", default=DEFAULT_CONFIG_FILE,
+        help="sections.json with alignment / origin / length per section"
+    )
+    check.add_argument(
+        "--max-findings", type=int, default=50,
+        help="findings printed in full (default: 50)"
+    )
+    check.add_argument(
+        "--assign-by", choices=("prefix", "address"), default="prefix",
+        help="assign sub-regions by name prefix or address containment"
+    )
+    add_jobs_argument(check)
+    add_cache_arguments(check)
+    add_profile_arguments(check)
+    check.set_defaults(func=cmd_check)
+
+    sections = commands.add_parser(
+        "sections", help="begin / end of every config/sections.json section"
+    )
+    sections.add_argument("map_file")
+    sections.add_argument("output", nargs="?", default="memory_sections.xlsx")
+    sections.add_argument(
+        "--config", default=DEFAULT_CONFIG_FILE,
+        help="sections.json listing the ram_name of each section"
+    )
+    add_output_arguments(sections)
+    add_profile_arguments(sections)
+    sections.set_defaults(func=cmd_sections)
+
+    watch_cmd = commands.add_parser(
+        "watch", help="re-report a map every time a build changes it"
+    )
+    watch_cmd.add_argument("map_file", nargs="?", default=DEFAULT_MAP_FILE)
+    watch_cmd.add_argument("output", nargs="?", default="memory_layout.xlsx")
+    watch_cmd.add_argument(
+        "--interval", type=float, default=DEFAULT_INTERVAL,
+        help=f"seconds between polls (default: {DEFAULT_INTERVAL})"
+    )
+    watch_cmd.add_argument("--linker-script", metavar="LD")
+    add_output_arguments(watch_cmd)
+    add_profile_arguments(watch_cmd)
+    watch_cmd.set_defaults(func=cmd_watch)
+
+    lookup = commands.add_parser(
+        "lookup", help="resolve a file of addresses to symbols and regions"
+    )
+    lookup.add_argument("map_file")
+    lookup.add_argument(
+        "addresses", help="text file with one address per line (first 0x... on the line), - for stdin"
+    )
+    lookup.add_argument("-o", "--output", help="write a Lookup table instead of printing")
+    add_output_arguments(lookup)
+    add_jobs_argument(lookup)
+    add_cache_arguments(lookup)
+    add_profile_arguments(lookup)
+    lookup.set_defaults(func=cmd_lookup)
+
+    tree = commands.add_parser(
+        "tree", help="region -> section -> group tree with size / free rollups"
+    )
+    tree.add_argument("map_file")
+    tree.add_argument(
+        "output", nargs="?", default="memory_tree.json",
+        help="*.json: nested regions / sections / groups; "
+             "other formats: the Hierarchical_Sub_Sections sheet"
+    )
+    add_output_arguments(tree)
+    add_jobs_argument(tree)
+    add_cache_arguments(tree)
+    add_profile_arguments(tree)
+    tree.set_defaults(func=cmd_tree)
+
+    serve = commands.add_parser(
+        "serve", help="answer address / range / usage queries over HTTP for many builds"
+    )
+    serve.add_argument(
+        "builds", nargs="*",
+        help="NAME=MAP pairs, map files, directories (*.map) or glob patterns"
+    )
+    serve.add_argument("--host", help="address to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, help="port to listen on (default: 8765)")
+    serve.add_argument(
+        "--max-memory", type=int, default=1024, metavar="MB",
+        help="drop the least recently used builds above this (default: 1024)"
+    )
+    serve.add_argument(
+        "--assign-by", choices=("prefix", "address"), default="prefix",
+        help="assign sub-regions by name prefix or address containment"
+    )
+    serve.add_argument("--verbose", action="store_true", help="log every request")
+    add_cache_arguments(serve)
+    add_profile_arguments(serve)
+    serve.set_defaults(func=cmd_serve)
+
+    batch = commands.add_parser(
+        "batch", help="summarize region usage of many maps in parallel"
+    )
+    batch.add_argument(
+        "inputs", nargs="+", help="map directories (*.map) or glob patterns"
+    )
+    batch.add_argument("-o", "--output", default="memory_summary.xlsx")
+    batch.add_argument(
+        "-j", "--workers", type=int,
+        help="worker processes (default: CPU count)"
+    )
+    add_output_arguments(batch)
+    add_cache_arguments(batch)
+    add_profile_arguments(batch)
+    batch.set_defaults(func=cmd_batch)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile or args.profile_json or args.cprofile:
+        return run_profiled(args)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+from model import MemoryLayout
+from profiling import stage
+from region_index import nested_symbols
+from scanner import read_ctc_symbols
+from verifier import verify_memory_layout
+
+
+# =========================================================
+# CTC layout builder
+# =========================================================
+def build_ctc_layout(symbols, sizes, assign_by="prefix"):
+    """
+    Builds a MemoryLayout from scanned CTC symbols / sizes.
+
+    Every NAME_START symbol opens a region NAME sized by NAME_SIZE;
+    sub-regions are assigned with region_index.nested_symbols and the
+    result is checked by the sweep-line verifier.
+    """
+    layout = MemoryLayout("ctc")
+
+    with stage("build_regions") as record:
+        nested = nested_symbols(symbols, sizes, assign_by)
+
+        for name, start in symbols.items():
+            if not name.endswith("_START"):
+                continue
+
+            base = name.replace("_START", "")
+            region = layout.add_region(base, start, sizes.get(base + "_SIZE"))
+
+            for sub in nested[base]:
+                layout.add_sub(region, sub, symbols[sub], sizes.get(sub + "_SIZE"))
+
+        record["rows"] = layout.region_count + layout.sub_count
+
+    with stage("verify") as record:
+        record["rows"] = len(verify_memory_layout(layout))
+
+    return layout
+
+
+def parse_ctc(source, assign_by="prefix", workers=1):
+    """
+    Parses a CTC map (path or mapped buffer) into a MemoryLayout;
+    workers > 1 scans a map file in parallel chunks
+    """
+    with stage("collect_symbols") as record:
+        symbols, sizes = read_ctc_symbols(source, workers)
+        record["rows"] = len(symbols) + len(sizes)
+    return build_ctc_layout(symbols, sizes, assign_by)
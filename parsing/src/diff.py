@@ -0,0 +1,181 @@
+from metrics import region_metrics
+from model import MISSING
+
+# Change kinds in the Symbol_Changes table
+ADDED = "ADDED"
+REMOVED = "REMOVED"
+MOVED = "MOVED"
+RESIZED = "RESIZED"
+MOVED_RESIZED = "MOVED_RESIZED"
+
+SYMBOL_CHANGE_COLUMNS = [
+    "Symbol", "Change", "Old_Parent", "New_Parent", "Old_Address",
+    "New_Address", "Old_Size", "New_Size", "Size_Delta"
+]
+REGION_DELTA_COLUMNS = [
+    "Section", "Old_Total_Size", "New_Total_Size", "Old_Usage", "New_Usage",
+    "Usage_Delta", "Old_Free_Space", "New_Free_Space", "Free_Space_Delta"
+]
+
+
+# =========================================================
+# Sorted tables
+# =========================================================
+def sorted_symbols(layout):
+    """
+    (name, parent, start, size) per sub-region sorted by name. A name
+    listed under several regions is kept once (first row), as in the
+    verifier.
+    """
+    names = layout.names.names
+    parents = layout.region_name
+
+    first = {}
+    for i, name_id in enumerate(layout.sub_name):
+        first.setdefault(name_id, i)
+
+    symbols = []
+    for name_id, i in first.items():
+        symbols.append((
+            names[name_id],
+            names[parents[layout.sub_parent[i]]],
+            layout.sub_start[i],
+            layout.sub_size[i],
+        ))
+
+    symbols.sort()
+    return symbols
+
+
+def sorted_regions(layout):
+    """
+    (name, total size, usage, free) per region sorted by name, from
+    region_metrics (None where the region size is unknown)
+    """
+    regions = {}
+    metrics = region_metrics(layout)
+    for name_id, size, usage, free in zip(
+        layout.region_name, metrics["size"], metrics["usage"], metrics["free"]
+    ):
+        name = layout.names[name_id]
+        regions.setdefault(name, (name, size, usage, free))
+    return sorted(regions.values(), key=lambda region: region[0])
+
+
+def merge_sorted(old, new):
+    """
+    Walks two name-sorted lists once and yields (old, new) pairs, with
+    None on the side where the name is missing
+    """
+    i = j = 0
+    while i < len(old) and j < len(new):
+        old_name, new_name = old[i][0], new[j][0]
+        if old_name == new_name:
+            yield old[i], new[j]
+            i += 1
+            j += 1
+        elif old_name < new_name:
+            yield old[i], None
+            i += 1
+        else:
+            yield None, new[j]
+            j += 1
+
+    for k in range(i, len(old)):
+        yield old[k], None
+    for k in range(j, len(new)):
+        yield None, new[k]
+
+
+# =========================================================
+# Diff rows
+# =========================================================
+def _hex(value):
+    # Unknown values stay empty cells, as in the report tables
+    return None if value is None else hex(value)
+
+
+def _size(size):
+    return None if size is None or size == MISSING else size
+
+
+def _delta(old, new):
+    return None if old is None or new is None else new - old
+
+
+def symbol_change_rows(old_layout, new_layout):
+    """
+    Yields one row per added, removed, moved or resized symbol
+    """
+    for old, new in merge_sorted(sorted_symbols(old_layout), sorted_symbols(new_layout)):
+        if new is None:
+            name, old_parent, old_start, old_size = old
+            new_parent, new_start, new_size = None, None, 0
+            change = REMOVED
+        elif old is None:
+            name, new_parent, new_start, new_size = new
+            old_parent, old_start, old_size = None, None, 0
+            change = ADDED
+        else:
+            name, old_parent, old_start, old_size = old
+            _, new_parent, new_start, new_size = new
+
+            moved = old_start != new_start
+            resized = old_size != new_size
+            if not (moved or resized):
+                continue
+            change = MOVED_RESIZED if moved and resized else MOVED if moved else RESIZED
+
+        # An absent symbol has size 0; an unknown size has no delta
+        old_size, new_size = _size(old_size), _size(new_size)
+        delta = _delta(old_size, new_size)
+        if change is REMOVED:
+            new_size = None
+        elif change is ADDED:
+            old_size = None
+
+        yield {
+            "Symbol": name,
+            "Change": change,
+            "Old_Parent": old_parent,
+            "New_Parent": new_parent,
+            "Old_Address": _hex(old_start),
+            "New_Address": _hex(new_start),
+            "Old_Size": _hex(old_size),
+            "New_Size": _hex(new_size),
+            "Size_Delta": _hex(delta),
+        }
+
+
+def region_delta_rows(old_layout, new_layout):
+    """
+    Yields per-region total size, usage and free-space deltas; regions
+    present in only one build count as 0 in the other. A value that is
+    unknown in either build (a region without a size) has no delta.
+    """
+    for old, new in merge_sorted(sorted_regions(old_layout), sorted_regions(new_layout)):
+        name = (old or new)[0]
+        _, old_total, old_usage, old_free = old or (name, 0, 0, 0)
+        _, new_total, new_usage, new_free = new or (name, 0, 0, 0)
+
+        yield {
+            "Section": name,
+            "Old_Total_Size": _hex(old_total),
+            "New_Total_Size": _hex(new_total),
+            "Old_Usage": _hex(old_usage),
+            "New_Usage": _hex(new_usage),
+            "Usage_Delta": _hex(_delta(old_usage, new_usage)),
+            "Old_Free_Space": _hex(old_free),
+            "New_Free_Space": _hex(new_free),
+            "Free_Space_Delta": _hex(_delta(old_free, new_free)),
+        }
+
+
+def diff_tables(old_layout, new_layout):
+    """
+    The diff report as (title, rows, columns), like rows.report_tables
+    """
+    return [
+        ("Region_Deltas", region_delta_rows(old_layout, new_layout), REGION_DELTA_COLUMNS),
+        ("Symbol_Changes", symbol_change_rows(old_layout, new_layout), SYMBOL_CHANGE_COLUMNS),
+    ]
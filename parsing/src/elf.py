@@ -0,0 +1,204 @@
+import struct
+
+from mapio import ELF_MAGIC, mapped
+from model import MemoryLayout
+from profiling import stage
+from verifier import verify_memory_layout
+
+# e_ident[EI_CLASS] / e_ident[EI_DATA]
+ELFCLASS32 = 1
+ELFCLASS64 = 2
+ELFDATA2LSB = 1
+ELFDATA2MSB = 2
+
+# Section header types / flags and special section indices
+SHT_SYMTAB = 2
+SHT_NOBITS = 8
+SHF_ALLOC = 0x2
+SHN_UNDEF = 0
+SHN_LORESERVE = 0xFF00
+SHN_XINDEX = 0xFFFF
+
+# Symbol types kept as sub-regions (linker symbols such as _sdata are NOTYPE)
+STT_NOTYPE = 0
+STT_OBJECT = 1
+STT_FUNC = 2
+STT_TLS = 6
+SYMBOL_TYPES = (STT_NOTYPE, STT_OBJECT, STT_FUNC, STT_TLS)
+
+# Thumb functions carry the mode in bit 0 of their address
+EM_ARM = 40
+
+# Header, section header and symbol layouts per ELF class
+# (without the byte-order prefix)
+_FORMATS = {
+    ELFCLASS32: ("HHIIIIIHHHHHH", "IIIIIIIIII", "IIIBBH"),
+    ELFCLASS64: ("HHIQQQIHHHHHH", "IIQQQQIIQQ", "IBBHQQ"),
+}
+
+
+# =========================================================
+# Zero-copy ELF reader
+# =========================================================
+class ElfError(ValueError):
+    pass
+
+
+def _check_range(data, offset, size, what):
+    if offset + size > len(data):
+        raise ElfError(f"truncated ELF: {what} ends past the end of the file")
+
+
+def _cstring(data, offset):
+    end = data.find(b"\0", offset)
+    if end < 0:
+        raise ElfError("truncated ELF: unterminated string table entry")
+    return bytes(data[offset:end]).decode("utf-8", "replace")
+
+
+def read_sections(data):
+    """
+    Returns (machine, sections, unpack_symbols) for a mapped ELF file.
+
+    sections: list of (name, type, flags, addr, offset, size, link,
+    entsize) from the section header table. unpack_symbols is the
+    struct.Struct for one symbol entry, already in the file's byte
+    order and class. Tables are decoded straight from the mapping with
+    struct.iter_unpack, nothing is copied.
+    """
+    if data[:4] != ELF_MAGIC:
+        raise ElfError("Not an ELF file")
+
+    elf_class, byte_order = data[4], data[5]
+    if elf_class not in _FORMATS or byte_order not in (ELFDATA2LSB, ELFDATA2MSB):
+        raise ElfError("Unsupported ELF class or byte order")
+
+    endian = "<" if byte_order == ELFDATA2LSB else ">"
+    header_format, section_format, symbol_format = _FORMATS[elf_class]
+
+    header = struct.Struct(endian + header_format)
+    _check_range(data, 16, header.size, "header")
+    (
+        _, machine, _, _, _, shoff, _, _, _, _, shentsize, shnum, shstrndx
+    ) = header.unpack_from(data, 16)
+
+    section = struct.Struct(endian + section_format)
+    if shoff == 0:
+        return machine, [], struct.Struct(endian + symbol_format)
+
+    if shentsize != section.size:
+        raise ElfError(f"Unsupported section header size {shentsize}")
+
+    # Large section counts / string table index live in section 0
+    _check_range(data, shoff, section.size, "section header table")
+    first = section.unpack_from(data, shoff)
+    if shnum == 0:
+        shnum = first[5]
+    if shstrndx == SHN_XINDEX:
+        shstrndx = first[6]
+
+    _check_range(data, shoff, shnum * shentsize, "section header table")
+    with memoryview(data) as view:
+        table = view[shoff:shoff + shnum * shentsize]
+        headers = list(struct.iter_unpack(section.format, table))
+        table.release()
+
+    names_offset = None
+    if shstrndx < len(headers):
+        names_offset, names_size = headers[shstrndx][4:6]
+        _check_range(data, names_offset, names_size, "section name table")
+
+    sections = []
+    for name, sh_type, flags, addr, offset, size, link, _, _, entsize in headers:
+        sections.append((
+            _cstring(data, names_offset + name) if names_offset is not None else "",
+            sh_type, flags, addr, offset, size, link, entsize,
+        ))
+
+    return machine, sections, struct.Struct(endian + symbol_format)
+
+
+def iter_symbols(data, sections, symbol, elf_class):
+    """
+    Yields (name, value, size, type, shndx) for every .symtab entry
+    """
+    for _, sh_type, _, _, offset, size, link, entsize in sections:
+        if sh_type != SHT_SYMTAB or not entsize:
+            continue
+
+        strtab = None
+        if link < len(sections):
+            strtab, strtab_size = sections[link][4], sections[link][5]
+            _check_range(data, strtab, strtab_size, "symbol string table")
+        count = size // symbol.size
+        _check_range(data, offset, count * symbol.size, "symbol table")
+
+        with memoryview(data) as view:
+            table = view[offset:offset + count * symbol.size]
+            for entry in struct.iter_unpack(symbol.format, table):
+                if elf_class == ELFCLASS32:
+                    name, value, sym_size, info, _, shndx = entry
+                else:
+                    name, info, _, shndx, value, sym_size = entry
+
+                if not name or strtab is None:
+                    continue
+                yield _cstring(data, strtab + name), value, sym_size, info & 0xF, shndx
+            table.release()
+
+
+# =========================================================
+# ELF -> MemoryLayout
+# =========================================================
+def collect_elf_layout(data):
+    """
+    Builds a MemoryLayout from a mapped ELF file.
+
+    Regions are the allocated sections (SHF_ALLOC) with their exact
+    address and size, tagged PROGBITS or NOBITS; sub-regions are the
+    function, object, TLS and linker (NOTYPE) symbols defined in them,
+    sized by st_size (0 -> unknown).
+    """
+    layout = MemoryLayout("elf")
+    machine, sections, symbol = read_sections(data)
+    elf_class = data[4]
+
+    regions = {}
+    for index, (name, sh_type, flags, addr, _, size, _, _) in enumerate(sections):
+        if flags & SHF_ALLOC and name:
+            tag = "NOBITS" if sh_type == SHT_NOBITS else "PROGBITS"
+            regions[index] = layout.add_region(name, addr, size, tag)
+
+    for name, value, size, sym_type, shndx in iter_symbols(data, sections, symbol, elf_class):
+        if sym_type not in SYMBOL_TYPES or name.startswith("$"):
+            continue
+        if shndx == SHN_UNDEF or shndx >= SHN_LORESERVE:
+            continue
+
+        region = regions.get(shndx)
+        if region is None:
+            continue
+
+        if machine == EM_ARM and sym_type == STT_FUNC:
+            value &= ~1
+
+        layout.add_sub(region, name, value, size or None)
+
+    return layout
+
+
+def parse_elf(source, assign_by="prefix"):
+    """
+    Reads an ELF file (path or mapped buffer) into a MemoryLayout.
+    assign_by is accepted for the loader's parser signature; symbols
+    already name their section.
+    """
+    with mapped(source) as data:
+        with stage("collect_symbols") as record:
+            layout = collect_elf_layout(data)
+            record["rows"] = layout.region_count + layout.sub_count
+
+    with stage("verify") as record:
+        record["rows"] = len(verify_memory_layout(layout))
+
+    return layout
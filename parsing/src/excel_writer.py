@@ -1,4 +1,5 @@
-import pandas as pd
+# pandas is imported by the functions that need it, so the address
+# helpers stay importable without it
 
 
 def safe_hex_to_int(value):
@@ -11,23 +12,53 @@ def safe_hex_to_int(value):
     return None
 
 
-def write_excel(data, output_file):
+def address_to_int(value):
+    """
+    Integer addresses pass through untouched, legacy hex strings
+    are parsed; anything else is None
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return safe_hex_to_int(value)
+
+
+def address_column(values):
+    """
+    Integer / hex-string addresses as a nullable UInt64 column: <NA>
+    where missing, so the column never falls back to object dtype
+    """
+    import pandas as pd
 
-    df = pd.DataFrame(data)
+    return pd.Series(pd.array(list(map(address_to_int, values)), dtype="UInt64"), index=values.index)
 
-    sizes = []
 
-    for _, row in df.iterrows():
+def hex_column(column):
+    """
+    UInt64 column -> hex strings, None where missing
+    """
+    import pandas as pd
+
+    return [None if value is pd.NA else hex(value) for value in column]
+
+
+def write_excel(data, output_file):
+    import pandas as pd
+
+    # object dtype keeps the input values as given until they are parsed
+    df = pd.DataFrame(data, dtype=object)
 
-        start_int = safe_hex_to_int(row["Start Address"])
-        end_int = safe_hex_to_int(row["End Address"])
+    if df.empty:
+        # Nothing to size: an empty sheet with just the size column
+        df["Size (Bytes)"] = []
+    else:
+        start = address_column(df["Start Address"])
+        end = address_column(df["End Address"])
 
-        if start_int is not None and end_int is not None:
-            sizes.append(end_int - start_int + 1)
-        else:
-            sizes.append("N/A")
+        # Whole-column arithmetic; an inverted or incomplete range has no size
+        df["Size (Bytes)"] = (end - start + 1).where(end >= start)
 
-    df["Size (Bytes)"] = sizes
+        df["Start Address"] = hex_column(start)
+        df["End Address"] = hex_column(end)
 
     df.to_excel(output_file, index=False)
 
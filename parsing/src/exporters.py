@@ -0,0 +1,222 @@
+import csv
+import json
+import os
+from itertools import chain, islice
+
+# =========================================================
+# Exporter registry
+# =========================================================
+# Every exporter takes (output_file, tables) where tables is an
+# iterable of (title, rows, columns) and returns {title: row count}.
+# Rows are consumed as they are generated, never collected.
+EXPORTERS = {}
+EXTENSIONS = {}
+FORMAT_EXTENSIONS = {}
+PER_TABLE_FORMATS = set()  # one output file per table
+
+DEFAULT_FORMAT = "xlsx"
+BATCH_ROWS = 10000
+
+
+def register(fmt, extension, per_table=False):
+    def decorator(func):
+        EXPORTERS[fmt] = func
+        EXTENSIONS[extension] = fmt
+        FORMAT_EXTENSIONS[fmt] = extension
+        if per_table:
+            PER_TABLE_FORMATS.add(fmt)
+        return func
+    return decorator
+
+
+def format_from_path(output_file, default=DEFAULT_FORMAT):
+    """
+    Output format implied by the file extension
+    """
+    ext = os.path.splitext(output_file)[1].lower()
+    return EXTENSIONS.get(ext, default)
+
+
+def export_tables(output_file, tables, fmt=None):
+    """
+    Writes report tables with the chosen (or extension-implied) format
+    """
+    fmt = fmt or format_from_path(output_file)
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unknown output format: {fmt} (choose from {', '.join(EXPORTERS)})")
+
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    return EXPORTERS[fmt](output_file, tables)
+
+
+def table_path(output_file, title, extension):
+    """
+    report.csv + Sub_Sections -> report_Sub_Sections.csv
+    """
+    stem, ext = os.path.splitext(output_file)
+    if ext.lower() != extension:
+        stem = output_file
+    return f"{stem}_{title}{extension}"
+
+
+def output_files(output_file, titles, fmt=None):
+    """
+    The files an export of these tables writes: output_file itself, or
+    one table_path() per table for the per-table formats
+    """
+    fmt = fmt or format_from_path(output_file)
+    if fmt not in PER_TABLE_FORMATS:
+        return [output_file]
+    return [table_path(output_file, title, FORMAT_EXTENSIONS[fmt]) for title in titles]
+
+
+def _peek(rows, columns):
+    """
+    Returns (columns, rows) with the header taken from the first row
+    when no columns were given
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return columns or [], rows
+    return list(first), chain([first], rows)
+
+
+# =========================================================
+# XLSX (openpyxl is imported only when this format is used)
+# =========================================================
+@register("xlsx", ".xlsx")
+def export_xlsx(output_file, tables):
+    from xlsx_export import export_workbook
+
+    return export_workbook(output_file, tables)
+
+
+# =========================================================
+# CSV (one file per table)
+# =========================================================
+@register("csv", ".csv", per_table=True)
+def export_csv(output_file, tables):
+    counts = {}
+
+    for title, rows, columns in tables:
+        columns, rows = _peek(rows, columns)
+
+        with open(table_path(output_file, title, ".csv"), "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+
+            count = 0
+            for row in rows:
+                writer.writerow([row.get(name) for name in columns])
+                count += 1
+
+        counts[title] = count
+
+    return counts
+
+
+# =========================================================
+# JSON Lines (one file, one object per row tagged with its table)
+# =========================================================
+@register("jsonl", ".jsonl")
+def export_jsonl(output_file, tables):
+    counts = {}
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        for title, rows, _ in tables:
+            count = 0
+            for row in rows:
+                f.write(json.dumps({"table": title, **row}))
+                f.write("\n")
+                count += 1
+            counts[title] = count
+
+    return counts
+
+
+# =========================================================
+# SQLite (one database, one table per report table)
+# =========================================================
+@register("sqlite", ".sqlite")
+def export_sqlite(output_file, tables):
+    import sqlite3
+
+    if os.path.exists(output_file):
+        os.remove(output_file)
+
+    counts = {}
+    db = sqlite3.connect(output_file)
+
+    try:
+        for title, rows, columns in tables:
+            columns, rows = _peek(rows, columns)
+            if not columns:
+                counts[title] = 0
+                continue
+
+            quoted = ", ".join('"' + name.replace('"', '""') + '"' for name in columns)
+            db.execute(f'CREATE TABLE "{title}" ({quoted})')
+
+            count = 0
+            insert = f'INSERT INTO "{title}" VALUES ({", ".join("?" * len(columns))})'
+            rows = iter(rows)
+            while True:
+                batch = [
+                    [row.get(name) for name in columns]
+                    for row in islice(rows, BATCH_ROWS)
+                ]
+                if not batch:
+                    break
+                db.executemany(insert, batch)
+                count += len(batch)
+
+            counts[title] = count
+
+        db.commit()
+    finally:
+        db.close()
+
+    return counts
+
+
+# =========================================================
+# Parquet (optional: needs pyarrow, one file per table)
+# =========================================================
+@register("parquet", ".parquet", per_table=True)
+def export_parquet(output_file, tables):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)") from None
+
+    counts = {}
+
+    for title, rows, columns in tables:
+        columns, rows = _peek(rows, columns)
+        schema = pa.schema([(name, pa.string()) for name in columns])
+
+        count = 0
+        with pq.ParquetWriter(table_path(output_file, title, ".parquet"), schema) as writer:
+            rows = iter(rows)
+            while True:
+                batch = list(islice(rows, BATCH_ROWS))
+                if not batch:
+                    break
+                writer.write_table(pa.table(
+                    {
+                        name: [_text(row.get(name)) for row in batch]
+                        for name in columns
+                    },
+                    schema=schema
+                ))
+                count += len(batch)
+
+        counts[title] = count
+
+    return counts
+
+
+def _text(value):
+    return None if value is None else str(value)
@@ -0,0 +1,174 @@
+import os
+import re
+
+from mapio import mapped
+from model import MemoryLayout
+from profiling import stage
+from region_index import build_interval_index, region_at
+from verifier import verify_memory_layout
+
+# =========================================================
+# GNU ld map line pattern
+# =========================================================
+# One line-anchored alternation over the raw bytes:
+#   Memory Configuration / Linker script and memory map / ...
+#                                            -> part header
+#   NAME 0xADDR 0xSIZE [load address ...]    -> output section (column 0;
+#                                               a memory entry inside
+#                                               Memory Configuration)
+#    .sec 0xADDR 0xSIZE file                 -> input section (column 1;
+#                                               *fill* entries too)
+#   NAME alone on its line                   -> long section name, its
+#                                               0xADDR 0xSIZE follows on
+#                                               the next line
+#                   0xADDR  symbol           -> symbol / assignment
+# Linker script statements (*(.text*), KEEP (...), . = ALIGN (..)) and
+# "(size before relaxing)" notes match nothing and are skipped.
+_HEX = rb"0x(?P<%s>[0-9A-Fa-f]+)"
+
+GNU_LINE = re.compile(
+    rb"(?m)^(?:"
+    rb"(?P<part>Memory Configuration|Linker script and memory map"
+    rb"|Discarded input sections|Cross Reference Table)[^\S\n]*$"
+    rb"|(?P<out>\S+)(?:[^\S\n]+" + _HEX % b"out_addr" + rb"[^\S\n]+" + _HEX % b"out_size"
+    + rb"[^\n]*|[^\S\n]*$)"
+    rb"|[^\S\n](?P<inp>[^\s(]+)(?:[^\S\n]+" + _HEX % b"in_addr" + rb"[^\S\n]+" + _HEX % b"in_size"
+    + rb"(?P<in_file>[^\n]*)|[^\S\n]*$)"
+    rb"|[^\S\n]{2,}" + _HEX % b"addr" + rb"[^\S\n]+(?:" + _HEX % b"size" + rb"(?P<file>[^\n]*)"
+    + rb"|(?:PROVIDE[^\S\n]*\([^\S\n]*)?(?P<sym>[A-Za-z_$][\w.$]*))"
+    rb")"
+)
+
+# Map parts
+PREAMBLE = 0
+MEMORY = 1
+MAP = 2
+DONE = 3
+
+_PARTS = {
+    b"Memory Configuration": MEMORY,
+    b"Linker script and memory map": MAP,
+    b"Discarded input sections": PREAMBLE,
+    b"Cross Reference Table": DONE,
+}
+
+DEFAULT_MEMORY = "*default*"
+FILL = b"*fill*"
+
+
+# =========================================================
+# Streaming parser
+# =========================================================
+def collect_gnu_layout(data):
+    """
+    Builds a MemoryLayout from a mapped GNU ld map in one pass.
+
+    Regions are the output sections that land in a named memory of the
+    Memory Configuration (tag = that memory; without a MEMORY command,
+    every output section at a non-zero address). Sub-regions are the
+    non-empty input sections, named "section (object)", and the symbols
+    and assignments (_sdata, _ebss, ...) inside them, which have no
+    size. Fill entries are padding and only show up as free space.
+    """
+    layout = MemoryLayout("gnu")
+
+    part = PREAMBLE
+    memories = []
+    index = None
+    region = None
+    pending_out = pending_in = None
+
+    def open_section(name, addr, size):
+        nonlocal index
+        if index is None:
+            index = build_interval_index(memories)
+
+        tag = region_at(index, addr) if memories else None
+        if tag is None and (memories or addr == 0):
+            return None
+        return layout.add_region(name, addr, size, tag)
+
+    objects = {}
+
+    def add_input(name, addr, size, object_file):
+        # name / object_file are raw bytes from the map; object names
+        # repeat a lot, so their short form is computed once
+        if size == 0 or name == FILL:
+            return
+        name = name.decode("utf-8", "replace")
+        short = objects.get(object_file)
+        if short is None:
+            short = os.path.basename(object_file.strip().decode("utf-8", "replace"))
+            objects[object_file] = short
+        if short:
+            name = f"{name} ({short})"
+        layout.add_sub(region, name, addr, size)
+
+    for match in GNU_LINE.finditer(data):
+        (
+            part_name, out, out_addr, out_size, inp, in_addr, in_size, in_file,
+            addr, size, object_file, sym
+        ) = match.groups()
+
+        if part_name is not None:
+            part = _PARTS[part_name]
+            continue
+        if part == MEMORY:
+            if out_addr is not None:
+                name = out.decode("utf-8", "replace")
+                if name != DEFAULT_MEMORY:
+                    origin = int(out_addr, 16)
+                    memories.append((name, origin, origin + int(out_size, 16)))
+            continue
+        if part != MAP:
+            continue
+
+        if out is not None:
+            pending_in = None
+            if out_addr is None:
+                pending_out = out.decode("utf-8", "replace")
+            else:
+                pending_out = None
+                region = open_section(
+                    out.decode("utf-8", "replace"), int(out_addr, 16), int(out_size, 16)
+                )
+
+        elif inp is not None:
+            pending_out = pending_in = None
+            if region is None:
+                continue
+            if in_addr is None:
+                pending_in = inp
+            else:
+                add_input(inp, int(in_addr, 16), int(in_size, 16), in_file)
+
+        elif size is not None:
+            if pending_out is not None:
+                region = open_section(pending_out, int(addr, 16), int(size, 16))
+            elif pending_in is not None and region is not None:
+                add_input(pending_in, int(addr, 16), int(size, 16), object_file)
+            pending_out = pending_in = None
+
+        else:
+            pending_out = pending_in = None
+            if region is not None:
+                layout.add_sub(region, sym.decode("utf-8", "replace"), int(addr, 16))
+
+    return layout
+
+
+def parse_gnu(source, assign_by="prefix"):
+    """
+    Parses a GNU ld map (path or mapped buffer) into a MemoryLayout.
+    assign_by is accepted for the loader's parser signature; the map
+    already says which output section holds each entry.
+    """
+    with mapped(source) as data:
+        with stage("collect_sections") as record:
+            layout = collect_gnu_layout(data)
+            record["rows"] = layout.region_count + layout.sub_count
+
+    with stage("verify") as record:
+        record["rows"] = len(verify_memory_layout(layout))
+
+    return layout
@@ -0,0 +1,125 @@
+import re
+
+from mapio import mapped
+from model import MemoryLayout
+from profiling import stage
+from verifier import verify_memory_layout
+
+# =========================================================
+# HiTech line pattern
+# =========================================================
+# One alternation, anchored at line starts, classifies every line the
+# parser cares about; all other lines are skipped by the regex engine.
+#   NAME memory region -> DATA_X          -> header (NAME may end in
+#                                            _begin / _end)
+#   0xADDR [size] [0xSIZE]                 -> address line
+#   NAME 0xSIZE 0xALIGN                    -> inline sub-region
+#   .input.section                         -> sub-region name, its
+#                                            address line follows
+HITECH_LINE = re.compile(
+    rb"(?im)^[^\S\n]*(?:"
+    rb"(?P<addr>0x[0-9A-F]+)(?:[^\S\n]+(?:size[^\S\n]+)?(?P<size>0x[0-9A-F]+))?"
+    rb"|\.?(?P<region>[A-Z0-9_]+)[^\S\n]+memory region[^\S\n]*->[^\S\n]*(?P<ram>DATA_[A-Z0-9_]+)"
+    rb"|(?P<sub>[A-Z0-9_.]+)[^\S\n]+(?P<sub_size>0x[0-9A-F]+)[^\S\n]+(?P<align>0x[0-9A-F]+)"
+    rb"|(?P<name>\.[A-Z0-9_.$]+)[^\S\n]*$"
+    rb")"
+)
+
+# Parser states
+OUTSIDE = 0
+REGION_ADDRESS = 1  # header seen, waiting for the region's address
+IN_BLOCK = 2
+SUB_ADDRESS = 3     # sub-region name seen, waiting for its address
+END_ADDRESS = 4     # NAME_end header seen, waiting for the end address
+
+
+# =========================================================
+# Single-pass state machine
+# =========================================================
+def collect_hitech_layout(data):
+    """
+    Builds a MemoryLayout from a mapped HiTech map in one pass.
+
+    A "NAME_begin memory region -> DATA_X" header opens region NAME at
+    the next address line, and the matching NAME_end header closes it
+    at the following address (inclusive end). A header without
+    _begin / _end opens a region that runs to the next header; its
+    address line may carry the size.
+
+    Inside a region, a ".section" line followed by "0xADDR size 0xN"
+    adds a sub-region at that address, and "NAME 0xSIZE 0xALIGN" lines
+    add sub-regions packed from the region start. Block length does
+    not matter and every line is matched once.
+    """
+    layout = MemoryLayout("hitech")
+
+    state = OUTSIDE
+    base = tag = sub_name = None
+    region = start = None
+    usage = 0
+
+    for match in HITECH_LINE.finditer(data):
+        addr, size, name, ram, sub, sub_size, align, input_name = match.groups()
+
+        if addr is not None:
+            addr = int(addr, 16)
+
+            if state == REGION_ADDRESS:
+                region = layout.add_region(
+                    base, addr, int(size, 16) if size else None, tag
+                )
+                start, usage = addr, 0
+                state = IN_BLOCK
+
+            elif state == SUB_ADDRESS:
+                layout.add_sub(region, sub_name, addr, int(size, 16) if size else None)
+                state = IN_BLOCK
+
+            elif state == END_ADDRESS:
+                if addr >= start:
+                    layout.region_size[region] = addr - start + 1
+                state = OUTSIDE
+
+        elif name is not None:
+            name = name.decode("ascii")
+
+            if state != OUTSIDE and region is not None and name.lower() == base.lower() + "_end":
+                state = END_ADDRESS
+                continue
+
+            base = name[:-6] if name.lower().endswith("_begin") else name
+            tag = ram.decode("ascii").replace("DATA_", "")
+            region = None
+            state = REGION_ADDRESS
+
+        elif sub is not None:
+            if state in (IN_BLOCK, SUB_ADDRESS):
+                sub_size = int(sub_size, 16)
+                layout.add_sub(
+                    region, sub.decode("ascii"), start + usage, sub_size, int(align, 16)
+                )
+                usage += sub_size
+                state = IN_BLOCK
+
+        elif state in (IN_BLOCK, SUB_ADDRESS):
+            sub_name = input_name.decode("ascii")
+            state = SUB_ADDRESS
+
+    return layout
+
+
+def parse_hitech(source, assign_by="prefix"):
+    """
+    Parses a HiTech map (path or mapped buffer) into a MemoryLayout.
+    assign_by is accepted for the loader's parser signature; HiTech
+    blocks already say which region a sub-region belongs to.
+    """
+    with mapped(source) as data:
+        with stage("collect_regions") as record:
+            layout = collect_hitech_layout(data)
+            record["rows"] = layout.region_count + layout.sub_count
+
+    with stage("verify") as record:
+        record["rows"] = len(verify_memory_layout(layout))
+
+    return layout
@@ -0,0 +1,43 @@
+from ctc import parse_ctc
+from elf import parse_elf
+from gnu import parse_gnu
+from hitech import parse_hitech
+from mapio import detect_format, mapped
+from profiling import stage
+
+# Part of the parse cache key: bump whenever a parser's output changes
+PARSER_VERSION = "4"
+
+# =========================================================
+# Format -> parser dispatch
+# =========================================================
+# Each parser takes (mapped data, assign_by) and returns a MemoryLayout
+PARSERS = {
+    "ctc": parse_ctc,
+    "hitech": parse_hitech,
+    "gnu": parse_gnu,
+    "elf": parse_elf,
+}
+
+
+def parse_map(source, assign_by="prefix", workers=1):
+    """
+    Detects the format of a map (path or mapped buffer) and parses it
+    into a MemoryLayout, sharing one mapping between both steps.
+    workers > 1 scans a CTC map file in parallel chunks.
+    Raises ValueError for an unknown format.
+    """
+    with mapped(source) as data:
+        with stage("detect_format"):
+            fmt = detect_format(data, tuple(PARSERS))
+        if fmt not in PARSERS:
+            raise ValueError("Unknown MAP file format")
+
+        with stage(f"parse_{fmt}") as record:
+            if fmt == "ctc" and workers > 1:
+                # Workers map the file themselves, so pass the path on
+                layout = parse_ctc(source, assign_by, workers)
+            else:
+                layout = PARSERS[fmt](data, assign_by)
+            record["rows"] = layout.region_count + layout.sub_count
+        return layout
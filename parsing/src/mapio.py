@@ -0,0 +1,122 @@
+import mmap
+import os
+import re
+from contextlib import contextmanager
+
+# =========================================================
+# Format sniffing patterns (bytes, never decoded)
+# =========================================================
+# [^\S\n] is "whitespace except newline", so a pattern never spans lines
+HITECH_MARK = re.compile(rb"(?i:memory region)")
+CTC_MARK = re.compile(rb"\|[^\S\n]*0x[0-9A-Fa-f]+")
+GNU_MARK = re.compile(rb"(?m:^Linker script and memory map)")
+
+FORMAT_MARKS = {"hitech": HITECH_MARK, "ctc": CTC_MARK, "gnu": GNU_MARK}
+
+# Binary inputs are recognised by their magic at offset 0
+ELF_MAGIC = b"\x7fELF"
+
+_SNIFFERS = {}
+
+
+# =========================================================
+# Memory-mapped access
+# =========================================================
+@contextmanager
+def open_map(map_file):
+    """
+    Memory-maps a map file read-only.
+    Yields a bytes-like object; empty files yield b"".
+    """
+    with open(map_file, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield data
+        finally:
+            data.close()
+
+
+@contextmanager
+def mapped(source):
+    """
+    Accepts a path or an already mapped buffer, so one mapping can be
+    shared by the sniffer and the parser.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open_map(source) as data:
+            yield data
+    else:
+        yield source
+
+
+def line_chunks(data, count, min_size=1 << 20):
+    """
+    Splits a buffer into at most `count` (start, end) byte ranges that
+    end on line boundaries; chunks are at least min_size bytes, so a
+    small map stays a single chunk
+    """
+    size = len(data)
+    step = max(min_size, -(-size // max(count, 1)))
+
+    ranges = []
+    start = 0
+    while start < size:
+        end = start + step
+        if end >= size:
+            end = size
+        else:
+            nl = data.find(b"\n", end)
+            end = size if nl < 0 else nl + 1
+        ranges.append((start, end))
+        start = end
+
+    return ranges
+
+
+# =========================================================
+# Detect MAP format
+# =========================================================
+def _sniffer(formats):
+    """
+    One alternation of the requested formats' markers, compiled once
+    per format set; the group name tells which marker matched
+    """
+    key = tuple(fmt for fmt in FORMAT_MARKS if fmt in formats)
+    pattern = _SNIFFERS.get(key)
+    if pattern is None:
+        pattern = re.compile(b"|".join(
+            b"(?P<" + fmt.encode("ascii") + b">" + FORMAT_MARKS[fmt].pattern + b")"
+            for fmt in key
+        ))
+        _SNIFFERS[key] = pattern
+    return pattern
+
+
+def detect_format(source, formats=("hitech", "ctc")):
+    """
+    Returns one of `formats` for the first line that identifies the
+    format, or "unknown". A line carrying both the CTC and the HiTech
+    marker counts as hitech, the same as the old line-by-line check.
+    An ELF file is "elf" when that is one of `formats`.
+    """
+    with mapped(source) as data:
+        if data[:4] == ELF_MAGIC:
+            return "elf" if "elf" in formats else "unknown"
+
+        match = _sniffer(formats).search(data)
+        if match is None:
+            return "unknown"
+
+        fmt = match.lastgroup
+        if fmt == "ctc" and "hitech" in formats:
+            line_end = data.find(b"\n", match.end())
+            if line_end < 0:
+                line_end = len(data)
+            if HITECH_MARK.search(data, match.end(), line_end):
+                return "hitech"
+
+        return fmt
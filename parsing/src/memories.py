@@ -0,0 +1,184 @@
+import re
+from bisect import bisect_right
+from collections import Counter
+
+from mapio import ELF_MAGIC, mapped
+from model import MISSING
+from region_index import build_interval_index
+
+# =========================================================
+# Memory sources
+# =========================================================
+# linker.ld:  NAME [(attrs)] : ORIGIN = expr, LENGTH = expr
+# ORIGIN / LENGTH may be spelled org / o and len / l; expr is a sum of
+# decimal, octal or hex numbers with an optional K / M suffix.
+MEMORY_BLOCK = re.compile(r"\bMEMORY\s*\{(?P<body>[^}]*)\}")
+MEMORY_ENTRY = re.compile(
+    r"(?P<name>[A-Za-z_][\w.]*)\s*(?:\([^)]*\))?\s*:\s*"
+    r"(?:ORIGIN|org|o)\s*=\s*(?P<origin>[^,]+?)\s*,\s*"
+    r"(?:LENGTH|len|l)\s*=\s*(?P<length>[^\s,;]+(?:\s*[-+]\s*[^\s,;]+)*)"
+)
+COMMENT = re.compile(r"/\*.*?\*/", re.S)
+TERM = re.compile(r"([-+]?)\s*(0[xX][0-9A-Fa-f]+|\d+)([KkMm]?)")
+
+# Map "Memory Configuration" table: NAME 0xORIGIN 0xLENGTH [attrs]
+MEMORY_CONFIGURATION = b"Memory Configuration"
+MEMORY_ROW = re.compile(rb"(\S+)[^\S\n]+0x([0-9A-Fa-f]+)[^\S\n]+0x([0-9A-Fa-f]+)")
+
+DEFAULT_MEMORY = "*default*"
+
+_SUFFIX = {"": 1, "K": 1 << 10, "M": 1 << 20}
+
+
+def parse_length(text):
+    """
+    Evaluates a MEMORY number: "256K", "0x08000000", "64K - 0x100".
+    Raises ValueError for anything else.
+    """
+    text = text.strip()
+    total = 0
+    pos = 0
+    for match in TERM.finditer(text):
+        if text[pos:match.start()].strip():
+            break
+        sign, number, suffix = match.groups()
+        if number[:2] in ("0x", "0X"):
+            value = int(number, 16)
+        else:
+            value = int(number, 8 if len(number) > 1 and number[0] == "0" else 10)
+        value *= _SUFFIX[suffix.upper()]
+        total += -value if sign == "-" else value
+        pos = match.end()
+
+    if pos == 0 or text[pos:].strip():
+        raise ValueError(f"Unsupported MEMORY expression: {text}")
+    return total
+
+
+def read_linker_memories(script_file):
+    """
+    Returns [(name, origin, length)] from the MEMORY command of a
+    linker script, in script order
+    """
+    with open(script_file, encoding="utf-8") as f:
+        text = COMMENT.sub(" ", f.read())
+
+    memories = []
+    for block in MEMORY_BLOCK.finditer(text):
+        for entry in MEMORY_ENTRY.finditer(block["body"]):
+            memories.append((
+                entry["name"], parse_length(entry["origin"]), parse_length(entry["length"])
+            ))
+    return memories
+
+
+def read_map_memories(source):
+    """
+    Returns [(name, origin, length)] from the "Memory Configuration"
+    table of a map (GNU ld and CTC maps print one), or [] when the map
+    has none. The table ends at the first other line after its rows.
+    """
+    with mapped(source) as data:
+        if data[:4] == ELF_MAGIC:
+            return []
+
+        pos = data.find(MEMORY_CONFIGURATION)
+        if pos < 0:
+            return []
+        pos = data.find(b"\n", pos) + 1
+
+        memories = []
+        while 0 < pos < len(data):
+            end = data.find(b"\n", pos)
+            if end < 0:
+                end = len(data)
+            line = data[pos:end].strip()
+            pos = end + 1
+
+            match = MEMORY_ROW.match(line)
+            if match is not None:
+                name = match[1].decode("utf-8", "replace")
+                if name != DEFAULT_MEMORY:
+                    memories.append((name, int(match[2], 16), int(match[3], 16)))
+            elif memories:
+                break
+            elif line and not line.startswith((b"Name", b"-")):
+                break
+
+        return memories
+
+
+def merge_memories(*sources):
+    """
+    Combines memory lists by name; a later source replaces an earlier
+    one's entry (the map records what was actually linked)
+    """
+    merged = {}
+    for memories in sources:
+        for name, origin, length in memories:
+            merged[name] = (name, origin, length)
+    return list(merged.values())
+
+
+# =========================================================
+# Capacity / utilization
+# =========================================================
+def memory_usage(layout, memories):
+    """
+    Assigns every sub-region, then every region without sized
+    sub-regions, to the memory containing its start address and sums
+    their sizes (clipped at the memory end). A symbol listed under
+    several nested regions (same name and start) counts once.
+
+    The memories are flattened into sorted boundaries once, so each
+    address costs one bisect. Returns one (name, origin, length, used,
+    symbols) tuple per memory, in the given order.
+    """
+    starts, info = build_interval_index(
+        [(k, origin, origin + length) for k, (_, origin, length) in enumerate(memories)]
+    )
+    # (segment_end, clip_end, slot) per segment; slot None outside memories
+    segments = [
+        (end, None, None) if k is None else (end, memories[k][1] + memories[k][2], k)
+        for end, k in info
+    ]
+    used = [0] * len(memories)
+    symbols = [0] * len(memories)
+    sized = bytearray(layout.region_count)
+    # Only names listed more than once can be repeats
+    repeated = {name for name, count in Counter(layout.sub_name).items() if count > 1}
+    seen = set()
+
+    for parent, name, start, size in zip(
+        layout.sub_parent, layout.sub_name, layout.sub_start, layout.sub_size
+    ):
+        if size != MISSING:
+            sized[parent] = 1
+        if name in repeated:
+            if (name, start) in seen:
+                continue
+            seen.add((name, start))
+        i = bisect_right(starts, start) - 1
+        if i < 0:
+            continue
+        end, clip, k = segments[i]
+        if k is None or start >= end:
+            continue
+        symbols[k] += 1
+        if size != MISSING:
+            used[k] += size if start + size <= clip else clip - start
+
+    for region, (start, size) in enumerate(zip(layout.region_start, layout.region_size)):
+        if sized[region] or size == MISSING:
+            continue
+        i = bisect_right(starts, start) - 1
+        if i < 0:
+            continue
+        end, clip, k = segments[i]
+        if k is not None and start < end:
+            used[k] += min(size, clip - start)
+
+    return [
+        (name, origin, length, used[k], symbols[k])
+        for k, (name, origin, length) in enumerate(memories)
+    ]
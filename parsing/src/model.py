@@ -0,0 +1,251 @@
+import sys
+from array import array
+
+# Stands in for "no value" inside the uint64 columns
+MISSING = 0xFFFFFFFFFFFFFFFF
+NO_NAME = 0xFFFFFFFF
+
+# Status codes stored per row (index into STATUSES)
+STATUSES = ("OK", "OVERLAP", "DUPLICATE", "OVERFLOW")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+
+# =========================================================
+# Interned name table
+# =========================================================
+class Names:
+    """
+    Each distinct name is stored once; rows refer to it by id
+    """
+
+    __slots__ = ("names", "ids")
+
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+
+    def intern(self, name):
+        name_id = self.ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            name = sys.intern(name)
+            self.ids[name] = name_id
+            self.names.append(name)
+        return name_id
+
+    def __getitem__(self, name_id):
+        return self.names[name_id]
+
+    def __len__(self):
+        return len(self.names)
+
+
+# =========================================================
+# Symbol table (dict-like, columnar)
+# =========================================================
+class SymbolTable:
+    """
+    NAME -> uint64 value, last value wins, map order kept.
+    Behaves like the dicts the parsers used before, but stores the
+    values in one array instead of one int object per symbol.
+    """
+
+    __slots__ = ("names", "values")
+
+    def __init__(self):
+        self.names = Names()
+        self.values = array("Q")
+
+    def __setitem__(self, name, value):
+        name_id = self.names.ids.get(name)
+        if name_id is None:
+            self.names.intern(name)
+            self.values.append(value)
+        else:
+            self.values[name_id] = value
+
+    def __getitem__(self, name):
+        return self.values[self.names.ids[name]]
+
+    def get(self, name, default=None):
+        name_id = self.names.ids.get(name)
+        return default if name_id is None else self.values[name_id]
+
+    def __contains__(self, name):
+        return name in self.names.ids
+
+    def __iter__(self):
+        return iter(self.names.names)
+
+    def __len__(self):
+        return len(self.values)
+
+    def items(self):
+        return zip(self.names.names, self.values)
+
+
+# =========================================================
+# Parsed memory layout
+# =========================================================
+class MemoryLayout:
+    """
+    Parse result of one map file: regions and their sub-regions as
+    parallel uint64 columns. Addresses stay integers; hex strings are
+    produced only by the exporters.
+
+    Missing sizes / alignments are MISSING, a missing tag is NO_NAME.
+    """
+
+    __slots__ = (
+        "fmt", "names",
+        "region_name", "region_start", "region_size", "region_tag",
+        "region_status",
+        "sub_parent", "sub_name", "sub_start", "sub_size", "sub_align",
+        "sub_status",
+    )
+
+    def __init__(self, fmt="unknown"):
+        self.fmt = fmt
+        self.names = Names()
+
+        self.region_name = array("I")
+        self.region_start = array("Q")
+        self.region_size = array("Q")
+        self.region_tag = array("I")
+        self.region_status = array("B")
+
+        self.sub_parent = array("I")
+        self.sub_name = array("I")
+        self.sub_start = array("Q")
+        self.sub_size = array("Q")
+        self.sub_align = array("Q")
+        self.sub_status = array("B")
+
+    # -------- Building --------
+    def add_region(self, name, start, size=None, tag=None):
+        self.region_name.append(self.names.intern(name))
+        self.region_start.append(start)
+        self.region_size.append(MISSING if size is None else size)
+        self.region_tag.append(NO_NAME if tag is None else self.names.intern(tag))
+        self.region_status.append(0)
+        return len(self.region_name) - 1
+
+    def add_sub(self, parent, name, start, size=None, align=None):
+        self.sub_parent.append(parent)
+        self.sub_name.append(self.names.intern(name))
+        self.sub_start.append(start)
+        self.sub_size.append(MISSING if size is None else size)
+        self.sub_align.append(MISSING if align is None else align)
+        self.sub_status.append(0)
+        return len(self.sub_name) - 1
+
+    def set_status(self, region_status, sub_status):
+        """
+        Stores verifier results (lists of status strings)
+        """
+        self.region_status = array("B", (STATUS_CODES[s] for s in region_status))
+        self.sub_status = array("B", (STATUS_CODES[s] for s in sub_status))
+
+    # -------- Reading --------
+    @property
+    def region_count(self):
+        return len(self.region_name)
+
+    @property
+    def sub_count(self):
+        return len(self.sub_name)
+
+    def regions(self):
+        """
+        Yields (name, start, size, tag, status); size / tag may be None
+        """
+        names = self.names.names
+        for name_id, start, size, tag, status in zip(
+            self.region_name, self.region_start, self.region_size,
+            self.region_tag, self.region_status
+        ):
+            yield (
+                names[name_id],
+                start,
+                None if size == MISSING else size,
+                None if tag == NO_NAME else names[tag],
+                STATUSES[status],
+            )
+
+    def subs(self):
+        """
+        Yields (parent_name, name, start, size, align, status);
+        size / align may be None
+        """
+        names = self.names.names
+        parents = self.region_name
+        for parent, name_id, start, size, align, status in zip(
+            self.sub_parent, self.sub_name, self.sub_start, self.sub_size,
+            self.sub_align, self.sub_status
+        ):
+            yield (
+                names[parents[parent]],
+                names[name_id],
+                start,
+                None if size == MISSING else size,
+                None if align == MISSING else align,
+                STATUSES[status],
+            )
+
+
+# =========================================================
+# Binary serialization (parse cache)
+# =========================================================
+LAYOUT_MAGIC = b"MEMLAYOUT1\n"
+
+_COLUMNS = (
+    "region_name", "region_start", "region_size", "region_tag", "region_status",
+    "sub_parent", "sub_name", "sub_start", "sub_size", "sub_align", "sub_status",
+)
+
+
+def dump_layout(layout):
+    """
+    Serializes a MemoryLayout to bytes: a short header, the name table
+    and the raw column buffers (loads without per-row parsing)
+    """
+    names = "\n".join(layout.names.names).encode("utf-8")
+    columns = [getattr(layout, column) for column in _COLUMNS]
+
+    header = " ".join(
+        [layout.fmt, str(len(layout.names)), str(len(names))]
+        + [f"{col.typecode}{len(col)}" for col in columns]
+    ).encode("ascii")
+
+    return b"".join([LAYOUT_MAGIC, header, b"\n", names] + [col.tobytes() for col in columns])
+
+
+def load_layout(data):
+    """
+    Inverse of dump_layout
+    """
+    if not data.startswith(LAYOUT_MAGIC):
+        raise ValueError("Not a serialized MemoryLayout")
+
+    pos = len(LAYOUT_MAGIC)
+    header_end = data.index(b"\n", pos)
+    fmt, name_count, names_len, *specs = data[pos:header_end].decode("ascii").split(" ")
+    pos = header_end + 1
+
+    layout = MemoryLayout(fmt)
+
+    name_count, names_len = int(name_count), int(names_len)
+    if name_count:
+        names = data[pos:pos + names_len].decode("utf-8").split("\n")
+        layout.names.names = names
+        layout.names.ids = dict(zip(names, range(name_count)))
+    pos += names_len
+
+    for column, spec in zip(_COLUMNS, specs):
+        col = array(spec[0])
+        nbytes = int(spec[1:]) * col.itemsize
+        col.frombytes(data[pos:pos + nbytes])
+        setattr(layout, column, col)
+        pos += nbytes
+
+    return layout
@@ -128,112 +128,46 @@
 #     all_regions, sub_sections, reset_safe = parse_map_detailed_ctc(map_file)
 #     export_to_excel(all_regions, sub_sections, reset_safe, output_file)
 
-import re
 import sys
-import os
-import pandas as pd
+
+import mapio
+from ctc import parse_ctc
+from rows import (
+    NESTED_COLUMNS, REGION_COLUMNS, nested_rows, region_rows, reset_safe_rows
+)
+from exporters import export_tables
 
 # =========================================================
 # Detect MAP format
 # =========================================================
 def detect_format(map_file):
-    with open(map_file, "r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            if re.search(r"\|\s*0x[0-9A-Fa-f]+", line):
-                return "ctc"
-    return "unknown"
+    return mapio.detect_format(map_file, formats=("ctc",))
 
 # =========================================================
 # CTC MAP PARSER
 # =========================================================
-def parse_ctc_map(map_file):
-    symbols = {}
-    sizes = {}
-
-    with open(map_file, "r", encoding="utf-8", errors="ignore") as f:
-        lines = f.readlines()
-
-    # -------- Collect symbols & sizes --------
-    for line in lines:
-        sym = re.search(r"\|\s*([A-Za-z0-9_]+)\s*\|\s*(0x[0-9A-Fa-f]+)", line)
-        if sym:
-            symbols[sym.group(1).upper()] = int(sym.group(2), 16)
-
-        sz = re.search(r"([A-Za-z0-9_]+_SIZE)\s*\|\s*(0x[0-9A-Fa-f]+)", line)
-        if sz:
-            sizes[sz.group(1).upper()] = int(sz.group(2), 16)
-
-    all_regions = []
-    nested_sections = []
-
-    # -------- Build regions --------
-    for name, start in symbols.items():
-        if not name.endswith("_START"):
-            continue
-
-        base = name.replace("_START", "")
-        total_size = sizes.get(base + "_SIZE", 0)
-        end = start + total_size
-
-        # ---- Nested sections ----
-        usage = 0
-        for sub, sub_start in symbols.items():
-            if sub.startswith(base) and not sub.endswith("_START"):
-                sub_size = sizes.get(sub + "_SIZE", 0)
-                sub_end = sub_start + sub_size
-                usage += sub_size
-
-                nested_sections.append({
-                    "Parent_Section": base,
-                    "Sub_Section": sub,
-                    "Start_Address": hex(sub_start),
-                    "End_Address": hex(sub_end),
-                    "Size": hex(sub_size)
-                })
-
-        if usage == 0:
-            usage = total_size
-
-        free_space = total_size - usage
-
-        all_regions.append({
-            "Section": base,
-            "Start_Address": hex(start),
-            "End_Address": hex(end),
-            "Total_Size": hex(total_size),
-            "Usage": hex(usage),
-            "Free_Space": hex(free_space)
-        })
-
-    return all_regions, nested_sections
+def parse_ctc_map(map_file, assign_by="prefix", workers=1):
+    # Columnar MemoryLayout (integers only); rows and hex strings
+    # are produced at export time. workers > 1 scans a map file in
+    # parallel chunks
+    return parse_ctc(map_file, assign_by, workers)
 
 # =========================================================
 # EXPORT TO EXCEL (3 SHEETS)
 # =========================================================
-def export_excel(all_regions, nested_sections, output_file):
-    # ---- Reset Safe sheet (filtered from regions) ----
-    reset_safe = [
-        r for r in all_regions
-        if "RST_SAFE" in r["Section"].upper()
-    ]
-
-    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
-
-    with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
-        pd.DataFrame(all_regions).to_excel(
-            writer, sheet_name="All_Memory_Regions", index=False
-        )
-        pd.DataFrame(nested_sections).to_excel(
-            writer, sheet_name="Nested_Sections", index=False
-        )
-        pd.DataFrame(reset_safe).to_excel(
-            writer, sheet_name="Reset_Safe_Area", index=False
-        )
-
-    print("Excel generated successfully")
-    print(f"All regions   : {len(all_regions)}")
-    print(f"Nested        : {len(nested_sections)}")
-    print(f"Reset-safe    : {len(reset_safe)}")
+def export_excel(layout, output_file, fmt=None):
+    # ---- Rows stream from the layout into the chosen exporter ----
+    counts = export_tables(output_file, [
+        ("All_Memory_Regions", region_rows(layout), REGION_COLUMNS),
+        ("Nested_Sections", nested_rows(layout), NESTED_COLUMNS),
+        # ---- Reset Safe sheet (filtered from regions) ----
+        ("Reset_Safe_Area", reset_safe_rows(layout), REGION_COLUMNS),
+    ], fmt)
+
+    print(f"Report generated successfully: {output_file}")
+    print(f"All regions   : {counts['All_Memory_Regions']}")
+    print(f"Nested        : {counts['Nested_Sections']}")
+    print(f"Reset-safe    : {counts['Reset_Safe_Area']}")
 
 # =========================================================
 # MAIN
@@ -246,9 +180,12 @@ if __name__ == "__main__":
     map_file = sys.argv[1]
     output = sys.argv[2] if len(sys.argv) > 2 else "memory_layout.xlsx"
 
-    if detect_format(map_file) != "ctc":
-        print("Only CTC format supported (as per your Excel screenshots)")
-        sys.exit(1)
+    # One mapping shared by the sniffer and the parser
+    with mapio.open_map(map_file) as data:
+        if detect_format(data) != "ctc":
+            print("Only CTC format supported (as per your Excel screenshots)")
+            sys.exit(1)
+
+        layout = parse_ctc_map(data)
 
-    regions, nested = parse_ctc_map(map_file)
-    export_excel(regions, nested, output)
+    export_excel(layout, output)
@@ -0,0 +1,157 @@
+import json
+import time
+from contextlib import contextmanager
+
+# =========================================================
+# Per-stage instrumentation
+# =========================================================
+# Library code marks its stages with `with stage("name") as rec:`.
+# Without an active Profiler this costs one global lookup; with one,
+# each stage records wall time, CPU time, peak traced memory and an
+# optional row count (rec["rows"] = n). tracemalloc and cProfile are
+# imported only once a Profiler runs, they are not free at start-up.
+_active = None
+
+
+class Profiler:
+    """
+    Collects stage records. Stages may nest; peaks are the highest
+    tracemalloc reading while the stage ran, children included.
+    With cprofile=True every top-level stage runs under cProfile and
+    the stats of the slowest one are kept.
+    """
+
+    def __init__(self, memory=True, cprofile=False):
+        self.memory = memory
+        self.cprofile = cprofile
+        self.records = []
+        self.slowest = None
+        self._peaks = []
+
+    @contextmanager
+    def stage(self, name):
+        import tracemalloc
+
+        record = {
+            "stage": name,
+            "depth": len(self._peaks),
+            "wall_s": 0.0,
+            "cpu_s": 0.0,
+            "peak_bytes": None,
+            "rows": None,
+        }
+        self.records.append(record)
+
+        if self.memory:
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._peaks.append(0)
+
+        profile = None
+        if self.cprofile and record["depth"] == 0:
+            import cProfile
+
+            profile = cProfile.Profile()
+            profile.enable()
+
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_s"] = time.perf_counter() - wall
+            record["cpu_s"] = time.process_time() - cpu
+
+            if profile is not None:
+                profile.disable()
+                if self.slowest is None or record["wall_s"] > self.slowest[0]["wall_s"]:
+                    self.slowest = (record, profile)
+
+            children_peak = self._peaks.pop()
+            if self.memory:
+                peak = max(children_peak, tracemalloc.get_traced_memory()[1])
+                record["peak_bytes"] = peak
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                tracemalloc.reset_peak()
+
+    # -------- Output --------
+    def summary(self):
+        lines = [f"{'Stage':<40} {'Wall s':>9} {'CPU s':>9} {'Peak MB':>9} {'Rows':>10}"]
+        for record in self.records:
+            name = "  " * record["depth"] + record["stage"]
+            peak = record["peak_bytes"]
+            rows = record["rows"]
+            lines.append(
+                f"{name:<40} {record['wall_s']:>9.3f} {record['cpu_s']:>9.3f} "
+                f"{'-' if peak is None else f'{peak / 2**20:.1f}':>9} "
+                f"{'-' if rows is None else rows:>10}"
+            )
+        return "\n".join(lines)
+
+    def write_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"stages": self.records}, f, indent=2)
+
+    def dump_slowest(self, path):
+        """
+        Writes the cProfile stats of the slowest top-level stage;
+        returns its name (None when nothing was profiled)
+        """
+        if self.slowest is None:
+            return None
+        record, profile = self.slowest
+        profile.dump_stats(path)
+        return record["stage"]
+
+
+@contextmanager
+def profiling(profiler):
+    """
+    Makes `profiler` the active one for stage() calls
+    """
+    import tracemalloc
+
+    global _active
+    _active = profiler
+
+    if profiler.memory:
+        tracemalloc.start()
+    try:
+        yield profiler
+    finally:
+        if profiler.memory:
+            tracemalloc.stop()
+        _active = None
+
+
+@contextmanager
+def stage(name):
+    if _active is None:
+        yield {}
+        return
+    with _active.stage(name) as record:
+        yield record
+
+
+def staged_tables(tables, prefix="export"):
+    """
+    Wraps (title, rows, columns) tables so each table's row generation
+    and writing is its own stage, with its row count. Tables pass
+    through untouched when no profiler is active.
+    """
+    if _active is None:
+        yield from tables
+        return
+
+    for title, rows, columns in tables:
+        with stage(f"{prefix}:{title}") as record:
+            record["rows"] = 0
+            yield title, _counted(rows, record), columns
+
+
+def _counted(rows, record):
+    for row in rows:
+        record["rows"] += 1
+        yield row
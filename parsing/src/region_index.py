@@ -0,0 +1,129 @@
+import heapq
+from bisect import bisect_left, bisect_right
+
+# Sorts after every character a symbol name can contain
+_PREFIX_END = chr(0x10FFFF)
+
+
+# =========================================================
+# Name prefix index
+# =========================================================
+def build_prefix_index(names):
+    """
+    Returns (sorted_names, rank) for prefix lookups.
+    rank maps each name to its position in the original order.
+    """
+    rank = {name: i for i, name in enumerate(names)}
+    return sorted(rank), rank
+
+
+def names_with_prefix(index, prefix):
+    """
+    All names starting with `prefix`, in original order.
+    O(log n + k) for k hits.
+    """
+    sorted_names, rank = index
+    lo = bisect_left(sorted_names, prefix)
+    hi = bisect_left(sorted_names, prefix + _PREFIX_END, lo)
+    hits = sorted_names[lo:hi]
+    hits.sort(key=rank.__getitem__)
+    return hits
+
+
+# =========================================================
+# Address interval index
+# =========================================================
+def build_interval_index(regions):
+    """
+    regions: list of (name, start, end) half-open ranges, may nest.
+
+    Flattens them into disjoint segments, each labelled with the
+    innermost region covering it (latest start, then smallest end),
+    so a lookup is one bisect. Returns (segment_starts, segment_info)
+    where segment_info is a list of (segment_end, name or None).
+    """
+    bounds = sorted({b for _, start, end in regions if end > start for b in (start, end)})
+    order = sorted(
+        (r for r in regions if r[2] > r[1]), key=lambda r: (r[1], -r[2])
+    )
+
+    starts = []
+    info = []
+    active = []
+    next_region = 0
+
+    for lo, hi in zip(bounds, bounds[1:]):
+        while next_region < len(order) and order[next_region][1] <= lo:
+            name, start, end = order[next_region]
+            heapq.heappush(active, (-start, end, next_region, name))
+            next_region += 1
+
+        while active and active[0][1] <= lo:
+            heapq.heappop(active)
+
+        starts.append(lo)
+        info.append((hi, active[0][3] if active else None))
+
+    return starts, info
+
+
+def region_at(index, address):
+    """
+    Innermost region name containing `address`, or None
+    """
+    starts, info = index
+    i = bisect_right(starts, address) - 1
+    if i < 0:
+        return None
+
+    end, name = info[i]
+    return name if address < end else None
+
+
+# =========================================================
+# Nested section assignment
+# =========================================================
+def nested_symbols(symbols, sizes, assign_by="prefix"):
+    """
+    Maps every *_START region base to its sub-symbol names.
+
+    assign_by="prefix"  -> every symbol whose name starts with the base
+                           (a symbol can belong to several regions)
+    assign_by="address" -> every symbol whose address falls inside the
+                           innermost region [START, START + SIZE)
+
+    Regions and their sub-symbols keep the order of `symbols`.
+    """
+    starts = {
+        name.replace("_START", ""): name
+        for name in symbols if name.endswith("_START")
+    }
+    bases = list(starts)
+    nested = {base: [] for base in bases}
+
+    if assign_by == "prefix":
+        index = build_prefix_index(list(symbols))
+        for base in bases:
+            nested[base] = [
+                sub for sub in names_with_prefix(index, base)
+                if not sub.endswith("_START")
+            ]
+
+    elif assign_by == "address":
+        regions = []
+        for base in bases:
+            start = symbols[starts[base]]
+            regions.append((base, start, start + sizes.get(base + "_SIZE", 0)))
+
+        index = build_interval_index(regions)
+        for sub, sub_start in symbols.items():
+            if sub.endswith("_START"):
+                continue
+            parent = region_at(index, sub_start)
+            if parent is not None:
+                nested[parent].append(sub)
+
+    else:
+        raise ValueError(f"Unknown assign_by: {assign_by}")
+
+    return nested
@@ -0,0 +1,234 @@
+from metrics import region_metrics, sub_metrics
+from model import MISSING
+from tree import SectionTree
+
+# =========================================================
+# Sheet rows (hex formatting happens only here)
+# =========================================================
+# Column layout shared by parser_all.py and parser_static_dynamic.py
+REGION_COLUMNS = [
+    "Section", "Start_Address", "End_Address", "Total_Size", "Usage",
+    "Free_Space", "Utilization_%", "Status"
+]
+NESTED_COLUMNS = [
+    "Parent_Section", "Sub_Section", "Start_Address", "End_Address", "Size",
+    "Padding", "Status"
+]
+HIERARCHICAL_COLUMNS = ["Label", "Section", "Group", "Address/Size"]
+SECTION_COLUMNS = [
+    "RAM_Section", "RAM_Name", "Start_Address", "End_Address", "Size", "Status"
+]
+LOOKUP_COLUMNS = [
+    "Address", "Symbol", "Offset", "Size", "Parent_Section", "Match",
+    "Region", "Reset_Safe"
+]
+MEMORY_COLUMNS = [
+    "Memory", "Origin", "End_Address", "Length", "Used", "Free",
+    "Utilization_%", "Symbols"
+]
+
+
+def _hex(value):
+    # Unknown values stay empty cells
+    return None if value is None else hex(value)
+
+
+def region_rows(layout):
+    """
+    Yields one All_Memory_Regions row per region
+    """
+    metrics = region_metrics(layout)
+
+    for (name, start, _, _, status), end, size, usage, free, utilization in zip(
+        layout.regions(), metrics["end"], metrics["size"], metrics["usage"],
+        metrics["free"], metrics["utilization"]
+    ):
+        yield {
+            "Section": name,
+            "Start_Address": hex(start),
+            "End_Address": _hex(end),
+            "Total_Size": _hex(size),
+            "Usage": _hex(usage),
+            "Free_Space": _hex(free),
+            "Utilization_%": utilization,
+            "Status": status
+        }
+
+
+def is_reset_safe(name):
+    """
+    Reset-safe regions are marked by RST_SAFE / RSTSAFE in their name
+    """
+    name = name.upper()
+    return "RST_SAFE" in name or "RSTSAFE" in name
+
+
+def reset_safe_rows(layout):
+    """
+    Region rows whose name marks them as reset-safe
+    """
+    for row in region_rows(layout):
+        if is_reset_safe(row["Section"]):
+            yield row
+
+
+def nested_rows(layout):
+    """
+    Yields one Sub_Sections row per sub-region
+    """
+    metrics = sub_metrics(layout)
+
+    for (parent, name, start, _, _, status), end, size, padding in zip(
+        layout.subs(), metrics["end"], metrics["size"], metrics["padding"]
+    ):
+        yield {
+            "Parent_Section": parent,
+            "Sub_Section": name,
+            "Start_Address": hex(start),
+            "End_Address": _hex(end),
+            "Size": _hex(size),
+            "Padding": hex(padding),
+            "Status": status
+        }
+
+
+def hierarchical_rows(tree):
+    """
+    Yields the _lc_gb_ / _lc_ge_ rows of the Hierarchical_Sub_Sections
+    sheet from a SectionTree: per region its start, per section the
+    address of its first group, per group its size, then the region end
+    """
+    layout = tree.layout
+    layout_names = layout.names.names
+    name = tree.name
+    sub_start, sub_size, sub_group = layout.sub_start, layout.sub_size, tree.sub_group
+    empty = tree.empty
+
+    for r in range(layout.region_count):
+        region = layout_names[layout.region_name[r]]
+        start = layout.region_start[r]
+        size = layout.region_size[r]
+
+        yield {
+            "Label": "_lc_gb_" + region,
+            "Section": "",
+            "Group": "",
+            "Address/Size": hex(start)
+        }
+
+        for s in tree.sections_of(r):
+            section = name(tree.section_name[s])
+
+            yield {
+                "Label": "",
+                "Section": section,
+                "Group": "",
+                "Address/Size": hex(sub_start[tree.section_first[s]])
+            }
+
+            for i in tree.subs_of(s):
+                group = sub_group[i]
+                group_size = sub_size[i]
+
+                yield {
+                    "Label": "",
+                    "Section": section,
+                    "Group": "" if group == empty else name(group),
+                    "Address/Size": None if group_size == MISSING else hex(group_size)
+                }
+
+        yield {
+            "Label": "_lc_ge_" + region,
+            "Section": "",
+            "Group": "",
+            "Address/Size": None if size == MISSING else hex(start + size)
+        }
+
+
+def layout_hierarchical_rows(layout):
+    """
+    hierarchical_rows() of the layout's SectionTree, built only once
+    the first row is asked for
+    """
+    yield from hierarchical_rows(SectionTree(layout))
+
+
+def memory_rows(usage):
+    """
+    Yields one Memory_Usage row per memory_usage() entry
+    """
+    for name, origin, length, used, symbols in usage:
+        yield {
+            "Memory": name,
+            "Origin": hex(origin),
+            "End_Address": hex(origin + length),
+            "Length": hex(length),
+            "Used": hex(used),
+            "Free": hex(length - used),
+            "Utilization_%": round(100 * used / length, 2) if length else 0.0,
+            "Symbols": symbols
+        }
+
+
+def lookup_rows(index, addresses):
+    """
+    Yields one Lookup row per address, resolved in one batch by
+    SymbolIndex.lookup_many. Match is "contains" (inside a sized
+    symbol), "nearest" (the closest symbol below it) or "none".
+    """
+    for address, (sub, contains, region) in zip(addresses, index.lookup_many(addresses)):
+        symbol = index.sub_info(sub) if sub is not None else None
+        region_name = index.region_info(region)["name"] if region is not None else None
+        parent = symbol["parent"] if symbol else None
+
+        yield {
+            "Address": hex(address),
+            "Symbol": symbol["name"] if symbol else None,
+            "Offset": hex(address - symbol["start"]) if symbol else None,
+            "Size": _hex(symbol["size"]) if symbol else None,
+            "Parent_Section": parent,
+            "Match": "contains" if contains else "nearest" if symbol else "none",
+            "Region": region_name,
+            "Reset_Safe": is_reset_safe(region_name or parent or ""),
+        }
+
+
+def section_rows(sections, ranges, status):
+    """
+    Yields one row per sections.json entry from get_section_ranges()
+    results (inclusive ends) and validate_sections() statuses
+    """
+    for section in sections:
+        name = section["ram_name"]
+        start, end = ranges[name]
+        size = end - start + 1 if start is not None and end is not None and end >= start else None
+
+        yield {
+            "RAM_Section": section.get("ram_section"),
+            "RAM_Name": name,
+            "Start_Address": _hex(start),
+            "End_Address": _hex(end),
+            "Size": _hex(size),
+            "Status": status[name]
+        }
+
+
+def report_tables(layout, usage=None):
+    """
+    The four report tables as (title, rows, columns), rows generated
+    lazily from the layout, plus Memory_Usage when memory_usage()
+    results are given
+    """
+    tables = [
+        ("All_Memory_Regions", region_rows(layout), REGION_COLUMNS),
+        ("Sub_Sections", nested_rows(layout), NESTED_COLUMNS),
+        ("Reset_Safe_Area", reset_safe_rows(layout), REGION_COLUMNS),
+        (
+            "Hierarchical_Sub_Sections",
+            layout_hierarchical_rows(layout),
+            HIERARCHICAL_COLUMNS
+        ),
+    ]
+    if usage:
+        tables.append(("Memory_Usage", memory_rows(usage), MEMORY_COLUMNS))
+    return tables
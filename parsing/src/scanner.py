@@ -0,0 +1,173 @@
+import os
+import re
+from array import array
+from collections import namedtuple
+
+from mapio import line_chunks, mapped, open_map
+from model import SymbolTable
+
+# =========================================================
+# CTC symbol / size row pattern
+# =========================================================
+# One compiled alternation covers both row kinds of a CTC map:
+#   | NAME      | 0x...     -> symbol row
+#   NAME_SIZE   | 0x...     -> size row
+# It runs on the raw bytes; [^\S\n] keeps a match inside one line and
+# each match runs on to the end of its line, so a line gives one match.
+# SYMBOL_ROW / SIZE_ROW are its two halves, used to find the other
+# kind of row on a line once the alternation has found the first.
+SYMBOL_ROW = rb"\|[^\S\n]*(?P<sym>[A-Za-z0-9_]+)[^\S\n]*\|[^\S\n]*(?P<addr>0x[0-9A-Fa-f]+)"
+SIZE_ROW = rb"(?P<size>[A-Za-z0-9_]+_SIZE)[^\S\n]*\|[^\S\n]*(?P<value>0x[0-9A-Fa-f]+)"
+
+CTC_ROW = re.compile(rb"(?:" + SYMBOL_ROW + rb"|" + SIZE_ROW + rb")[^\n]*")
+CTC_SYMBOL = re.compile(SYMBOL_ROW)
+CTC_SIZE = re.compile(SIZE_ROW)
+
+SYMBOL = "symbol"
+SIZE = "size"
+
+CtcRecord = namedtuple("CtcRecord", ["kind", "name", "value"])
+
+
+# =========================================================
+# Streaming scanner
+# =========================================================
+def scan_ctc(data, start=0, end=None):
+    """
+    Yields CtcRecord(kind, name, value) for every symbol / size row.
+
+    `data` is a bytes-like buffer (normally the mmap from
+    mapio.open_map); the patterns walk it without decoding or splitting
+    lines. Like the old pair of per-line searches, only the first
+    symbol and the first size on a line count, so a symbol whose name
+    ends in _SIZE is reported as both a symbol and a size record and
+    further "| NAME | 0x" pairs on the same line are ignored. start /
+    end limit the scan to a byte range that should begin and end on
+    line boundaries.
+    """
+    if end is None:
+        end = len(data)
+
+    find = data.find
+
+    for match in CTC_ROW.finditer(data, start, end):
+        sym, addr, size, value = match.groups()
+
+        # The alternation found the leftmost row of either kind and ran
+        # on to the end of the line; the other kind can only start
+        # after it (and needs a "_SIZE" or two more "|", checked first
+        # as that is cheap)
+        first, line_end = match.span()
+        first += 1
+        if sym is not None:
+            yield CtcRecord(SYMBOL, sym.decode("ascii").upper(), int(addr, 16))
+            if len(sym) > 5 and sym.endswith(b"_SIZE"):
+                size, value = sym, addr
+            elif find(b"_SIZE", match.end("addr"), line_end) >= 0:
+                other = CTC_SIZE.search(data, first, line_end)
+                if other is not None:
+                    size, value = other.groups()
+        else:
+            bar = find(b"|", first, line_end)
+            if bar >= 0 and find(b"|", bar + 1, line_end) >= 0:
+                other = CTC_SYMBOL.search(data, first, line_end)
+                if other is not None:
+                    yield CtcRecord(SYMBOL, other["sym"].decode("ascii").upper(), int(other["addr"], 16))
+
+        if size is not None:
+            yield CtcRecord(SIZE, size.decode("ascii").upper(), int(value, 16))
+
+
+def collect_ctc_symbols(data, start=0, end=None):
+    """
+    Returns (symbols, sizes) SymbolTables of NAME -> int, last value wins
+    """
+    symbols = SymbolTable()
+    sizes = SymbolTable()
+
+    for kind, name, value in scan_ctc(data, start, end):
+        if kind is SYMBOL:
+            symbols[name] = value
+        else:
+            sizes[name] = value
+
+    return symbols, sizes
+
+
+def read_ctc_symbols(source, workers=1):
+    """
+    Scans a CTC map (path or mapped buffer) into (symbols, sizes).
+    workers > 1 scans a map file in parallel chunks.
+    """
+    if workers > 1 and isinstance(source, (str, os.PathLike)):
+        return read_ctc_symbols_parallel(source, workers)
+
+    with mapped(source) as data:
+        return collect_ctc_symbols(data)
+
+
+# =========================================================
+# Chunked parallel scan
+# =========================================================
+def _scan_chunk(task):
+    """
+    Worker: scans one line-aligned byte range of a map file and returns
+    the partial tables as plain (names, values) pairs
+    """
+    map_file, start, end = task
+    with open_map(map_file) as data:
+        symbols, sizes = collect_ctc_symbols(data, start, end)
+    return (
+        (symbols.names.names, symbols.values),
+        (sizes.names.names, sizes.values),
+    )
+
+
+def merge_tables(parts):
+    """
+    Merges partial (names, values) tables in chunk order. Key order is
+    first appearance and the last value wins, exactly as if the chunks
+    had been scanned in one pass.
+    """
+    merged = SymbolTable()
+    parts = iter(parts)
+
+    # The first chunk's table is taken over as is (names are unique
+    # within a chunk), later chunks are applied row by row
+    first = next(parts, None)
+    if first is not None:
+        names, values = first
+        merged.names.names = list(names)
+        merged.names.ids = dict(zip(names, range(len(names))))
+        merged.values = array("Q", values)
+
+    for names, values in parts:
+        for name, value in zip(names, values):
+            merged[name] = value
+    return merged
+
+
+def read_ctc_symbols_parallel(map_file, workers=None, min_chunk=1 << 20):
+    """
+    Splits a CTC map at line boundaries, scans the chunks in a process
+    pool and merges the partial tables deterministically
+    """
+    workers = workers or os.cpu_count() or 1
+
+    with open_map(map_file) as data:
+        ranges = line_chunks(data, workers, min_chunk)
+
+    if len(ranges) <= 1:
+        with open_map(map_file) as data:
+            return collect_ctc_symbols(data)
+
+    # Imported here: multiprocessing roughly doubles the start-up time
+    # of a run that never uses it
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        parts = list(pool.map(_scan_chunk, [(map_file, start, end) for start, end in ranges]))
+
+    symbols = merge_tables(part[0] for part in parts)
+    sizes = merge_tables(part[1] for part in parts)
+    return symbols, sizes
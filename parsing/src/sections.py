@@ -0,0 +1,87 @@
+import json
+import re
+
+from mapio import mapped
+
+ADDRESS = re.compile(rb"0x[0-9A-Fa-f]+")
+
+
+# =========================================================
+# sections.json
+# =========================================================
+def load_sections(config_file):
+    """
+    Returns the [{"ram_section": ..., "ram_name": ...}, ...] entries of
+    sections.json
+    """
+    with open(config_file, encoding="utf-8") as f:
+        return json.load(f).get("sections", [])
+
+
+# =========================================================
+# One-pass begin / end extraction
+# =========================================================
+def section_matcher(ram_names):
+    """
+    One alternation over every configured name. Longer names come
+    first and a name must not run on into a longer word, so
+    DATA_DLMU_1 does not match DATA_DLMU_10. (The check before the
+    name is done by the caller: a look-behind would stop the regex
+    engine from skipping ahead to the names' common prefix.)
+    """
+    names = sorted({name.encode("utf-8") for name in ram_names}, key=len, reverse=True)
+    return re.compile(
+        rb"(?:" + b"|".join(re.escape(name) for name in names) + rb")(?![\w])"
+    )
+
+
+def get_section_ranges(source, ram_names):
+    """
+    Resolves the begin and end address of every name in one scan.
+
+    A line naming a section and containing "begin" (case-insensitive)
+    sets its start, one containing "end" its end; the address is the
+    first 0x... after that line, as in the HiTech
+
+        .NAME_begin memory region -> DATA_DLMU_2
+        0x00000000B0020040
+
+    layout. Later matches win. Returns {ram_name: (start, end)} with
+    integer addresses, None where a boundary was not found; the cost
+    does not depend on how many names are configured.
+    """
+    ranges = {name: [None, None] for name in ram_names}
+    if not ranges:
+        return {}
+
+    matcher = section_matcher(ranges)
+
+    with mapped(source) as data:
+        for match in matcher.finditer(data):
+            before = data[match.start() - 1:match.start()] if match.start() else b""
+            if before.isalnum() or before == b"_":
+                continue
+
+            line_start = data.rfind(b"\n", 0, match.start()) + 1
+            line_end = data.find(b"\n", match.end())
+            if line_end < 0:
+                continue
+
+            line = data[line_start:line_end].lower()
+            begin = b"begin" in line
+            end = b"end" in line
+            if not (begin or end):
+                continue
+
+            address = ADDRESS.search(data, line_end)
+            if address is None:
+                continue
+
+            value = int(address.group(), 16)
+            bounds = ranges[match.group().decode("utf-8")]
+            if begin:
+                bounds[0] = value
+            if end:
+                bounds[1] = value
+
+    return {name: tuple(bounds) for name, bounds in ranges.items()}
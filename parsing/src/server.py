@@ -0,0 +1,274 @@
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from cache import cached_parse
+from memories import memory_usage, read_map_memories
+from metrics import region_metrics
+from symbol_index import SymbolIndex
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BYTES = 1 << 30
+RANGE_LIMIT = 1000
+
+
+# =========================================================
+# Loaded builds
+# =========================================================
+class Build:
+    """
+    One loaded build: its address index and precomputed usage tables
+    """
+
+    def __init__(self, map_file, layout):
+        self.map_file = map_file
+        self.index = SymbolIndex(layout)
+
+        metrics = region_metrics(layout)
+        self.regions = [
+            {
+                "name": name, "start": start, "size": size, "usage": usage,
+                "free": free, "utilization": utilization,
+            }
+            for (name, start, size, _, _), usage, free, utilization in zip(
+                layout.regions(), metrics["usage"], metrics["free"], metrics["utilization"]
+            )
+        ]
+        memories = read_map_memories(map_file)
+        self.memories = [
+            {
+                "name": name, "origin": origin, "length": length, "used": used,
+                "free": length - used, "symbols": symbols,
+                "utilization": round(100 * used / length, 2) if length else None,
+            }
+            for name, origin, length, used, symbols in memory_usage(layout, memories)
+        ] if memories else []
+
+    @property
+    def nbytes(self):
+        return self.index.nbytes
+
+
+class BuildStore:
+    """
+    Named builds (map paths), each parsed and indexed on first use.
+
+    Loaded builds are kept in least-recently-used order; while their
+    estimated memory exceeds max_bytes the coldest ones are dropped
+    (never the build being queried). A dropped build is reloaded, via
+    the parse cache, on its next query.
+    """
+
+    def __init__(self, builds=None, max_bytes=DEFAULT_MAX_BYTES, cache=None, assign_by="prefix"):
+        self.paths = dict(builds or {})
+        self.max_bytes = max_bytes
+        self.cache = cache
+        self.assign_by = assign_by
+        self.loaded = OrderedDict()
+        self.loading = {}  # name -> Future of a parse in progress
+        self.lock = threading.Lock()
+
+    def add(self, name, map_file):
+        with self.lock:
+            self.paths[name] = map_file
+            self.loaded.pop(name, None)
+            self.loading.pop(name, None)
+
+    def get(self, name):
+        """
+        The Build for `name`; raises KeyError for an unknown name and
+        ValueError for a map that cannot be parsed.
+
+        The lock only guards the dicts: a cold parse runs outside it,
+        so queries for loaded builds are not held up, and concurrent
+        queries for the same cold build wait for one shared parse.
+        """
+        with self.lock:
+            build = self.loaded.get(name)
+            if build is not None:
+                self.loaded.move_to_end(name)
+                return build
+
+            map_file = self.paths[name]
+            future = self.loading.get(name)
+            if future is None:
+                future = self.loading[name] = Future()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            return future.result()
+
+        try:
+            build = Build(map_file, cached_parse(map_file, self.assign_by, self.cache))
+        except BaseException as e:
+            with self.lock:
+                if self.loading.get(name) is future:
+                    del self.loading[name]
+            future.set_exception(e)
+            raise
+
+        with self.lock:
+            if self.loading.get(name) is future:
+                del self.loading[name]
+            # Not published when add() replaced the map meanwhile
+            if self.paths.get(name) == map_file:
+                self.loaded[name] = build
+                self._evict()
+        future.set_result(build)
+        return build
+
+    def _evict(self):
+        total = sum(build.nbytes for build in self.loaded.values())
+        while total > self.max_bytes and len(self.loaded) > 1:
+            _, build = self.loaded.popitem(last=False)
+            total -= build.nbytes
+
+    def status(self):
+        with self.lock:
+            builds = [
+                {
+                    "name": name,
+                    "map": map_file,
+                    "loaded": name in self.loaded,
+                    "bytes": self.loaded[name].nbytes if name in self.loaded else 0,
+                }
+                for name, map_file in self.paths.items()
+            ]
+        return {
+            "builds": builds,
+            "loaded_bytes": sum(build["bytes"] for build in builds),
+            "max_bytes": self.max_bytes,
+        }
+
+
+# =========================================================
+# Queries (plain functions, so they can be used without HTTP)
+# =========================================================
+def query_symbol(build, address):
+    """
+    Symbol and region at `address`, resolved like the lookup command:
+    the innermost sized sub-region containing it (or an unsized symbol
+    inside that), else the nearest one starting below it
+    """
+    index = build.index
+    sub, contains, region = index.lookup_many([address])[0]
+
+    symbol = None
+    if sub is not None:
+        symbol = index.sub_info(sub)
+        symbol["offset"] = address - symbol["start"]
+        symbol["contains"] = contains
+
+    return {
+        "address": address,
+        "symbol": symbol,
+        "region": None if region is None else index.region_info(region),
+    }
+
+
+def query_range(build, low, high, limit=RANGE_LIMIT):
+    if limit < 1:
+        raise ValueError(f"limit must be positive: {limit}")
+
+    index = build.index
+    subs = index.subs_in(low, high, limit + 1)
+    return {
+        "start": low,
+        "end": high,
+        "symbols": [index.sub_info(i) for i in subs[:limit]],
+        "truncated": len(subs) > limit,
+    }
+
+
+def query_usage(build, name=None):
+    """
+    Region and memory usage, optionally only rows called `name`
+    """
+    regions, memories = build.regions, build.memories
+    if name is not None:
+        regions = [row for row in regions if row["name"] == name]
+        memories = [row for row in memories if row["name"] == name]
+    return {"regions": regions, "memories": memories}
+
+
+# =========================================================
+# HTTP / JSON
+# =========================================================
+def _address(params, key):
+    try:
+        return int(params[key], 0)
+    except KeyError:
+        raise ValueError(f"Missing parameter: {key}") from None
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """
+    GET  /builds
+    GET  /symbol?build=N&address=0x...
+    GET  /range?build=N&start=0x...&end=0x...[&limit=1000]
+    GET  /usage?build=N[&name=DLMU2]
+    POST /builds?name=N&map=PATH
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        store = self.server.store
+
+        try:
+            if url.path == "/builds":
+                return self._send(200, store.status())
+
+            build = store.get(params.get("build", ""))
+            if url.path == "/symbol":
+                result = query_symbol(build, _address(params, "address"))
+            elif url.path == "/range":
+                result = query_range(
+                    build, _address(params, "start"), _address(params, "end"),
+                    int(params.get("limit", RANGE_LIMIT))
+                )
+            elif url.path == "/usage":
+                result = query_usage(build, params.get("name"))
+            else:
+                return self._send(404, {"error": f"Unknown path: {url.path}"})
+        except KeyError:
+            return self._send(404, {"error": f"Unknown build: {params.get('build', '')}"})
+        except (OSError, ValueError) as e:
+            return self._send(400, {"error": str(e)})
+
+        self._send(200, result)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if url.path != "/builds" or "name" not in params or "map" not in params:
+            return self._send(400, {"error": "POST /builds?name=N&map=PATH"})
+
+        self.server.store.add(params["name"], params["map"])
+        self._send(200, self.server.store.status())
+
+    def _send(self, code, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(store, host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False):
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.store = store
+    server.verbose = verbose
+    return server
@@ -0,0 +1,186 @@
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+from model import MISSING
+from region_index import build_interval_index, region_at
+
+ADDRESS = re.compile(r"0[xX][0-9A-Fa-f]+")
+
+# Rough per-row cost of the Python lists behind an index (segment
+# tuples, ints), used for memory accounting
+_ROW_OVERHEAD = 120
+
+
+# =========================================================
+# Address index over one layout
+# =========================================================
+class SymbolIndex:
+    """
+    Sorted-boundary lookups over a MemoryLayout.
+
+    Sized sub-regions and regions are flattened into disjoint
+    segments labelled with the innermost row covering them
+    (region_index.build_interval_index), so "what is at this address"
+    is one bisect. All sub-regions are also kept sorted by start for
+    range queries and nearest-symbol lookups (sub-regions without a
+    size, such as GNU symbols, are only found that way).
+    """
+
+    def __init__(self, layout):
+        self.layout = layout
+
+        starts, sizes = layout.sub_start, layout.sub_size
+        self.subs = build_interval_index([
+            (i, start, start + size)
+            for i, (start, size) in enumerate(zip(starts, sizes))
+            if size != MISSING
+        ])
+        self.regions = build_interval_index([
+            (r, start, start + size)
+            for r, (start, size) in enumerate(zip(layout.region_start, layout.region_size))
+            if size != MISSING
+        ])
+
+        order = sorted(range(layout.sub_count), key=starts.__getitem__)
+        self.order = array("I", order)
+        self.sorted_starts = array("Q", (starts[i] for i in order))
+
+    @property
+    def nbytes(self):
+        """
+        Approximate memory held by the layout and the index
+        """
+        layout = self.layout
+        columns = sum(
+            column.itemsize * len(column)
+            for column in (
+                layout.region_name, layout.region_start, layout.region_size,
+                layout.region_tag, layout.region_status, layout.sub_parent,
+                layout.sub_name, layout.sub_start, layout.sub_size,
+                layout.sub_align, layout.sub_status, self.order, self.sorted_starts,
+            )
+        )
+        names = sum(len(name) + 50 for name in layout.names.names)
+        segments = (len(self.subs[0]) + len(self.regions[0])) * _ROW_OVERHEAD
+        return columns + names + segments
+
+    # -------- Point queries --------
+    def sub_at(self, address):
+        """
+        Innermost sized sub-region containing `address`, or None
+        """
+        return region_at(self.subs, address)
+
+    def region_at(self, address):
+        """
+        Innermost sized region containing `address`, or None
+        """
+        return region_at(self.regions, address)
+
+    def lookup_many(self, addresses):
+        """
+        Resolves a batch of addresses: they are sorted once and each
+        bisect starts where the previous one ended. Returns one
+        (sub, contains, region) per address, in input order: the
+        innermost sized sub-region containing it (contains=True) or an
+        unsized symbol inside that one, else the nearest sub-region
+        starting below it, and the innermost region containing it;
+        None where there is none.
+        """
+        sub_starts, sub_info = self.subs
+        region_starts, region_info = self.regions
+        sorted_starts, order = self.sorted_starts, self.order
+        starts, sizes = self.layout.sub_start, self.layout.sub_size
+
+        results = [None] * len(addresses)
+        s = r = k = 0
+        for i in sorted(range(len(addresses)), key=addresses.__getitem__):
+            address = addresses[i]
+
+            s = bisect_right(sub_starts, address, s)
+            sub = None
+            if s:
+                end, label = sub_info[s - 1]
+                if address < end:
+                    sub = label
+
+            # The nearest start below: the answer when nothing sized
+            # contains the address, and a finer one when it is an
+            # unsized symbol (a GNU function label) inside the container
+            contains = sub is not None
+            k = bisect_right(sorted_starts, address, k)
+            if k:
+                nearest = order[k - 1]
+                if not contains or (
+                    sizes[nearest] == MISSING and sorted_starts[k - 1] >= starts[sub]
+                ):
+                    sub = nearest
+
+            r = bisect_right(region_starts, address, r)
+            region = None
+            if r:
+                end, label = region_info[r - 1]
+                if address < end:
+                    region = label
+
+            results[i] = (sub, contains, region)
+        return results
+
+    # -------- Range queries --------
+    def subs_in(self, low, high, limit=None):
+        """
+        Sub-regions starting in [low, high), by address, plus the one
+        containing `low` when it starts before it
+        """
+        found = []
+        inner = self.sub_at(low)
+        if inner is not None and self.layout.sub_start[inner] < low:
+            found.append(inner)
+
+        lo = bisect_left(self.sorted_starts, low)
+        hi = bisect_left(self.sorted_starts, high, lo)
+        if limit is not None:
+            hi = min(hi, lo + max(limit - len(found), 0))
+        found.extend(self.order[lo:hi])
+        return found
+
+    # -------- Rows --------
+    def sub_info(self, i):
+        layout = self.layout
+        names = layout.names
+        size = layout.sub_size[i]
+        return {
+            "name": names[layout.sub_name[i]],
+            "parent": names[layout.region_name[layout.sub_parent[i]]],
+            "start": layout.sub_start[i],
+            "size": None if size == MISSING else size,
+        }
+
+    def region_info(self, r):
+        layout = self.layout
+        size = layout.region_size[r]
+        return {
+            "name": layout.names[layout.region_name[r]],
+            "start": layout.region_start[r],
+            "size": None if size == MISSING else size,
+        }
+
+
+def read_addresses(lines):
+    """
+    Addresses from text lines: the first 0x... on each line (so crash
+    logs and stack dumps work as they are), else a bare decimal
+    number; blank lines, # comments and lines without one are skipped
+    """
+    addresses = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        match = ADDRESS.search(line)
+        if match is not None:
+            addresses.append(int(match.group(), 16))
+        elif line.isdigit():
+            addresses.append(int(line))
+    return addresses
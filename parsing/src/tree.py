@@ -0,0 +1,244 @@
+import json
+from array import array
+from itertools import accumulate
+
+from model import MISSING, Names
+from profiling import stage
+
+
+# =========================================================
+# Section / group names
+# =========================================================
+def split_name(name):
+    """
+    A_B_C_rest -> ("A_B_C", "rest"): the first three "_" parts name the
+    section, the remainder the group. Shorter names are a section of
+    their own with an empty group.
+    """
+    parts = name.split("_", 3)
+    if len(parts) < 3:
+        return name, ""
+    return "_".join(parts[:3]), parts[3] if len(parts) > 3 else ""
+
+
+# =========================================================
+# Region -> section -> group tree
+# =========================================================
+class SectionTree:
+    """
+    Regions, the sections their sub-regions are grouped into and the
+    sub-regions themselves (the groups), built in one pass over the
+    layout columns.
+
+    Nodes are parallel arrays, not objects: every sub-region gets its
+    section id in a column allocated up front, sections are numbered in
+    order of first appearance. Children are kept as offset / child id
+    arrays (a counting sort, so map order is kept), and the size, count
+    and free-space rollups are accumulated bottom-up in the same pass.
+
+    Section free space is the gap inside its address span not covered
+    by sizes (negative for overlaps); region used / free follow
+    region_metrics (a region without sized sub-regions is fully used).
+    """
+
+    def __init__(self, layout):
+        self.layout = layout
+
+        with stage("build_tree") as record:
+            self._build(layout)
+            record["rows"] = layout.region_count + len(self.section_name) + layout.sub_count
+
+    def _build(self, layout):
+        sub_count = layout.sub_count
+        region_count = layout.region_count
+        layout_names = layout.names.names
+
+        # A name with fewer than two "_" is its own section and keeps its
+        # layout name id; split-off section / group names get ids above
+        # the layout's, in a table of their own
+        self.base = base = len(layout_names)
+        self.extra = extra = Names()
+        ids = extra.ids
+        self.empty = empty = base + extra.intern("")
+        region_sections = [{} for _ in range(region_count)]  # section name id -> section
+
+        self.sub_section = sub_section = array("I", bytes(4 * sub_count))
+        self.sub_group = sub_group = array("I", [empty]) * sub_count
+        self.section_region = section_region = array("I")
+        self.section_name = section_name = array("I")
+        self.section_first = section_first = array("I")
+        self.section_size = size = array("Q")
+        self.section_count = count = array("I")
+        self.section_start = low = array("Q")
+        self.section_end = high = array("Q")
+
+        for i, (parent, section, start, sub_size) in enumerate(zip(
+            layout.sub_parent, layout.sub_name, layout.sub_start, layout.sub_size
+        )):
+            name = layout_names[section]
+            if name.count("_") >= 2:
+                name, group = split_name(name)
+                section = ids.get(name)
+                if section is None:
+                    section = extra.intern(name)
+                section += base
+                if group:
+                    group_id = ids.get(group)
+                    if group_id is None:
+                        group_id = extra.intern(group)
+                    sub_group[i] = base + group_id
+
+            end = start
+            if sub_size != MISSING:
+                end += sub_size
+            else:
+                sub_size = 0
+
+            by_name = region_sections[parent]
+            s = by_name.get(section)
+            if s is None:
+                by_name[section] = len(section_name)
+                section_region.append(parent)
+                section_name.append(section)
+                section_first.append(i)
+                size.append(sub_size)
+                count.append(1)
+                low.append(start)
+                high.append(end)
+                sub_section[i] = len(section_name) - 1
+                continue
+
+            # Rollups: sub-regions -> sections
+            sub_section[i] = s
+            size[s] += sub_size
+            count[s] += 1
+            if start < low[s]:
+                low[s] = start
+            if end > high[s]:
+                high[s] = end
+
+        # Rollups: sections -> regions
+        used = array("Q", bytes(8 * region_count))
+        subs = array("I", bytes(4 * region_count))
+        sections = array("I", bytes(4 * region_count))
+        for r, s_size, s_count in zip(section_region, size, count):
+            used[r] += s_size
+            subs[r] += s_count
+            sections[r] += 1
+        for r, region_size in enumerate(layout.region_size):
+            if not used[r] and region_size != MISSING:
+                used[r] = region_size
+        self.region_used, self.region_sub_count = used, subs
+
+        # Children, grouped by parent in their original order
+        self.region_offsets, self.region_children = _children(section_region, sections)
+        self.section_offsets, self.section_children = _children(sub_section, count)
+
+    def __len__(self):
+        return self.layout.region_count + len(self.section_name) + self.layout.sub_count
+
+    def name(self, name_id):
+        """
+        Section / group name of an id in section_name or sub_group
+        """
+        if name_id < self.base:
+            return self.layout.names[name_id]
+        return self.extra[name_id - self.base]
+
+    # -------- Rollups --------
+    def region_free(self, r):
+        size = self.layout.region_size[r]
+        return None if size == MISSING else size - self.region_used[r]
+
+    def section_free(self, s):
+        return self.section_end[s] - self.section_start[s] - self.section_size[s]
+
+    # -------- Children --------
+    def sections_of(self, r):
+        return self.region_children[self.region_offsets[r]:self.region_offsets[r + 1]]
+
+    def subs_of(self, s):
+        return self.section_children[self.section_offsets[s]:self.section_offsets[s + 1]]
+
+
+def _children(parents, counts):
+    """
+    (offsets, children): the children of p are
+    children[offsets[p]:offsets[p + 1]], in their original order.
+    A counting sort: prefix sums of the per-parent counts give each
+    parent's slot, one pass places every child.
+    """
+    offsets = array("I", accumulate(counts, initial=0))
+    fill = offsets[:-1]
+    children = array("I", bytes(4 * len(parents)))
+    for i, p in enumerate(parents):
+        children[fill[p]] = i
+        fill[p] += 1
+    return offsets, children
+
+
+# =========================================================
+# Nested JSON
+# =========================================================
+def _size(value):
+    return None if value == MISSING else value
+
+
+def tree_regions(tree):
+    """
+    Yields one nested dict per region: its rollups, sections and
+    groups. Only one region's dicts exist at a time.
+    """
+    layout = tree.layout
+    layout_names = layout.names.names
+    name = tree.name
+
+    for r in range(layout.region_count):
+        start = layout.region_start[r]
+        size = _size(layout.region_size[r])
+        sections = []
+        for s in tree.sections_of(r):
+            sections.append({
+                "name": name(tree.section_name[s]),
+                "start": tree.section_start[s],
+                "end": tree.section_end[s],
+                "size": tree.section_size[s],
+                "free": tree.section_free(s),
+                "count": tree.section_count[s],
+                "groups": [
+                    {
+                        "name": name(tree.sub_group[i]),
+                        "sub_section": layout_names[layout.sub_name[i]],
+                        "start": layout.sub_start[i],
+                        "size": _size(layout.sub_size[i]),
+                    }
+                    for i in tree.subs_of(s)
+                ],
+            })
+
+        yield {
+            "name": layout_names[layout.region_name[r]],
+            "start": start,
+            "end": None if size is None else start + size,
+            "size": size,
+            "used": tree.region_used[r],
+            "free": tree.region_free(r),
+            "count": tree.region_sub_count[r],
+            "sections": sections,
+        }
+
+
+def write_tree_json(tree, output_file):
+    """
+    Writes {"format": ..., "regions": [...]} region by region.
+    Returns the number of regions written.
+    """
+    count = 0
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write('{"format": %s, "regions": [' % json.dumps(tree.layout.fmt))
+        for region in tree_regions(tree):
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(region))
+            count += 1
+        f.write("\n]}\n")
+    return count
@@ -1,22 +1,189 @@
 # src/validator.py
 
+import json
+from array import array
+
+from model import MISSING
+
+OK = "OK"
+OVERLAP = "OVERLAP"
+MISALIGNED = "MISALIGNED"
+OUT_OF_REGION = "OUT OF REGION"
+INVALID_RANGE = "INVALID RANGE"
+NOT_FOUND = "NOT FOUND"
+
+# Status codes (index into RANGE_STATUSES), in rising priority: a row
+# gets the highest-priority finding
+RANGE_STATUSES = (OK, OVERLAP, MISALIGNED, OUT_OF_REGION, INVALID_RANGE, NOT_FOUND)
+_OK, _OVERLAP, _MISALIGNED, _OUT_OF_REGION, _INVALID_RANGE, _NOT_FOUND = range(6)
+
+DEFAULT_ALIGNMENT = 0x40
+
 
 def validate_range(start, end):
     """
-    Basic memory range validation
+    Basic memory range validation of one hex-string pair; `end` is the
+    last address of the range (inclusive, as validate_sections)
     """
 
     if not start or not end:
-        return "NOT FOUND"
+        return NOT_FOUND
 
     start_int = int(start, 16)
     end_int = int(end, 16)
 
-    if end_int <= start_int:
-        return "INVALID RANGE"
+    return RANGE_STATUSES[validate_ranges([start_int], [_range_size(start_int, end_int)])[0]]
+
+
+def _range_size(start, end):
+    """
+    Size of the range start..end with an inclusive end (a map's _end
+    marker gives the last address); 0, an INVALID RANGE, when end < start
+    """
+    return end - start + 1 if end >= start else 0
+
+
+# =========================================================
+# Batch validation
+# =========================================================
+def validate_ranges(starts, sizes, alignment=DEFAULT_ALIGNMENT, bounds=None):
+    """
+    Validates whole columns at once.
+
+    starts / sizes: integer columns (array / list), MISSING or None
+    for unknown values. A row without a size is a point (a symbol) and
+    only its start is checked; a size of 0 is an INVALID RANGE.
+    alignment: required start alignment (None / 1 -> not checked)
+    bounds: (low, high) half-open range every row must lie in, or None
+
+    Returns an array("B") of RANGE_STATUSES codes, one per row: one
+    pass classifies every row, checking in falling priority (NOT FOUND,
+    INVALID RANGE, OUT OF REGION, MISALIGNED), then one sweep over the
+    sized OK rows in start order marks OVERLAP.
+    """
+    low, high = bounds if bounds else (0, MISSING)
+    alignment = alignment if alignment and alignment > 1 else 1
+
+    status = array("B", (
+        _NOT_FOUND if start is None or start == MISSING
+        else _INVALID_RANGE if size == 0
+        else _OUT_OF_REGION if start < low or start >= high
+        else _OUT_OF_REGION if size is not None and size != MISSING and start + size > high
+        else _MISALIGNED if start % alignment
+        else _OK
+        for start, size in zip(starts, sizes)
+    ))
+
+    rows = [
+        i for i, (size, code) in enumerate(zip(sizes, status))
+        if code == _OK and size is not None and size != MISSING
+    ]
+    rows.sort(key=starts.__getitem__)
+
+    # A row overlaps iff it starts before the furthest end seen so far;
+    # the row holding that end overlaps it too
+    max_end = -1
+    holder = None
+    for i in rows:
+        start = starts[i]
+        if start < max_end:
+            status[i] = status[holder] = _OVERLAP
+        end = start + sizes[i]
+        if end > max_end:
+            max_end, holder = end, i
+
+    return status
+
+
+# =========================================================
+# sections.json rules
+# =========================================================
+def _number(value):
+    return int(value, 0) if isinstance(value, str) else value
+
+
+def load_section_rules(config_file):
+    """
+    Reads the per-section checks from sections.json:
+
+        {"ram_section": "DLMU2", "ram_name": "DATA_DLMU_2",
+         "origin": "0xB0020000", "length": "0x10000", "alignment": "0x40"}
+
+    Returns {key: (alignment, bounds)} where the keys are ram_name,
+    ram_name without its DATA_ prefix (the HiTech region tag) and
+    ram_section. origin / length are optional (no bounds check);
+    alignment defaults to DEFAULT_ALIGNMENT.
+    """
+    with open(config_file, encoding="utf-8") as f:
+        config = json.load(f)
+
+    rules = {}
+    for section in config.get("sections", []):
+        alignment = _number(section.get("alignment", DEFAULT_ALIGNMENT))
+        bounds = None
+        if "origin" in section and "length" in section:
+            origin = _number(section["origin"])
+            bounds = (origin, origin + _number(section["length"]))
+
+        ram_name = section.get("ram_name", "")
+        for key in (ram_name, ram_name.replace("DATA_", ""), section.get("ram_section")):
+            if key:
+                rules[key] = (alignment, bounds)
+    return rules
+
+
+def validate_layout(layout, rules):
+    """
+    Validates every sub-region of a MemoryLayout against the rule of
+    its region, found by region tag, then region name.
+
+    Sub-regions are grouped per rule and each group is validated as
+    one batch. Returns an array("B") of RANGE_STATUSES codes per
+    sub-region; rows without a rule are OK.
+    """
+    names = layout.names
+    region_rules = []
+    for name_id, tag_id in zip(layout.region_name, layout.region_tag):
+        rule = rules.get(names[tag_id]) if tag_id < len(names) else None
+        region_rules.append(rule if rule is not None else rules.get(names[name_id]))
+
+    groups = {}
+    for i, parent in enumerate(layout.sub_parent):
+        rule = region_rules[parent]
+        if rule is not None:
+            groups.setdefault(rule, []).append(i)
+
+    status = array("B", bytes(layout.sub_count))
+    starts, sizes = layout.sub_start, layout.sub_size
+    for (alignment, bounds), rows in groups.items():
+        codes = validate_ranges(
+            [starts[i] for i in rows], [sizes[i] for i in rows], alignment, bounds
+        )
+        for i, code in zip(rows, codes):
+            status[i] = code
+    return status
+
+
+def validate_sections(ranges, rules):
+    """
+    Validates get_section_ranges() results: {ram_name: (start, end)}
+    with inclusive ends, against the rule of each name (alignment
+    only when there is none). Returns {ram_name: status}.
+    """
+    groups = {}
+    for name, (start, end) in ranges.items():
+        groups.setdefault(rules.get(name, (DEFAULT_ALIGNMENT, None)), []).append(name)
 
-    # alignment check (example 0x40)
-    if start_int % 0x40 != 0:
-        return "MISALIGNED"
+    status = {}
+    for (alignment, bounds), names in groups.items():
+        starts = [ranges[name][0] for name in names]
+        sizes = [
+            None if start is None or end is None else _range_size(start, end)
+            for start, end in (ranges[name] for name in names)
+        ]
+        # A missing end makes the whole range unknown
+        starts = [None if size is None else start for start, size in zip(starts, sizes)]
 
-    return "OK"
+        for name, code in zip(names, validate_ranges(starts, sizes, alignment, bounds)):
+            status[name] = RANGE_STATUSES[code]
+    return status
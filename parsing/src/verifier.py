@@ -0,0 +1,129 @@
+import heapq
+
+OK = "OK"
+OVERLAP = "OVERLAP"
+DUPLICATE = "DUPLICATE"
+OVERFLOW = "OVERFLOW"
+
+# Worst status wins when a row has several findings
+_SEVERITY = {OK: 0, OVERLAP: 1, DUPLICATE: 2, OVERFLOW: 3}
+
+
+# =========================================================
+# Sweep line
+# =========================================================
+def overlapping_pairs(spans):
+    """
+    Yields (i, j) for every pair of half-open spans that intersect.
+
+    spans: list of (start, end); empty spans never overlap.
+    One sort plus one sweep with a heap of open spans keyed by end,
+    so the cost is O(n log n + pairs reported).
+    """
+    order = sorted(
+        (i for i, (start, end) in enumerate(spans) if end > start),
+        key=lambda i: spans[i]
+    )
+
+    active = []
+    for i in order:
+        start, end = spans[i]
+
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+
+        for _, j in active:
+            yield j, i
+
+        heapq.heappush(active, (end, i))
+
+
+# =========================================================
+# Layout verification
+# =========================================================
+def verify_layout(regions, subs):
+    """
+    Checks every region and sub-region in one sweep each.
+
+    regions: list of (name, start, end)          end may be None
+    subs:    list of (name, parent, start, end)  end may be None,
+             parent is the index of the region in `regions`
+
+    Returns (region_status, sub_status, findings):
+      region_status / sub_status -> one status per input row
+      findings -> list of (status, name, other) tuples
+
+    Sub-regions are checked against each other across all regions
+    (OVERLAP, or DUPLICATE for identical placement) and against their
+    parent (OVERFLOW, by index: region names need not be unique);
+    rows without a size have no extent and are skipped. Regions may nest, so only partial overlaps between
+    regions are reported. A symbol listed under several parents is
+    swept once.
+    """
+    region_status = [OK] * len(regions)
+    sub_status = [OK] * len(subs)
+    findings = []
+
+    def flag(statuses, i, status):
+        if _SEVERITY[status] > _SEVERITY[statuses[i]]:
+            statuses[i] = status
+
+    # -------- Regions: partial overlaps only --------
+    region_spans = [(start, end or start) for _, start, end in regions]
+    for i, j in overlapping_pairs(region_spans):
+        (a_start, a_end), (b_start, b_end) = region_spans[i], region_spans[j]
+        nested = (a_start <= b_start and b_end <= a_end) or \
+                 (b_start <= a_start and a_end <= b_end)
+        if nested and region_spans[i] != region_spans[j]:
+            continue
+
+        status = DUPLICATE if region_spans[i] == region_spans[j] else OVERLAP
+        flag(region_status, i, status)
+        flag(region_status, j, status)
+        findings.append((status, regions[i][0], regions[j][0]))
+
+    # -------- Sub-regions: escape from parent --------
+    for i, (name, parent, start, end) in enumerate(subs):
+        parent_name, parent_start, parent_end = regions[parent]
+        if parent_end and end and end > start:
+            if start < parent_start or end > parent_end:
+                flag(sub_status, i, OVERFLOW)
+                findings.append((OVERFLOW, name, parent_name))
+
+    # -------- Sub-regions: overlaps across all regions --------
+    rows_by_name = {}
+    for i, (name, _, _, _) in enumerate(subs):
+        rows_by_name.setdefault(name, []).append(i)
+
+    names = list(rows_by_name)
+    sub_spans = []
+    for name in names:
+        _, _, start, end = subs[rows_by_name[name][0]]
+        sub_spans.append((start, end or start))
+
+    for i, j in overlapping_pairs(sub_spans):
+        status = DUPLICATE if sub_spans[i] == sub_spans[j] else OVERLAP
+        for k in rows_by_name[names[i]] + rows_by_name[names[j]]:
+            flag(sub_status, k, status)
+        findings.append((status, names[i], names[j]))
+
+    return region_status, sub_status, findings
+
+
+def verify_memory_layout(layout):
+    """
+    Runs verify_layout over a model.MemoryLayout and stores the
+    statuses in it. Returns the findings.
+    """
+    regions = [
+        (name, start, start + size if size else None)
+        for name, start, size, _, _ in layout.regions()
+    ]
+    subs = [
+        (name, parent, start, start + size if size else None)
+        for parent, (_, name, start, size, _, _) in zip(layout.sub_parent, layout.subs())
+    ]
+
+    region_status, sub_status, findings = verify_layout(regions, subs)
+    layout.set_status(region_status, sub_status)
+    return findings
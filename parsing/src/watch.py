@@ -0,0 +1,150 @@
+import hashlib
+import os
+import time
+
+from exporters import PER_TABLE_FORMATS, export_tables, format_from_path, output_files
+from loader import parse_map
+from mapio import open_map
+from memories import memory_usage, merge_memories, read_linker_memories, read_map_memories
+from profiling import stage
+from rows import report_tables
+
+# Map written by the top-level makefile
+DEFAULT_MAP_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "build", "output.map"
+)
+DEFAULT_INTERVAL = 0.5
+
+
+# =========================================================
+# Warm re-reporting
+# =========================================================
+class MapWatcher:
+    """
+    Keeps the parsed layout of one map and the digest of every report
+    table between builds.
+
+    changed() is a stat while the map's size and mtime stay put. A new
+    size / mtime must hold for two polls in a row before the map is
+    hashed (a build still writing it would otherwise be read
+    half-written, or truncated under the mapping), and only a new
+    content hash counts as a change, so a touched but identical map is
+    not re-parsed. refresh() re-parses and rewrites only the tables
+    whose rows changed (every table for single-file formats, as soon
+    as one changed).
+    """
+
+    def __init__(self, map_file, output, fmt=None, assign_by="prefix", linker_script=None):
+        self.map_file = map_file
+        self.output = output
+        self.fmt = fmt or format_from_path(output)
+        self.assign_by = assign_by
+        self.script_memories = read_linker_memories(linker_script) if linker_script else []
+
+        self.stamp = None
+        self.pending = None
+        self.digest = None
+        self.layout = None
+        self.table_digests = {}
+
+    def changed(self):
+        """
+        True when the map has new, settled content. A map that cannot
+        be stat-ed yet (not built) is unchanged; other OSErrors, e.g.
+        while hashing, are raised.
+        """
+        try:
+            st = os.stat(self.map_file)
+        except FileNotFoundError:
+            return False
+
+        stamp = (st.st_size, st.st_mtime_ns)
+        if stamp == self.stamp:
+            return False
+        if stamp != self.pending:
+            # Still being written, maybe: look again on the next poll
+            self.pending = stamp
+            return False
+        self.stamp = stamp
+
+        with open_map(self.map_file) as data:
+            digest = hashlib.sha256(data).hexdigest()
+        if digest == self.digest:
+            return False
+
+        self.digest = digest
+        return True
+
+    def retry(self):
+        """
+        Forgets the last map seen, so the next settled poll re-reads it
+        """
+        self.stamp = self.pending = self.digest = None
+
+    def refresh(self):
+        """
+        Re-parses the map and rewrites the affected outputs.
+        Returns {title: row count} of the tables written.
+        """
+        with stage("parse"):
+            self.layout = parse_map(self.map_file, self.assign_by)
+
+        memories = merge_memories(self.script_memories, read_map_memories(self.map_file))
+        usage = memory_usage(self.layout, memories) if memories else None
+
+        tables = []
+        digests = {}
+        for title, rows, columns in report_tables(self.layout, usage):
+            rows = list(rows)
+            tables.append((title, rows, columns))
+            digests[title] = _rows_digest(rows)
+
+        changed = [table for table in tables if self.table_digests.get(table[0]) != digests[table[0]]]
+        if changed and self.fmt not in PER_TABLE_FORMATS:
+            changed = tables
+
+        counts = {}
+        if changed:
+            with stage("export"):
+                counts = export_tables(self.output, changed, self.fmt)
+        self.table_digests = digests
+        return counts
+
+
+def _rows_digest(rows):
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(repr(tuple(row.values())).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def watch(watcher, interval=DEFAULT_INTERVAL, report=print):
+    """
+    Polls until interrupted; every content change is re-reported.
+    A map that fails to parse (e.g. still being written) is retried
+    on its next change; an OSError (map or output locked by another
+    tool, map replaced while read) on the next poll. An error is
+    reported once until a different one, or a success, follows.
+    """
+    error = None
+    while True:
+        try:
+            if watcher.changed():
+                started = time.perf_counter()
+                counts = watcher.refresh()
+                elapsed = time.perf_counter() - started
+                files = ", ".join(output_files(watcher.output, counts, watcher.fmt)) if counts else watcher.output
+                written = ", ".join(f"{title} ({count})" for title, count in counts.items())
+                report(f"Updated {files} in {elapsed:.2f}s: {written or 'no changes'}")
+                error = None
+        except (OSError, ValueError) as e:
+            if isinstance(e, OSError):
+                watcher.retry()
+            else:
+                watcher.digest = None
+            message = f"{watcher.map_file}: {e}"
+            if message != error:
+                report(message)
+                error = message
+        time.sleep(interval)
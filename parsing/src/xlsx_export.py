@@ -0,0 +1,97 @@
+import os
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import CellIsRule
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from model import STATUSES
+from validator import OK, RANGE_STATUSES
+
+HEADER_FILL = PatternFill(start_color="BDD7EE", end_color="BDD7EE", fill_type="solid")
+OK_FILL = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
+ERROR_FILL = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+
+# Every non-OK status the verifier (model.STATUSES) or the validator
+# (RANGE_STATUSES) can write is highlighted
+ERROR_STATUSES = tuple(
+    status for status in dict.fromkeys(STATUSES + RANGE_STATUSES) if status != OK
+)
+COLUMN_WIDTH = 22
+
+
+# =========================================================
+# Write-only sheet
+# =========================================================
+def write_sheet(workbook, title, rows, columns=None):
+    """
+    Streams dict rows into a write-only sheet and returns the row count.
+
+    Rows go straight to disk, so memory does not grow with the sheet.
+    Styling is declared once per sheet: header cells, column widths and
+    conditional-formatting rules on the Status column.
+    """
+    ws = workbook.create_sheet(title)
+
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is not None:
+        columns = list(first)
+    if not columns:
+        return 0
+
+    for col in range(1, len(columns) + 1):
+        ws.column_dimensions[get_column_letter(col)].width = COLUMN_WIDTH
+
+    header = []
+    for name in columns:
+        cell = WriteOnlyCell(ws, value=name)
+        cell.font = Font(bold=True)
+        cell.fill = HEADER_FILL
+        header.append(cell)
+    ws.append(header)
+
+    count = 0
+    if first is not None:
+        ws.append(list(first.values()))
+        count = 1
+        for row in rows:
+            ws.append([row.get(name) for name in columns])
+            count += 1
+
+    if "Status" in columns and count:
+        letter = get_column_letter(columns.index("Status") + 1)
+        cells = f"{letter}2:{letter}{count + 1}"
+
+        ws.conditional_formatting.add(
+            cells, CellIsRule(operator="equal", formula=[f'"{OK}"'], fill=OK_FILL)
+        )
+        for status in ERROR_STATUSES:
+            ws.conditional_formatting.add(
+                cells, CellIsRule(operator="equal", formula=[f'"{status}"'], fill=ERROR_FILL)
+            )
+
+    return count
+
+
+# =========================================================
+# Workbook
+# =========================================================
+def export_workbook(output_file, sheets):
+    """
+    sheets: iterable of (title, rows) or (title, rows, columns).
+    Returns {title: row count}.
+    """
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+
+    workbook = Workbook(write_only=True)
+    counts = {}
+
+    for sheet in sheets:
+        title, rows = sheet[0], sheet[1]
+        columns = sheet[2] if len(sheet) > 2 else None
+        counts[title] = write_sheet(workbook, title, rows, columns)
+
+    workbook.save(output_file)
+    return counts
@@ -0,0 +1,44 @@
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+
+def build_elf(symbols=(("main", 0x1000, 0x20), ("helper", 0x1020, 0x10))):
+    """
+    A minimal little-endian ELF64 image: .text at 0x1000 with FUNC
+    symbols (name, address, size), plus .symtab / .strtab / .shstrtab
+    """
+    shstrtab = b"\0.text\0.symtab\0.strtab\0.shstrtab\0"
+    strtab = b"\0"
+    symtab = bytes(24)  # the null symbol
+    for name, value, size in symbols:
+        # st_name, st_info (GLOBAL FUNC), st_other, st_shndx (.text), st_value, st_size
+        symtab += struct.pack("<IBBHQQ", len(strtab), 0x12, 0, 1, value, size)
+        strtab += name.encode() + b"\0"
+
+    text = bytes(0x40)
+    body = text + symtab + strtab + shstrtab
+    text_off = 64
+    symtab_off = text_off + len(text)
+    strtab_off = symtab_off + len(symtab)
+    shstrtab_off = strtab_off + len(strtab)
+    shoff = 64 + len(body)
+
+    def section(name, sh_type, flags, addr, offset, size, link=0, entsize=0):
+        return struct.pack("<IIQQQQIIQQ", name, sh_type, flags, addr, offset, size, link, 0, 1, entsize)
+
+    sections = (
+        bytes(64)
+        + section(1, 1, 0x6, 0x1000, text_off, len(text))
+        + section(7, 2, 0, 0, symtab_off, len(symtab), link=3, entsize=24)
+        + section(15, 3, 0, 0, strtab_off, len(strtab))
+        + section(23, 3, 0, 0, shstrtab_off, len(shstrtab))
+    )
+
+    ident = b"\x7fELF" + bytes([2, 1, 1]) + bytes(9)
+    header = ident + struct.pack(
+        "<HHIQQQIHHHHHH", 2, 62, 1, 0x1000, 0, shoff, 0, 64, 0, 0, 64, 5, 4
+    )
+    return header + body + sections
@@ -0,0 +1,45 @@
+import os
+import shutil
+
+from conftest import build_elf
+
+import batch
+from batch import run_batch
+
+APP_MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "input", "app.map")
+
+
+def test_broken_inputs_are_reported_per_map(tmp_path):
+    good = tmp_path / "app.map"
+    shutil.copy(APP_MAP, good)
+    elf = tmp_path / "good.elf"
+    elf.write_bytes(build_elf())
+    truncated = tmp_path / "truncated.elf"
+    truncated.write_bytes(build_elf()[:200])
+    unknown = tmp_path / "notes.map"
+    unknown.write_text("not a linker map\n")
+    missing = tmp_path / "missing.map"
+
+    paths = [str(p) for p in (good, truncated, elf, unknown, missing)]
+    map_rows, usage_rows = run_batch(paths, workers=1, use_cache=False)
+
+    rows = {row["Map"]: row for row in map_rows}
+    assert [row["Map"] for row in map_rows] == [os.path.basename(p) for p in paths]
+    assert rows["app.map"]["Error"] == "" and rows["app.map"]["Format"] == "hitech"
+    assert rows["good.elf"]["Error"] == "" and rows["good.elf"]["Sub_Sections"] == 2
+    assert "truncated ELF" in rows["truncated.elf"]["Error"]
+    assert rows["notes.map"]["Error"]
+    assert rows["missing.map"]["Error"]
+    assert {row["Map"] for row in usage_rows} == {"app.map", "good.elf"}
+
+
+def test_unexpected_parser_error_is_reported(monkeypatch):
+    def broken(*args):
+        raise RuntimeError("parser bug")
+
+    monkeypatch.setattr(batch, "cached_parse", broken)
+    batch.init_worker(None, False, "prefix")
+
+    row, usage = batch.summarize_map("any.map")
+    assert row["Error"] == "RuntimeError: parser bug"
+    assert usage == []
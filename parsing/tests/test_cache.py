@@ -0,0 +1,77 @@
+import os
+import shutil
+
+import cache as cache_module
+from cache import ParseCache, cached_parse
+
+APP_MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "input", "app.map")
+
+
+def make_cache(tmp_path, **kwargs):
+    config = tmp_path / "sections.json"
+    if not config.exists():
+        config.write_text('{"sections": []}')
+    return ParseCache(str(tmp_path / "cache"), config_file=str(config), **kwargs)
+
+
+def test_cached_parse_round_trip(tmp_path, monkeypatch):
+    map_file = str(tmp_path / "app.map")
+    shutil.copy(APP_MAP, map_file)
+    cache = make_cache(tmp_path)
+
+    first = cached_parse(map_file, cache=cache)
+
+    def no_parse(*args):
+        raise AssertionError("parsed again")
+
+    monkeypatch.setattr(cache_module, "parse_map", no_parse)
+    second = cached_parse(map_file, cache=cache)
+
+    assert second is not first
+    assert list(second.regions()) == list(first.regions())
+    assert list(second.subs()) == list(first.subs())
+
+
+def test_key_follows_content_mode_and_config(tmp_path):
+    map_file = tmp_path / "app.map"
+    shutil.copy(APP_MAP, map_file)
+    cache = make_cache(tmp_path)
+
+    key = cache.key(str(map_file))
+    assert cache.key(str(map_file)) == key
+    assert cache.key(str(map_file), "address") != key
+
+    (tmp_path / "sections.json").write_text('{"sections": [{"ram_name": "X"}]}')
+    assert cache.key(str(map_file)) != key
+
+    config_key = cache.key(str(map_file))
+    with open(map_file, "a") as f:
+        f.write("\n")
+    assert cache.key(str(map_file)) != config_key
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = make_cache(tmp_path)
+    with open(os.path.join(cache.directory, "bad.layout"), "wb") as f:
+        f.write(b"garbage")
+
+    assert cache.get("bad") is None
+    assert cache.get("missing") is None
+
+
+def test_eviction_keeps_recent_entries_within_budget(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=2500)
+    for name, age in (("old", 300), ("mid", 200), ("new", 100)):
+        path = os.path.join(cache.directory, name + ".layout")
+        with open(path, "wb") as f:
+            f.write(bytes(1000))
+        stamp = os.stat(path).st_mtime - age
+        os.utime(path, (stamp, stamp))
+
+    cache.evict()
+
+    assert sorted(os.listdir(cache.directory)) == ["mid.layout", "new.layout"]
+
+    cache.max_age = 150
+    cache.evict()
+    assert os.listdir(cache.directory) == ["new.layout"]
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from cli import main
+
+APP_MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "input", "app.map")
+
+
+@pytest.mark.parametrize("argv", [
+    ["report", "{missing}", "{tmp}/out.csv", "--no-cache"],
+    ["diff", "{missing}", "{missing}", "{tmp}/diff.csv", "--no-cache"],
+    ["check", "{missing}", "--no-cache"],
+    ["sections", "{missing}", "{tmp}/sections.csv"],
+    ["tree", "{missing}", "{tmp}/tree.json", "--no-cache"],
+    ["detect", "{missing}"],
+])
+def test_missing_map_is_a_one_line_error(argv, tmp_path, capsys):
+    missing = str(tmp_path / "missing.map")
+    argv = [arg.format(missing=missing, tmp=tmp_path) for arg in argv]
+
+    assert main(argv) == 1
+    assert "No such file or directory" in capsys.readouterr().out
+
+
+def test_profile_no_memory_alone_does_not_profile(capsys):
+    assert main(["detect", APP_MAP, "--profile-no-memory"]) == 0
+    out = capsys.readouterr().out
+    assert main(["detect", APP_MAP, "--profile", "--profile-no-memory"]) == 0
+    profiled = capsys.readouterr().out
+
+    assert "Peak MB" not in out
+    assert "Peak MB" in profiled
+
+
+def test_unwritable_output_is_a_one_line_error(tmp_path, capsys):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+
+    assert main(["report", APP_MAP, str(blocker / "out.csv"), "--no-cache"]) == 1
+    out = capsys.readouterr().out
+    assert len(out.splitlines()) == 1 and "Traceback" not in out
+
+
+def test_per_table_outputs_are_reported_by_path(tmp_path, capsys):
+    output = tmp_path / "report.csv"
+
+    assert main(["report", APP_MAP, str(output), "--no-cache"]) == 0
+    first = capsys.readouterr().out.splitlines()[0]
+
+    written = first.split(": ", 1)[1].split(", ")
+    assert str(output) not in written
+    assert str(tmp_path / "report_Sub_Sections.csv") in written
+    assert all(os.path.exists(path) for path in written)
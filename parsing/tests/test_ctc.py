@@ -0,0 +1,56 @@
+from ctc import build_ctc_layout, parse_ctc
+from model import SymbolTable
+from scanner import collect_ctc_symbols
+
+CTC_MAP = b"""CTC LINKER MAP FILE
+
+| Name                | Address    |
+|---------------------|------------|
+| ram_a_START | 0x1000 |
+RAM_A_SIZE | 0x100
+| RAM_A_VAR1 | 0x1000 |
+RAM_A_VAR1_SIZE | 0x10
+| RAM_A_VAR2 | 0x1010 |
+| RAM_B_START | 0x2000 |
+| RAM_B_VAR | 0x2000 |
+RAM_B_VAR_SIZE | 0x8
+| RAM_A_VAR1 | 0x1020 |
+"""
+
+
+def test_collect_ctc_symbols():
+    symbols, sizes = collect_ctc_symbols(CTC_MAP)
+
+    # Names are upper-cased, the last value wins, map order is kept
+    assert list(symbols.items()) == [
+        ("RAM_A_START", 0x1000), ("RAM_A_VAR1", 0x1020), ("RAM_A_VAR2", 0x1010),
+        ("RAM_B_START", 0x2000), ("RAM_B_VAR", 0x2000),
+    ]
+    assert list(sizes.items()) == [("RAM_A_SIZE", 0x100), ("RAM_A_VAR1_SIZE", 0x10), ("RAM_B_VAR_SIZE", 0x8)]
+
+
+def test_parse_ctc(tmp_path):
+    map_file = tmp_path / "ctc.map"
+    map_file.write_bytes(CTC_MAP)
+
+    layout = parse_ctc(str(map_file))
+
+    assert layout.fmt == "ctc"
+    assert [region[:3] for region in layout.regions()] == [("RAM_A", 0x1000, 0x100), ("RAM_B", 0x2000, None)]
+    assert [sub[:4] for sub in layout.subs()] == [
+        ("RAM_A", "RAM_A_VAR1", 0x1020, 0x10),
+        ("RAM_A", "RAM_A_VAR2", 0x1010, None),
+        ("RAM_B", "RAM_B_VAR", 0x2000, 0x8),
+    ]
+
+
+def test_build_ctc_layout_verifies():
+    symbols, sizes = SymbolTable(), SymbolTable()
+    symbols["RAM_START"] = 0x1000
+    sizes["RAM_SIZE"] = 0x10
+    symbols["RAM_X"] = 0x1008
+    sizes["RAM_X_SIZE"] = 0x10  # runs past RAM
+
+    layout = build_ctc_layout(symbols, sizes)
+
+    assert [sub[5] for sub in layout.subs()] == ["OVERFLOW"]
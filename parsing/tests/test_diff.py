@@ -0,0 +1,67 @@
+from diff import diff_tables, merge_sorted, region_delta_rows, symbol_change_rows
+from model import MemoryLayout
+
+
+def build(subs, regions=(("RAM", 0x1000, 0x100),)):
+    layout = MemoryLayout()
+    ids = {name: layout.add_region(name, start, size) for name, start, size in regions}
+    for parent, name, start, size in subs:
+        layout.add_sub(ids[parent], name, start, size)
+    return layout
+
+
+def test_merge_sorted():
+    old = [("a",), ("c",), ("d",)]
+    new = [("b",), ("c",)]
+
+    assert list(merge_sorted(old, new)) == [
+        (("a",), None), (None, ("b",)), (("c",), ("c",)), (("d",), None),
+    ]
+
+
+def test_symbol_changes():
+    old = build([("RAM", "same", 0x1000, 0x10), ("RAM", "moved", 0x1010, 0x10),
+                 ("RAM", "grown", 0x1020, 0x10), ("RAM", "gone", 0x1030, 0x10)])
+    new = build([("RAM", "same", 0x1000, 0x10), ("RAM", "moved", 0x1040, 0x10),
+                 ("RAM", "grown", 0x1020, 0x18), ("RAM", "added", 0x1050, 0x8)])
+
+    rows = {row["Symbol"]: row for row in symbol_change_rows(old, new)}
+
+    assert {name: row["Change"] for name, row in rows.items()} == {
+        "added": "ADDED", "gone": "REMOVED", "grown": "RESIZED", "moved": "MOVED",
+    }
+    assert rows["grown"]["Size_Delta"] == "0x8"
+    assert rows["added"]["Size_Delta"] == "0x8" and rows["gone"]["Size_Delta"] == "-0x10"
+    # The side a symbol is missing from is empty, not "" or 0
+    assert (rows["added"]["Old_Parent"], rows["added"]["Old_Address"], rows["added"]["Old_Size"]) == (None, None, None)
+    assert (rows["gone"]["New_Parent"], rows["gone"]["New_Address"], rows["gone"]["New_Size"]) == (None, None, None)
+
+
+def test_unknown_sizes_have_no_delta():
+    old = build([("RAM", "x", 0x1000, None)])
+    new = build([("RAM", "x", 0x1000, 0x10)])
+
+    (row,) = symbol_change_rows(old, new)
+
+    assert (row["Change"], row["Old_Size"], row["New_Size"], row["Size_Delta"]) == ("RESIZED", None, "0x10", None)
+
+
+def test_region_deltas():
+    old = build([("RAM", "a", 0x1000, 0x10)], (("RAM", 0x1000, 0x100), ("NOSIZE", 0x8000, None)))
+    new = build([("RAM", "a", 0x1000, 0x30)], (("RAM", 0x1000, 0x100), ("NOSIZE", 0x8000, None),
+                                                ("NEW", 0x9000, 0x40)))
+
+    rows = {row["Section"]: row for row in region_delta_rows(old, new)}
+
+    assert rows["RAM"]["Usage_Delta"] == "0x20" and rows["RAM"]["Free_Space_Delta"] == "-0x20"
+    # A region new in this build counts as 0 in the old one (fully used: no subs)
+    assert (rows["NEW"]["Old_Total_Size"], rows["NEW"]["New_Usage"], rows["NEW"]["Usage_Delta"]) == ("0x0", "0x40", "0x40")
+    # Unknown sizes stay unknown
+    assert rows["NOSIZE"]["Old_Total_Size"] is None and rows["NOSIZE"]["Free_Space_Delta"] is None
+
+
+def test_diff_tables():
+    layout = build([("RAM", "a", 0x1000, 0x10)])
+    titles = [title for title, _, _ in diff_tables(layout, layout)]
+    assert titles == ["Region_Deltas", "Symbol_Changes"]
+    assert list(symbol_change_rows(layout, layout)) == []
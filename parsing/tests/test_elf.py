@@ -0,0 +1,40 @@
+import struct
+
+import pytest
+from conftest import build_elf
+
+from elf import ElfError, parse_elf
+
+
+def test_parse_elf():
+    layout = parse_elf(bytearray(build_elf()))
+
+    assert [name for name, *_ in layout.regions()] == [".text"]
+    assert [(name, start, size) for _, name, start, size, _, _ in layout.subs()] == [
+        ("main", 0x1000, 0x20), ("helper", 0x1020, 0x10),
+    ]
+
+
+@pytest.mark.parametrize("length", [8, 40, 64, 200, -64, -1])
+def test_truncated_elf(length):
+    data = build_elf()
+    with pytest.raises(ElfError, match="truncated ELF"):
+        parse_elf(bytearray(data[:length]))
+
+
+def test_symbol_table_past_end():
+    data = bytearray(build_elf())
+    shoff = struct.unpack_from("<Q", data, 0x28)[0]
+    # sh_size of .symtab (section 2)
+    struct.pack_into("<Q", data, shoff + 2 * 64 + 32, 1 << 20)
+
+    with pytest.raises(ElfError, match="symbol table"):
+        parse_elf(data)
+
+
+def test_truncated_elf_file(tmp_path):
+    path = tmp_path / "app.elf"
+    path.write_bytes(build_elf()[:-10])
+
+    with pytest.raises(ElfError):
+        parse_elf(str(path))
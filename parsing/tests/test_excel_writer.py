@@ -0,0 +1,36 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("openpyxl")
+
+from excel_writer import address_to_int, write_excel  # noqa: E402
+
+
+def test_address_to_int():
+    assert address_to_int(0x40) == 0x40
+    assert address_to_int("0x40") == 0x40
+    assert address_to_int(None) is None and address_to_int("N/A") is None
+    assert address_to_int(True) is None
+
+
+def test_empty_data_writes_an_empty_sheet(tmp_path):
+    output = str(tmp_path / "empty.xlsx")
+
+    write_excel([], output)
+
+    assert list(pd.read_excel(output).columns) == ["Size (Bytes)"]
+
+
+def test_sizes_use_inclusive_ends(tmp_path):
+    output = str(tmp_path / "sections.xlsx")
+
+    write_excel([
+        {"RAM Name": "A", "Start Address": "0x10", "End Address": "0x1f"},
+        {"RAM Name": "B", "Start Address": 0x20, "End Address": None},
+        {"RAM Name": "C", "Start Address": "0x30", "End Address": "0x2f"},
+    ], output)
+
+    df = pd.read_excel(output)
+    assert list(df["Start Address"]) == ["0x10", "0x20", "0x30"]
+    assert df["Size (Bytes)"][0] == 16
+    assert df["Size (Bytes)"][1:].isna().all()
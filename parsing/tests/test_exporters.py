@@ -0,0 +1,65 @@
+import csv
+import json
+import sqlite3
+
+import pytest
+
+from exporters import export_tables, format_from_path, output_files, table_path
+
+COLUMNS = ["Name", "Start", "Size"]
+
+
+def tables():
+    return [
+        ("Regions", iter([{"Name": "RAM", "Start": "0x1000", "Size": None}]), COLUMNS),
+        ("Empty", iter([]), COLUMNS),
+    ]
+
+
+def test_format_and_paths():
+    assert format_from_path("out/report.CSV") == "csv"
+    assert format_from_path("report.unknown") == "xlsx"
+    assert table_path("out/report.csv", "Sub_Sections", ".csv") == "out/report_Sub_Sections.csv"
+    assert table_path("out/report", "Sub_Sections", ".csv") == "out/report_Sub_Sections.csv"
+
+    assert output_files("r.csv", ["A", "B"]) == ["r_A.csv", "r_B.csv"]
+    assert output_files("r.out", ["A", "B"], "parquet") == ["r.out_A.parquet", "r.out_B.parquet"]
+    assert output_files("r.sqlite", ["A", "B"]) == ["r.sqlite"]
+
+
+def test_csv_writes_one_file_per_table(tmp_path):
+    output = str(tmp_path / "sub" / "report.csv")
+
+    assert export_tables(output, tables()) == {"Regions": 1, "Empty": 0}
+
+    with open(tmp_path / "sub" / "report_Regions.csv", newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [COLUMNS, ["RAM", "0x1000", ""]]
+    with open(tmp_path / "sub" / "report_Empty.csv", newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [COLUMNS]
+
+
+def test_jsonl_tags_rows_with_their_table(tmp_path):
+    output = tmp_path / "report.jsonl"
+
+    export_tables(str(output), tables())
+
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert rows == [{"table": "Regions", "Name": "RAM", "Start": "0x1000", "Size": None}]
+
+
+def test_sqlite_replaces_an_old_database(tmp_path):
+    output = str(tmp_path / "report.sqlite")
+    export_tables(output, tables())
+
+    assert export_tables(output, tables()) == {"Regions": 1, "Empty": 0}
+    db = sqlite3.connect(output)
+    try:
+        assert db.execute('SELECT * FROM "Regions"').fetchall() == [("RAM", "0x1000", None)]
+        assert db.execute('SELECT COUNT(*) FROM "Empty"').fetchone() == (0,)
+    finally:
+        db.close()
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        export_tables("report.out", tables(), "xml")
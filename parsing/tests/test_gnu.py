@@ -0,0 +1,97 @@
+from gnu import parse_gnu
+
+GNU_MAP = """\
+Memory Configuration
+
+Name             Origin             Length             Attributes
+FLASH            0x0000000008000000 0x0000000000001000 xr
+RAM              0x0000000020000000 0x0000000000001000 rw
+*default*        0x0000000000000000 0xffffffffffffffff
+
+Linker script and memory map
+
+LOAD /tmp/main.o
+
+.text           0x0000000008000000       0x40
+ *(.text*)
+ .text          0x0000000008000000       0x1a /tmp/main.o
+                0x0000000008000000                main
+ *fill*         0x000000000800001a        0x2
+ .text.a_very_long_function_name
+                0x000000000800001c       0x24 /tmp/util.o
+                0x000000000800001c                PROVIDE (helper = .)
+
+.eh_frame       0x0000000008000040       0x10
+ .eh_frame      0x0000000008000040       0x10 /tmp/main.o
+
+.eh_frame       0x0000000008000050        0x8
+ .eh_frame      0x0000000008000050        0x8 /tmp/util.o
+
+.comment        0x0000000000000000       0x20
+ .comment       0x0000000000000000       0x20 /tmp/main.o
+
+.data           0x0000000020000000        0x4 load address 0x0000000008000058
+                0x0000000020000000                _sdata = .
+ .data          0x0000000020000000        0x4 /tmp/main.o
+ .data          0x0000000020000004        0x0 /tmp/util.o
+
+Cross Reference Table
+
+.text           0x0000000008000000       0x40
+"""
+
+
+def parse(tmp_path, text=GNU_MAP):
+    map_file = tmp_path / "app.map"
+    map_file.write_text(text)
+    return parse_gnu(str(map_file))
+
+
+def test_output_sections_in_a_memory_become_regions(tmp_path):
+    layout = parse(tmp_path)
+
+    # .comment sits in *default* only and the Cross Reference Table is not read
+    assert list(layout.regions()) == [
+        (".text", 0x08000000, 0x40, "FLASH", "OK"),
+        (".eh_frame", 0x08000040, 0x10, "FLASH", "OK"),
+        (".eh_frame", 0x08000050, 0x8, "FLASH", "OK"),
+        (".data", 0x20000000, 0x4, "RAM", "OK"),
+    ]
+
+
+def test_input_sections_and_symbols_become_subs(tmp_path):
+    layout = parse(tmp_path)
+
+    # *fill* and empty input sections are left out; a long input section
+    # name takes its address and size from the next line
+    assert list(layout.subs()) == [
+        (".text", ".text (main.o)", 0x08000000, 0x1a, None, "OK"),
+        (".text", "main", 0x08000000, None, None, "OK"),
+        (".text", ".text.a_very_long_function_name (util.o)", 0x0800001c, 0x24, None, "OK"),
+        (".text", "helper", 0x0800001c, None, None, "OK"),
+        (".eh_frame", ".eh_frame (main.o)", 0x08000040, 0x10, None, "OK"),
+        (".eh_frame", ".eh_frame (util.o)", 0x08000050, 0x8, None, "OK"),
+        (".data", "_sdata", 0x20000000, None, None, "OK"),
+        (".data", ".data (main.o)", 0x20000000, 0x4, None, "OK"),
+    ]
+
+
+def test_long_output_section_name(tmp_path):
+    text = GNU_MAP.replace(
+        ".data           0x0000000020000000        0x4 load address",
+        ".data.a_very_long_output_section_name\n"
+        "                0x0000000020000000        0x4 load address",
+    )
+
+    regions = list(parse(tmp_path, text).regions())
+
+    assert regions[-1] == (".data.a_very_long_output_section_name", 0x20000000, 0x4, "RAM", "OK")
+
+
+def test_without_memory_configuration(tmp_path):
+    text = GNU_MAP[GNU_MAP.index("Linker script"):]
+
+    names = [name for name, *_ in parse(tmp_path, text).regions()]
+
+    # Every output section at a non-zero address becomes a region
+    assert names == [".text", ".eh_frame", ".eh_frame", ".data"]
@@ -0,0 +1,56 @@
+import os
+
+from hitech import collect_hitech_layout, parse_hitech
+
+APP_MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "input", "app.map")
+
+
+def test_begin_end_blocks():
+    layout = parse_hitech(APP_MAP)
+
+    assert layout.fmt == "hitech"
+    # The _end address is the region's last byte
+    assert [region[:4] for region in layout.regions()] == [
+        ("ford_dlmu2_rstsafe_data_sections", 0xB0020040, 0xFFC0, "DLMU_2"),
+        ("ford_dlmu1_rstsafe_data_sections", 0xB0010040, 0xFFC0, "DLMU_1"),
+    ]
+    assert [sub[1:4] for sub in layout.subs()] == [
+        (".data.var1", 0xB0020100, 0x100),
+        (".data.var2", 0xB0020200, 0x80),
+        (".data.test1", 0xB0010100, 0x50),
+    ]
+    assert {sub[5] for sub in layout.subs()} == {"OK"}
+
+
+def test_inline_subs_are_packed_from_the_region_start():
+    layout = collect_hitech_layout(
+        b".bss_sections memory region -> DATA_DLMU_0\n"
+        b"0x0000000070000000 0x00000100\n"
+        b"  a 0x10 0x4\n"
+        b"  b 0x20 0x8\n"
+        b"\n"
+        b".next memory region -> DATA_DLMU_1\n"
+        b"0x0000000070001000\n"
+    )
+
+    assert [region[:4] for region in layout.regions()] == [
+        ("bss_sections", 0x70000000, 0x100, "DLMU_0"),
+        ("next", 0x70001000, None, "DLMU_1"),
+    ]
+    assert [sub[:5] for sub in layout.subs()] == [
+        ("bss_sections", "a", 0x70000000, 0x10, 0x4),
+        ("bss_sections", "b", 0x70000010, 0x20, 0x8),
+    ]
+
+
+def test_blocks_longer_than_the_old_look_ahead_window():
+    lines = [b".long_begin memory region -> DATA_DLMU_0", b"0x0000000070000000"]
+    for i in range(40):
+        lines += [b".data.v%d" % i, b"0x%016X     size 0x4" % (0x70000000 + 4 * i), b""]
+    lines += [b".long_end memory region -> DATA_DLMU_0", b"0x000000007000FFFF"]
+
+    layout = collect_hitech_layout(b"\n".join(lines) + b"\n")
+
+    assert layout.region_count == 1 and layout.region_size[0] == 0x10000
+    assert layout.sub_count == 40
+    assert list(layout.subs())[-1][1:4] == (".data.v39", 0x70000000 + 4 * 39, 0x4)
@@ -0,0 +1,60 @@
+import os
+
+from conftest import build_elf
+
+from mapio import detect_format, line_chunks, mapped, open_map
+
+APP_MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "input", "app.map")
+
+
+def test_open_map_empty_file(tmp_path):
+    empty = tmp_path / "empty.map"
+    empty.write_bytes(b"")
+
+    with open_map(str(empty)) as data:
+        assert data == b""
+
+
+def test_mapped_shares_a_buffer(tmp_path):
+    map_file = tmp_path / "a.map"
+    map_file.write_bytes(b"| A | 0x1 |\n")
+
+    with open_map(str(map_file)) as data:
+        with mapped(data) as again:
+            assert again is data
+        assert data[:3] == b"| A"
+
+
+def test_line_chunks_end_on_line_boundaries():
+    data = b"".join(b"line %d\n" % i for i in range(100))
+
+    ranges = line_chunks(data, 4, min_size=1)
+
+    assert len(ranges) == 4
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start and data[end - 1:end] == b"\n"
+
+
+def test_line_chunks_keeps_small_buffers_whole():
+    assert line_chunks(b"a\nb\n", 8) == [(0, 4)]
+    assert line_chunks(b"", 8) == []
+
+
+def test_detect_format(tmp_path):
+    ctc = tmp_path / "ctc.map"
+    ctc.write_bytes(b"CTC LINKER MAP FILE\n| RAM_START | 0x1000 |\n")
+    gnu = tmp_path / "gnu.map"
+    gnu.write_bytes(b"Memory Configuration\n\nLinker script and memory map\n")
+    both = tmp_path / "both.map"
+    both.write_bytes(b"| 0x1000 | memory region -> RAM\n")
+    elf = tmp_path / "app.elf"
+    elf.write_bytes(build_elf())
+
+    assert detect_format(APP_MAP) == "hitech"
+    assert detect_format(str(ctc)) == "ctc"
+    assert detect_format(str(gnu)) == "unknown"
+    assert detect_format(str(gnu), ("hitech", "ctc", "gnu")) == "gnu"
+    assert detect_format(str(both)) == "hitech"
+    assert detect_format(str(elf)) == "unknown"
+    assert detect_format(str(elf), ("hitech", "ctc", "elf")) == "elf"
@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from loader import parse_map
+from memories import memory_usage, merge_memories, parse_length, read_linker_memories, read_map_memories
+from model import MemoryLayout
+
+LINKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "linker", "linker.ld")
+
+NESTED_CTC_MAP = """CTC LINKER MAP FILE
+
+| Name                                    | Address            |
+|-----------------------------------------|--------------------|
+| RAM_A_START | 0x1000 |
+RAM_A_SIZE | 0x1000
+| RAM_A_B_START | 0x1800 |
+RAM_A_B_SIZE | 0x400
+| RAM_A_B_X | 0x1800 |
+RAM_A_B_X_SIZE | 0x100
+"""
+
+GNU_MEMORY_CONFIGURATION = """
+Memory Configuration
+
+Name             Origin             Length             Attributes
+FLASH            0x0000000008000000 0x0000000000040000 xr
+RAM              0x0000000020000000 0x0000000000010000 rw
+*default*        0x0000000000000000 0xffffffffffffffff
+
+Linker script and memory map
+"""
+
+
+@pytest.mark.parametrize("text, value", [
+    ("256K", 256 * 1024),
+    ("0x08000000", 0x08000000),
+    ("1M", 1 << 20),
+    ("010", 8),
+    ("64K - 0x100", 64 * 1024 - 0x100),
+])
+def test_parse_length(text, value):
+    assert parse_length(text) == value
+
+
+def test_parse_length_rejects_other_expressions():
+    with pytest.raises(ValueError):
+        parse_length("ORIGIN(RAM) + 4")
+
+
+def test_read_linker_memories():
+    assert read_linker_memories(LINKER_SCRIPT) == [
+        ("FLASH", 0x08000000, 256 * 1024),
+        ("RAM", 0x20000000, 64 * 1024),
+    ]
+
+
+def test_read_map_memories_skips_default(tmp_path):
+    map_file = tmp_path / "output.map"
+    map_file.write_text(GNU_MEMORY_CONFIGURATION)
+
+    assert read_map_memories(str(map_file)) == [
+        ("FLASH", 0x08000000, 0x40000),
+        ("RAM", 0x20000000, 0x10000),
+    ]
+
+
+def test_merge_prefers_later_sources():
+    merged = merge_memories([("RAM", 0, 0x100), ("FLASH", 0x8000, 0x100)], [("RAM", 0, 0x200)])
+    assert merged == [("RAM", 0, 0x200), ("FLASH", 0x8000, 0x100)]
+
+
+def test_usage_clips_at_memory_end_and_counts_unsized_regions():
+    layout = MemoryLayout()
+    ram = layout.add_region("RAM_DATA", 0x1000, 0x100)
+    layout.add_sub(ram, "a", 0x1000, 0x10)
+    layout.add_sub(ram, "b", 0x10F8, 0x10)  # 8 bytes past the memory end
+    layout.add_sub(ram, "c", 0x1010)        # no size: counted, not summed
+    layout.add_sub(ram, "outside", 0x9000, 0x10)
+    layout.add_region("FLASH_CODE", 0x8000, 0x40)
+
+    usage = memory_usage(layout, [("RAM", 0x1000, 0x100), ("FLASH", 0x8000, 0x100)])
+
+    assert usage == [("RAM", 0x1000, 0x100, 0x18, 3), ("FLASH", 0x8000, 0x100, 0x40, 0)]
+
+
+def test_nested_regions_count_a_symbol_once(tmp_path):
+    map_file = tmp_path / "nested.map"
+    map_file.write_text(NESTED_CTC_MAP)
+    layout = parse_map(str(map_file))
+
+    # Prefix mode lists RAM_A_B_X under both RAM_A and RAM_A_B
+    assert [parent for parent, *_ in layout.subs()] == ["RAM_A", "RAM_A_B"]
+    assert memory_usage(layout, [("RAM", 0x1000, 0x2000)]) == [("RAM", 0x1000, 0x2000, 0x100, 1)]
@@ -0,0 +1,43 @@
+from metrics import region_metrics, sub_metrics
+from model import MemoryLayout
+
+
+def make_layout():
+    layout = MemoryLayout()
+    ram = layout.add_region("RAM", 0x1000, 0x100)
+    full = layout.add_region("FULL", 0x2000, 0x40)  # no sized subs: fully used
+    layout.add_region("UNKNOWN", 0x3000)
+    layout.add_sub(ram, "b", 0x1040, 0x20)
+    layout.add_sub(ram, "a", 0x1008, 0x10)  # map order is not address order
+    layout.add_sub(ram, "c", 0x1060)         # no size
+    layout.add_sub(ram, "d", 0x1070, 0x8)
+    layout.add_sub(full, "e", 0x2000)
+    return layout
+
+
+def test_region_metrics():
+    metrics = region_metrics(make_layout())
+
+    assert metrics["size"] == [0x100, 0x40, None]
+    assert metrics["end"] == [0x1100, 0x2040, None]
+    assert metrics["usage"] == [0x38, 0x40, None]
+    assert metrics["free"] == [0xC8, 0, None]
+    assert metrics["utilization"] == [21.88, 100.0, None]
+
+
+def test_overfull_region_has_negative_free():
+    layout = MemoryLayout()
+    ram = layout.add_region("RAM", 0, 0x10)
+    layout.add_sub(ram, "big", 0, 0x20)
+
+    assert region_metrics(layout)["free"] == [-0x10]
+
+
+def test_sub_metrics_padding_by_address():
+    metrics = sub_metrics(make_layout())
+
+    assert metrics["size"] == [0x20, 0x10, None, 0x8, None]
+    assert metrics["end"] == [0x1060, 0x1018, None, 0x1078, None]
+    # a: 8 bytes after the region start; b: after a; c: right after b;
+    # d: after the unsized c, which counts as a point
+    assert metrics["padding"] == [0x28, 0x8, 0, 0x10, 0]
@@ -0,0 +1,61 @@
+import pytest
+
+from model import MISSING, MemoryLayout, Names, SymbolTable, dump_layout, load_layout
+
+
+def make_layout():
+    layout = MemoryLayout("hitech")
+    ram = layout.add_region("RAM", 0x1000, 0x100, tag="DLMU_2")
+    flash = layout.add_region("FLASH", 0x8000)
+    layout.add_sub(ram, "a", 0x1000, 0x10, 0x4)
+    layout.add_sub(flash, "main", 0x8000)
+    layout.add_sub(ram, "a", 0x1010, 0x8)
+    layout.set_status(["OK", "OVERLAP"], ["OK", "OK", "DUPLICATE"])
+    return layout
+
+
+def test_names_are_interned_once():
+    names = Names()
+    assert [names.intern(name) for name in ("a", "b", "a")] == [0, 1, 0]
+    assert len(names) == 2 and names[1] == "b"
+
+
+def test_symbol_table_last_value_wins_in_map_order():
+    table = SymbolTable()
+    table["B"] = 2
+    table["A"] = 1
+    table["B"] = 3
+
+    assert list(table.items()) == [("B", 3), ("A", 1)]
+    assert table["B"] == 3 and table.get("C") is None and "A" in table and len(table) == 2
+
+
+def test_layout_rows_use_none_for_missing_values():
+    layout = make_layout()
+
+    assert list(layout.regions()) == [
+        ("RAM", 0x1000, 0x100, "DLMU_2", "OK"),
+        ("FLASH", 0x8000, None, None, "OVERLAP"),
+    ]
+    assert list(layout.subs()) == [
+        ("RAM", "a", 0x1000, 0x10, 0x4, "OK"),
+        ("FLASH", "main", 0x8000, None, None, "OK"),
+        ("RAM", "a", 0x1010, 0x8, None, "DUPLICATE"),
+    ]
+    assert layout.sub_size[1] == MISSING
+
+
+@pytest.mark.parametrize("layout", [make_layout(), MemoryLayout()])
+def test_dump_load_round_trip(layout):
+    loaded = load_layout(dump_layout(layout))
+
+    assert loaded.fmt == layout.fmt
+    assert loaded.names.names == layout.names.names
+    assert list(loaded.regions()) == list(layout.regions())
+    assert list(loaded.subs()) == list(layout.subs())
+    assert loaded.names.ids == layout.names.ids
+
+
+def test_load_rejects_other_data():
+    with pytest.raises(ValueError):
+        load_layout(b"not a layout")
@@ -0,0 +1,39 @@
+from scanner import collect_ctc_symbols, merge_tables, read_ctc_symbols, read_ctc_symbols_parallel
+
+
+def write_map(path, count=300):
+    lines = ["CTC LINKER MAP FILE", "| RAM_START | 0x1000 |", "RAM_SIZE | 0x10000"]
+    for i in range(count):
+        lines.append(f"| RAM_VAR{i % 250} | {0x1000 + 4 * i:#x} |")
+        lines.append(f"RAM_VAR{i % 250}_SIZE | 0x4")
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def test_merge_tables_keeps_first_appearance_and_last_value():
+    merged = merge_tables([
+        (["A", "B"], [1, 2]),
+        (["C", "A"], [3, 4]),
+    ])
+
+    assert list(merged.items()) == [("A", 4), ("B", 2), ("C", 3)]
+    assert len(merge_tables([])) == 0
+
+
+def test_parallel_scan_matches_a_single_pass(tmp_path):
+    map_file = write_map(tmp_path / "ctc.map")
+    with open(map_file, "rb") as f:
+        symbols, sizes = collect_ctc_symbols(f.read())
+
+    parallel_symbols, parallel_sizes = read_ctc_symbols_parallel(map_file, workers=3, min_chunk=256)
+
+    assert list(parallel_symbols.items()) == list(symbols.items())
+    assert list(parallel_sizes.items()) == list(sizes.items())
+
+
+def test_small_maps_stay_in_process(tmp_path):
+    map_file = write_map(tmp_path / "ctc.map", 10)
+
+    symbols, _ = read_ctc_symbols(map_file, workers=4)
+
+    assert symbols["RAM_VAR9"] == 0x1000 + 4 * 9
@@ -0,0 +1,50 @@
+import pytest
+
+from model import SymbolTable
+from region_index import (
+    build_interval_index, build_prefix_index, names_with_prefix, nested_symbols, region_at,
+)
+
+
+def table(**values):
+    result = SymbolTable()
+    for name, value in values.items():
+        result[name] = value
+    return result
+
+
+def test_names_with_prefix_keeps_original_order():
+    index = build_prefix_index(["RAM_B", "RAM_A_X", "ROM", "RAM_A"])
+
+    assert names_with_prefix(index, "RAM_A") == ["RAM_A_X", "RAM_A"]
+    assert names_with_prefix(index, "RAM") == ["RAM_B", "RAM_A_X", "RAM_A"]
+    assert names_with_prefix(index, "X") == []
+
+
+def test_interval_index_picks_the_innermost_region():
+    index = build_interval_index([
+        ("OUTER", 0x1000, 0x2000),
+        ("INNER", 0x1400, 0x1800),
+        ("EMPTY", 0x1500, 0x1500),
+        ("AFTER", 0x3000, 0x3100),
+    ])
+
+    assert region_at(index, 0x0FFF) is None
+    assert region_at(index, 0x1000) == "OUTER"
+    assert region_at(index, 0x1400) == "INNER"
+    assert region_at(index, 0x17FF) == "INNER"
+    assert region_at(index, 0x1800) == "OUTER"
+    assert region_at(index, 0x2800) is None
+    assert region_at(index, 0x30FF) == "AFTER"
+    assert region_at(index, 0x3100) is None
+
+
+def test_nested_symbols_by_prefix_and_by_address():
+    symbols = table(RAM_START=0x1000, RAM_A_START=0x1100, RAM_A_X=0x1100, RAM_Y=0x1200, FAR=0x1050)
+    sizes = table(RAM_SIZE=0x400, RAM_A_SIZE=0x80)
+
+    assert nested_symbols(symbols, sizes) == {"RAM": ["RAM_A_X", "RAM_Y"], "RAM_A": ["RAM_A_X"]}
+    assert nested_symbols(symbols, sizes, "address") == {"RAM": ["RAM_Y", "FAR"], "RAM_A": ["RAM_A_X"]}
+
+    with pytest.raises(ValueError):
+        nested_symbols(symbols, sizes, "name")
@@ -0,0 +1,83 @@
+import re
+
+from scanner import SIZE, SYMBOL, collect_ctc_symbols, read_ctc_symbols, scan_ctc
+
+# Lines the scanner must read exactly like the old per-line searches
+TRICKY_LINES = [
+    "| RAM_A_START | 0x1000 |",
+    "RAM_A_SIZE | 0x100",
+    "| RAM_A_START | 0x1000 | RAM_A_X | 0x1010 |",
+    "| 0x00000000 | 0x00000010 | 0x00000020 |",
+    "| FOO | 0x10 | 0x00000000 | 0x20 |",
+    "| BUF_SIZE | 0x40 |",
+    "| __SIZE | 0x8 |",
+    "| _SIZE | 0x8 |",
+    "A_SIZE | 0x1 | B_SIZE | 0x2",
+    "A_SIZE | 0x1 | 0x2",
+    "| FOO | 0x1 | BAR_SIZE | 0x2",
+    "X_SIZE_Y | 0x3",
+    "  lower_case | 0x4 |  and | 0x5",
+    "| no_address | here |",
+    "",
+    "| LAST | 0xABC |",
+]
+
+
+def baseline_symbols(text):
+    """
+    The CTC symbol pass as the original parser wrote it
+    """
+    symbols = {}
+    sizes = {}
+    for line in text.splitlines(True):
+        match = re.search(r'\|\s*([A-Za-z0-9_]+)\s*\|\s*(0x[0-9A-Fa-f]+)', line)
+        if match:
+            symbols[match.group(1).upper()] = int(match.group(2), 16)
+
+        size_match = re.search(r'([A-Za-z0-9_]+_SIZE)\s*\|\s*(0x[0-9A-Fa-f]+)', line)
+        if size_match:
+            sizes[size_match.group(1).upper()] = int(size_match.group(2), 16)
+    return symbols, sizes
+
+
+def test_first_pair_per_line_only():
+    records = list(scan_ctc(b"| RAM_A_START | 0x1000 | RAM_A_X | 0x1010 |\n"))
+    assert records == [(SYMBOL, "RAM_A_START", 0x1000)]
+
+
+def test_symbol_named_size_is_also_a_size():
+    records = list(scan_ctc(b"| BUF_SIZE | 0x40 |\n"))
+    assert records == [(SYMBOL, "BUF_SIZE", 0x40), (SIZE, "BUF_SIZE", 0x40)]
+
+
+def test_matches_baseline_line_by_line():
+    for line in TRICKY_LINES:
+        symbols, sizes = collect_ctc_symbols((line + "\n").encode("ascii"))
+        assert (dict(symbols.items()), dict(sizes.items())) == baseline_symbols(line), line
+
+
+def test_matches_baseline_on_a_whole_map():
+    text = "\n".join(TRICKY_LINES * 3)  # no trailing newline on the last line
+    symbols, sizes = collect_ctc_symbols(text.encode("ascii"))
+    base_symbols, base_sizes = baseline_symbols(text)
+
+    assert list(symbols.items()) == list(base_symbols.items())
+    assert list(sizes.items()) == list(base_sizes.items())
+
+
+def test_byte_range():
+    data = b"| A | 0x1 |\n| B | 0x2 |\n| C | 0x3 |\n"
+    start = data.index(b"| B")
+    end = data.index(b"| C")
+
+    assert [name for _, name, _ in scan_ctc(data, start, end)] == ["B"]
+
+
+def test_mapped_file_matches_baseline(tmp_path):
+    text = "\n".join(TRICKY_LINES) + "\n"
+    map_file = tmp_path / "tricky.map"
+    map_file.write_text(text)
+
+    symbols, sizes = read_ctc_symbols(str(map_file))
+
+    assert (dict(symbols.items()), dict(sizes.items())) == baseline_symbols(text)
@@ -0,0 +1,52 @@
+import json
+import os
+
+from sections import get_section_ranges, load_sections, section_matcher
+
+APP_MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "input", "app.map")
+
+
+def test_matcher_does_not_run_into_longer_names():
+    matcher = section_matcher(["DATA_DLMU_1", "DATA_DLMU_10"])
+
+    assert [m.group() for m in matcher.finditer(b"DATA_DLMU_10 DATA_DLMU_1 DATA_DLMU_1X")] == [
+        b"DATA_DLMU_10", b"DATA_DLMU_1",
+    ]
+
+
+def test_ranges_from_app_map():
+    ranges = get_section_ranges(APP_MAP, ["DATA_DLMU_2", "DATA_DLMU_1", "DATA_NONE"])
+
+    assert ranges == {
+        "DATA_DLMU_2": (0xB0020040, 0xB002FFFF),
+        "DATA_DLMU_1": (0xB0010040, 0xB001FFFF),
+        "DATA_NONE": (None, None),
+    }
+
+
+def test_prefix_name_and_later_matches(tmp_path):
+    map_file = tmp_path / "app.map"
+    map_file.write_text(
+        ".a_begin memory region -> DATA_DLMU_10\n0x100\n"
+        ".a_begin memory region -> XDATA_DLMU_1\n0x200\n"
+        ".b_begin memory region -> DATA_DLMU_1\n0x300\n"
+        ".c_begin memory region -> DATA_DLMU_1\n0x400\n"
+        ".c_end memory region -> DATA_DLMU_1\n0x4FF\n"
+        ".c_end memory region -> DATA_DLMU_1"
+    )
+
+    # Only whole names count, the last boundary wins and a name on the
+    # last line has no address after it
+    assert get_section_ranges(str(map_file), ["DATA_DLMU_1"]) == {"DATA_DLMU_1": (0x400, 0x4FF)}
+    assert get_section_ranges(str(map_file), []) == {}
+
+
+def test_load_sections(tmp_path):
+    config = tmp_path / "sections.json"
+    entries = [{"ram_section": "DLMU2", "ram_name": "DATA_DLMU_2"}]
+    config.write_text(json.dumps({"sections": entries}))
+    empty = tmp_path / "empty.json"
+    empty.write_text("{}")
+
+    assert load_sections(str(config)) == entries
+    assert load_sections(str(empty)) == []
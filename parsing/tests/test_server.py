@@ -0,0 +1,90 @@
+import json
+import os
+import shutil
+import threading
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+import server
+from server import BuildStore, make_server, query_range, query_symbol
+
+APP_MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "input", "app.map")
+
+
+def test_cold_parse_does_not_block_loaded_builds(monkeypatch, tmp_path):
+    slow_map = str(tmp_path / "slow.map")
+    shutil.copy(APP_MAP, slow_map)
+    parse = server.cached_parse
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_parse(map_file, assign_by, cache):
+        calls.append(map_file)
+        if map_file == slow_map:
+            started.set()
+            assert release.wait(10)
+        return parse(map_file, assign_by, None)
+
+    monkeypatch.setattr(server, "cached_parse", slow_parse)
+    store = BuildStore({"fast": APP_MAP, "slow": slow_map})
+    store.get("fast")
+
+    results = []
+    waiters = [threading.Thread(target=lambda: results.append(store.get("slow"))) for _ in range(2)]
+    waiters[0].start()
+    assert started.wait(10)
+    waiters[1].start()
+
+    # Answered while "slow" is still being parsed
+    assert query_symbol(store.get("fast"), 0xB0020150)["symbol"]["name"] == ".data.var1"
+    assert not store.status()["builds"][1]["loaded"]
+
+    release.set()
+    for waiter in waiters:
+        waiter.join(10)
+
+    assert len(results) == 2 and results[0] is results[1]
+    assert calls.count(slow_map) == 1
+    assert store.status()["builds"][1]["loaded"]
+
+
+def test_range_limit():
+    store = BuildStore({"app": APP_MAP})
+    build = store.get("app")
+
+    result = query_range(build, 0xB0020000, 0xB0030000, 1)
+    assert len(result["symbols"]) == 1 and result["truncated"]
+    assert not query_range(build, 0xB0020000, 0xB0030000)["truncated"]
+    for limit in (0, -5):
+        with pytest.raises(ValueError):
+            query_range(build, 0xB0020000, 0xB0030000, limit)
+
+
+def test_http_queries():
+    httpd = make_server(BuildStore({"app": APP_MAP}), "127.0.0.1", 0)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.start()
+
+    def get(path):
+        try:
+            with urlopen(f"http://127.0.0.1:{httpd.server_port}{path}") as response:
+                return response.status, json.load(response)
+        except HTTPError as e:
+            return e.code, json.load(e)
+
+    try:
+        status, body = get("/symbol?build=app&address=0xB0020150")
+        assert status == 200 and body["symbol"]["name"] == ".data.var1"
+
+        status, body = get("/range?build=app&start=0xB0020000&end=0xB0030000&limit=-5")
+        assert status == 400 and "limit" in body["error"]
+
+        assert get("/range?build=app&start=0xB0020000")[0] == 400
+        assert get("/usage?build=nope")[0] == 404
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join(10)
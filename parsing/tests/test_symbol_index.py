@@ -0,0 +1,79 @@
+from model import MemoryLayout
+from rows import lookup_rows
+from symbol_index import SymbolIndex, read_addresses
+
+
+def make_layout():
+    layout = MemoryLayout()
+    text = layout.add_region(".text", 0x1000, 0x100)
+    data = layout.add_region("RSTSAFE_DATA", 0x2000, 0x100)
+    layout.add_sub(text, "outer", 0x1000, 0x80)     # 0
+    layout.add_sub(text, "inner", 0x1010, 0x10)     # 1
+    layout.add_sub(text, "label", 0x1040)           # 2, no size
+    layout.add_sub(data, "var", 0x2000, 0x4)        # 3
+    return layout
+
+
+def test_point_queries():
+    index = SymbolIndex(make_layout())
+
+    assert index.sub_at(0x1000) == 0
+    assert index.sub_at(0x1015) == 1
+    assert index.sub_at(0x1020) == 0
+    assert index.sub_at(0x1080) is None
+    assert index.region_at(0x10FF) == 0
+    assert index.region_at(0x2000) == 1
+    assert index.region_at(0x3000) is None
+
+
+def test_lookup_many_keeps_input_order():
+    index = SymbolIndex(make_layout())
+    addresses = [0x2010, 0x1015, 0x1044, 0x0FFF, 0x1000, 0x1090]
+
+    assert index.lookup_many(addresses) == [
+        (3, False, 1),     # past var: nearest below, still in the region
+        (1, True, 0),      # innermost sized symbol
+        (2, True, 0),      # unsized label inside outer is the finer answer
+        (None, False, None),
+        (0, True, 0),
+        (2, False, 0),     # past outer: nearest start below
+    ]
+    assert index.lookup_many([]) == []
+
+
+def test_lookup_rows():
+    index = SymbolIndex(make_layout())
+
+    rows = list(lookup_rows(index, [0x1015, 0x2010, 0x10]))
+
+    assert rows[0] == {
+        "Address": "0x1015", "Symbol": "inner", "Offset": "0x5", "Size": "0x10",
+        "Parent_Section": ".text", "Match": "contains", "Region": ".text", "Reset_Safe": False,
+    }
+    assert rows[1]["Symbol"] == "var" and rows[1]["Match"] == "nearest"
+    assert rows[1]["Reset_Safe"] is True
+    assert rows[2] == {
+        "Address": "0x10", "Symbol": None, "Offset": None, "Size": None,
+        "Parent_Section": None, "Match": "none", "Region": None, "Reset_Safe": False,
+    }
+
+
+def test_subs_in():
+    index = SymbolIndex(make_layout())
+
+    assert index.subs_in(0x1020, 0x2001) == [0, 2, 3]
+    assert index.subs_in(0x1020, 0x2001, limit=2) == [0, 2]
+    assert index.subs_in(0x1000, 0x1011) == [0, 1]
+
+
+def test_read_addresses():
+    lines = [
+        "0x1000\n",
+        "  # comment 0x2000\n",
+        "\n",
+        "PC = 0X20AB in main\n",
+        "4096\n",
+        "no address here\n",
+    ]
+
+    assert read_addresses(lines) == [0x1000, 0x20AB, 4096]
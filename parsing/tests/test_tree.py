@@ -0,0 +1,44 @@
+from model import MemoryLayout
+from rows import hierarchical_rows
+from tree import SectionTree
+
+
+def make_layout():
+    layout = MemoryLayout()
+    ram = layout.add_region("RAM", 0x1000, 0x100)
+    flash = layout.add_region("FLASH", 0x8000, 0x40)
+    layout.add_sub(ram, "APP_DATA_A_x", 0x1000, 0x10)
+    layout.add_sub(flash, "main", 0x8000, 0x20)
+    layout.add_sub(ram, "APP_DATA_B_y", 0x1020, 0x8)
+    layout.add_sub(ram, "APP_DATA_A_z", 0x1040, 0x10)
+    return layout
+
+
+def test_children_keep_map_order():
+    tree = SectionTree(make_layout())
+
+    sections = [tree.name(tree.section_name[s]) for s in tree.sections_of(0)]
+    assert sections == ["APP_DATA_A", "APP_DATA_B"]
+    assert [tree.name(tree.sub_group[i]) for i in tree.subs_of(0)] == ["x", "z"]
+    assert list(tree.sections_of(0)) == [0, 2] and list(tree.sections_of(1)) == [1]
+
+
+def test_rollups():
+    tree = SectionTree(make_layout())
+
+    assert (tree.section_size[0], tree.section_count[0], tree.section_free(0)) == (0x20, 2, 0x30)
+    assert (tree.region_used[0], tree.region_sub_count[0], tree.region_free(0)) == (0x28, 3, 0xD8)
+    assert tree.region_free(1) == 0x20
+
+
+def test_sheet_rows():
+    rows = [tuple(row.values()) for row in hierarchical_rows(SectionTree(make_layout()))]
+
+    assert rows[:5] == [
+        ("_lc_gb_RAM", "", "", "0x1000"),
+        ("", "APP_DATA_A", "", "0x1000"),
+        ("", "APP_DATA_A", "x", "0x10"),
+        ("", "APP_DATA_A", "z", "0x10"),
+        ("", "APP_DATA_B", "", "0x1020"),
+    ]
+    assert rows[-1] == ("_lc_ge_FLASH", "", "", "0x8040")
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from model import MISSING, MemoryLayout
+from validator import (
+    RANGE_STATUSES, load_section_rules, validate_layout, validate_range, validate_ranges,
+    validate_sections,
+)
+
+
+def statuses(codes):
+    return [RANGE_STATUSES[code] for code in codes]
+
+
+@pytest.mark.parametrize("start, end, status", [
+    (0x40, 0x7F, "OK"),
+    (0x40, 0x40, "OK"),             # one byte: the end is inclusive
+    (0x40, 0x3F, "INVALID RANGE"),
+    (0x41, 0x80, "MISALIGNED"),
+    (0x41, 0x10, "INVALID RANGE"),  # invalid beats misaligned
+])
+def test_scalar_and_batch_agree(start, end, status):
+    assert validate_range(hex(start), hex(end)) == status
+    assert validate_sections({"X": (start, end)}, {}) == {"X": status}
+
+
+def test_scalar_missing_bound():
+    assert validate_range(None, "0x40") == "NOT FOUND"
+    assert validate_sections({"X": (0x40, None)}, {}) == {"X": "NOT FOUND"}
+
+
+def test_priority_follows_range_statuses():
+    bounds = (0x1000, 0x2000)
+    starts = [MISSING, 0x1001, 0x3001, 0x1001, 0x1040, 0x1080]
+    sizes = [0x10, 0, 0x10, 0x10, 0x100, 0x10]
+
+    # NOT FOUND > INVALID RANGE > OUT OF REGION > MISALIGNED > OVERLAP
+    assert statuses(validate_ranges(starts, sizes, 0x40, bounds)) == [
+        "NOT FOUND", "INVALID RANGE", "OUT OF REGION", "MISALIGNED", "OVERLAP", "OVERLAP",
+    ]
+
+
+def test_overlap_and_bounds():
+    starts = [0x1000, 0x1040, 0x1080, 0x1FC0, 0x1100]
+    sizes = [0x40, 0x40, 0x80, 0x80, None]
+
+    # Rows touching end to end do not overlap; a row without a size is a point
+    assert statuses(validate_ranges(starts, sizes, 0x40, (0x1000, 0x2000))) == [
+        "OK", "OK", "OK", "OUT OF REGION", "OK",
+    ]
+    assert statuses(validate_ranges([0x1000, 0x1001], [0x10, 0x10], None)) == ["OVERLAP", "OVERLAP"]
+
+
+def test_rules_apply_by_tag_then_name(tmp_path):
+    config = tmp_path / "sections.json"
+    config.write_text(json.dumps({"sections": [
+        {"ram_section": "DLMU2", "ram_name": "DATA_DLMU_2", "origin": "0x1000", "length": "0x100"},
+        {"ram_section": "RAM", "ram_name": "DATA_RAM", "alignment": "0x10"},
+    ]}))
+    rules = load_section_rules(str(config))
+
+    assert rules["DLMU_2"] == rules["DLMU2"] == (0x40, (0x1000, 0x1100))
+    assert rules["RAM"] == (0x10, None)
+
+    layout = MemoryLayout()
+    tagged = layout.add_region("sections", 0x1000, 0x100, tag="DLMU_2")
+    named = layout.add_region("RAM", 0x8000)
+    other = layout.add_region("OTHER", 0x9000)
+    layout.add_sub(tagged, "a", 0x1000, 0x40)
+    layout.add_sub(tagged, "b", 0x10C0, 0x80)
+    layout.add_sub(named, "c", 0x8010, 0x10)
+    layout.add_sub(other, "d", 0x9001, 0x10)
+
+    assert statuses(validate_layout(layout, rules)) == ["OK", "OUT OF REGION", "OK", "OK"]
@@ -0,0 +1,54 @@
+from model import MemoryLayout
+from verifier import overlapping_pairs, verify_layout, verify_memory_layout
+
+
+def test_overlapping_pairs():
+    spans = [(0, 10), (5, 15), (10, 20), (30, 30), (0, 40)]
+
+    pairs = {tuple(sorted(pair)) for pair in overlapping_pairs(spans)}
+    # Touching spans do not overlap, empty spans never do
+    assert pairs == {(0, 1), (0, 4), (1, 2), (1, 4), (2, 4)}
+
+
+def test_regions_may_nest_but_not_cross():
+    regions = [("RAM", 0, 0x100), ("RAM_A", 0, 0x40), ("CROSS", 0x80, 0x180), ("SAME", 0, 0x40)]
+
+    region_status, _, findings = verify_layout(regions, [])
+
+    assert region_status == ["OVERLAP", "DUPLICATE", "OVERLAP", "DUPLICATE"]
+    assert ("OVERLAP", "RAM", "CROSS") in findings
+
+
+def test_sub_overlaps_and_overflow():
+    regions = [("RAM", 0x1000, 0x1100)]
+    subs = [
+        ("a", 0, 0x1000, 0x1010),
+        ("b", 0, 0x1008, 0x1018),  # overlaps a
+        ("c", 0, 0x1020, 0x1030),
+        ("d", 0, 0x1020, 0x1030),  # same placement as c
+        ("e", 0, 0x10F0, 0x1110),  # runs past the region
+        ("f", 0, 0x2000, None),    # no size: not checked
+    ]
+
+    _, sub_status, _ = verify_layout(regions, subs)
+
+    assert sub_status == ["OVERLAP", "OVERLAP", "DUPLICATE", "DUPLICATE", "OVERFLOW", "OK"]
+
+
+def test_overflow_uses_the_parent_region_not_its_name():
+    # GNU ld maps can hold two output sections with the same name
+    layout = MemoryLayout("gnu")
+    first = layout.add_region(".eh_frame", 0x1000, 0x40)
+    second = layout.add_region(".eh_frame", 0x2000, 0x20)
+    layout.add_sub(first, ".eh_frame (a.o)", 0x1000, 0x30)
+    layout.add_sub(first, ".eh_frame (b.o)", 0x1030, 0x10)
+    layout.add_sub(second, ".eh_frame (c.o)", 0x2000, 0x20)
+
+    assert verify_memory_layout(layout) == []
+    assert [status for *_, status in layout.subs()] == ["OK", "OK", "OK"]
+
+    layout.add_sub(second, ".eh_frame (d.o)", 0x1040, 0x10)
+    findings = verify_memory_layout(layout)
+
+    assert findings == [("OVERFLOW", ".eh_frame (d.o)", ".eh_frame")]
+    assert [status for *_, status in layout.subs()] == ["OK", "OK", "OK", "OVERFLOW"]
@@ -0,0 +1,84 @@
+import os
+import shutil
+
+import pytest
+
+import watch as watch_module
+from watch import MapWatcher, watch
+
+APP_MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "input", "app.map")
+
+
+class Stop(Exception):
+    pass
+
+
+def run_polls(watcher, polls, monkeypatch, between=None):
+    """
+    Runs watch() for `polls` polls; between(n) runs after poll n
+    """
+    messages = []
+    done = []
+
+    def sleep(_):
+        done.append(None)
+        if between is not None:
+            between(len(done))
+        if len(done) >= polls:
+            raise Stop
+
+    monkeypatch.setattr(watch_module.time, "sleep", sleep)
+    with pytest.raises(Stop):
+        watch(watcher, 0, messages.append)
+    return messages
+
+
+def test_map_is_read_once_it_settles(tmp_path):
+    map_file = tmp_path / "output.map"
+    shutil.copy(APP_MAP, map_file)
+    watcher = MapWatcher(str(map_file), str(tmp_path / "report.csv"))
+
+    assert not watcher.changed()  # first sight: wait one poll
+    assert watcher.changed()
+    assert not watcher.changed()
+
+    os.utime(map_file, ns=(1, 1))  # touched, same content
+    assert not watcher.changed()
+    assert not watcher.changed()
+
+
+def test_os_errors_are_reported_and_retried(tmp_path, monkeypatch):
+    map_file = tmp_path / "output.map"
+    shutil.copy(APP_MAP, map_file)
+    watcher = MapWatcher(str(map_file), str(tmp_path / "report.csv"))
+
+    refresh = watcher.refresh
+    failures = []
+
+    def locked_refresh():
+        if len(failures) < 2:
+            failures.append(None)
+            raise PermissionError("report.csv is locked")
+        return refresh()
+
+    monkeypatch.setattr(watcher, "refresh", locked_refresh)
+    messages = run_polls(watcher, 8, monkeypatch)
+
+    # Reported once, then retried until it is written
+    assert messages[0].endswith("report.csv is locked")
+    assert len(messages) == 2 and messages[1].startswith("Updated")
+
+
+def test_parse_errors_wait_for_the_next_change(tmp_path, monkeypatch):
+    map_file = tmp_path / "output.map"
+    map_file.write_text("half written\n")
+    watcher = MapWatcher(str(map_file), str(tmp_path / "report.csv"))
+
+    def between(poll):
+        if poll == 4:
+            shutil.copy(APP_MAP, map_file)
+
+    messages = run_polls(watcher, 8, monkeypatch, between)
+
+    assert "Unknown MAP file format" in messages[0]
+    assert len(messages) == 2 and messages[1].startswith("Updated")
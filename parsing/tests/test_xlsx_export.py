@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import load_workbook  # noqa: E402
+
+from model import STATUSES  # noqa: E402
+from validator import RANGE_STATUSES  # noqa: E402
+from xlsx_export import ERROR_FILL, OK_FILL, export_workbook  # noqa: E402
+
+
+def test_every_status_is_highlighted(tmp_path):
+    statuses = list(dict.fromkeys(STATUSES + RANGE_STATUSES))
+    output = str(tmp_path / "report.xlsx")
+    export_workbook(output, [
+        ("Section_Validation", [{"RAM_Name": str(i), "Status": s} for i, s in enumerate(statuses)]),
+    ])
+
+    ws = load_workbook(output)["Section_Validation"]
+    fills = {}
+    for cf in ws.conditional_formatting:
+        for rule in cf.rules:
+            fills[rule.formula[0].strip('"')] = rule.dxf.fill.fgColor.rgb
+
+    assert set(fills) == set(statuses)
+    for status in statuses:
+        expected = OK_FILL if status == "OK" else ERROR_FILL
+        assert fills[status].endswith(expected.fgColor.rgb[-6:])
+    assert {"MISALIGNED", "OUT OF REGION", "INVALID RANGE", "NOT FOUND"} <= set(fills)